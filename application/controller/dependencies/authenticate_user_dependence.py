@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -7,15 +9,22 @@ from infrastructure.auth.jwt_handler import JWTAuthenticator
 from infrastructure.exceptions.auth_error import AuthError
 
 
+@lru_cache
+def get_jwt_provider() -> JWTAuthProvider:
+    """Provider único por processo (mantém o cache de tokens verificados)."""
+    return JWTAuthProvider()
+
+
 def get_authenticate_user_uc() -> AuthenticateUser:
-    token_provider = JWTAuthProvider()
+    token_provider = get_jwt_provider()
     authenticator = JWTAuthenticator(token_provider)
     return AuthenticateUser(authenticator)
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer())):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer())):
+    # async: verificação em memória (cache) não precisa de um salto para o threadpool
     token = credentials.credentials
-    provider = JWTAuthProvider()
+    provider = get_jwt_provider()
 
     try:
         payload = provider.verify_token(token)
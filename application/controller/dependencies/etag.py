@@ -0,0 +1,27 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "no-cache"  # o cliente pode guardar, mas revalida (If-None-Match) a cada uso
+
+
+def catalog_etag(version: int, request: Request) -> str:
+    """
+    ETag forte: versão do catálogo + hash do caminho e dos parâmetros da consulta
+    (cada página/filtro/projeção tem a sua). Muda sempre que o catálogo muda.
+    """
+    params = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    digest = hashlib.sha256(f"{request.url.path}?{params}".encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Resposta 304 se o If-None-Match da requisição casar com o ETag; senão None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
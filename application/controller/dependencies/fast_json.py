@@ -0,0 +1,32 @@
+from typing import Any, Iterable, List
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from domain.models.station_model import StationModel
+
+# Documento "vazio" na ordem dos campos de StationModel (defaults dos opcionais, None nos demais)
+_STATION_TEMPLATE = {
+    name: (None if field.is_required() else field.default)
+    for name, field in StationModel.model_fields.items()
+}
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse codificada com orjson direto para bytes (datetime em ISO 8601, UTC como "Z",
+    igual ao pydantic). O conteúdo não passa pelo response_model: quem retorna garante o formato.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def station_rows(docs: Iterable[dict]) -> List[dict]:
+    """
+    Documentos completos de estação (projeção sem _id) no formato de StationModel, sem revalidar:
+    já foram validados na escrita. Campos ausentes no Mongo saem com o default do modelo.
+    """
+    return [{**_STATION_TEMPLATE, **doc} for doc in docs]
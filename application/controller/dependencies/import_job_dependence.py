@@ -0,0 +1,8 @@
+from fastapi import Request
+
+from application.import_job_runner import ImportJobRunner
+
+
+def get_import_job_runner(request: Request) -> ImportJobRunner:
+    # instância única do processo, criada no lifespan (main.py)
+    return request.app.state.import_job_runner
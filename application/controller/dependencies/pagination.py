@@ -0,0 +1,20 @@
+import base64
+import binascii
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(codigo_estacao: str) -> str:
+    """Cursor opaco (base64 url-safe) a partir do último codigo_estacao da página."""
+    return base64.urlsafe_b64encode(codigo_estacao.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
@@ -0,0 +1,7 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class StationCodes(BaseModel):
+    codigos: List[str] = Field(..., min_length=1, description="Códigos das estações (codigo_estacao).")
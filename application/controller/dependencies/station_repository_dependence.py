@@ -0,0 +1,9 @@
+from fastapi import Request
+
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+
+
+def get_station_repo(request: Request) -> AsyncStationRepositoryPort:
+    # ponto único de troca do adapter (Mongo, SQL, mock, etc.)
+    # instância única do processo, criada no lifespan (main.py)
+    return request.app.state.station_repo
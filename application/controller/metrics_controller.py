@@ -0,0 +1,42 @@
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from infrastructure.metrics import metrics
+from infrastructure.metrics.registry import metrics_enabled, render
+
+router = APIRouter(tags=["Métricas"])
+
+
+def _sample_threadpool() -> None:
+    # limitador padrão do anyio: run_in_threadpool (repositório síncrono, token store, réplica...)
+    stats = to_thread.current_default_thread_limiter().statistics()
+    metrics.THREADPOOL_BUSY.set(stats.borrowed_tokens)
+    metrics.THREADPOOL_LIMIT.set(stats.total_tokens)
+    metrics.THREADPOOL_WAITING.set(stats.tasks_waiting)
+
+
+def _sample_replica(request: Request) -> None:
+    replica = getattr(request.app.state, "station_replica", None)
+    if replica is None:
+        return
+    status = replica.status()
+    metrics.REPLICA_READY.set(1 if status["ready"] else 0)
+    metrics.REPLICA_STATIONS.set(status["stations"])
+    metrics.REPLICA_VERSION.set(status["version"])
+    if status["staleness_seconds"] is not None:
+        metrics.REPLICA_STALENESS.set(status["staleness_seconds"])
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Métricas do processo no formato texto do Prometheus",
+    include_in_schema=False,
+)
+async def get_metrics(request: Request):
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Métricas desligadas (METRICS_ENABLED=false)")
+    _sample_threadpool()
+    _sample_replica(request)
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,30 +1,65 @@
 import logging
+import time
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 from application.controller.dependencies.authenticate_user_dependence import get_current_user
-from domain.ports.station_repository_port import StationRepositoryPort
+from application.controller.dependencies.import_job_dependence import get_import_job_runner
+from application.controller.dependencies.station_repository_dependence import get_station_repo
+from application.import_job_runner import ImportJobRunner, iter_lines
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
 from domain.service.import_stations import ImportStationsUseCase
-from infrastructure.repository.station_repository import MongoStationRepository
+from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.metrics.metrics import record_import
+from infrastructure.settings.settings import get_settings
 
 router = APIRouter(tags=["Estações em lote"])
 
-def get_estacao_repository() -> StationRepositoryPort:
-    # ponto único de troca do adapter (Mongo, SQL, mock, etc.)
-    return MongoStationRepository()
-
 @router.post("/station/import")
 async def import_stations(
+    request: Request,
     upload: UploadFile = File(...),
     upsert_existing: bool = Query(False, description="Se true, atualiza registros existentes"),
-    repo: StationRepositoryPort = Depends(get_estacao_repository),
+    background: bool = Query(
+        False,
+        description="Se true, enfileira a importação e retorna 202 com job_id; acompanhe em GET /station/import/{job_id}",
+    ),
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+    runner: ImportJobRunner = Depends(get_import_job_runner),
     user=Depends(get_current_user)
 ):
     if upload.content_type not in ("text/plain", "text/csv", "application/vnd.ms-excel"):
         logging.info(f"Media type archive: {upload.content_type}")
         raise HTTPException(status_code=415, detail=f"Tipo de arquivo não suportado: {upload.content_type}")
 
-    data = await upload.read()
-    usecase = ImportStationsUseCase(repo)
-    report = await usecase.execute(data, encoding="latin1", upsert_existing=upsert_existing)
-    return report
\ No newline at end of file
+    if background:
+        try:
+            job = await runner.submit(upload, upsert_existing=upsert_existing)
+        except RepositoryError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        job["status_url"] = str(request.url_for("get_import_job", job_id=job["job_id"]))
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(job))
+
+    started = time.perf_counter()
+    usecase = ImportStationsUseCase(repo, chunk_size=get_settings().import_chunk_size)
+    report = await usecase.execute(iter_lines(upload.read, encoding="latin1"), upsert_existing=upsert_existing)
+    record_import(report, time.perf_counter() - started, mode="sync")
+    return report
+
+
+@router.get("/station/import/{job_id}", name="get_import_job")
+async def get_import_job(
+    job_id: str,
+    runner: ImportJobRunner = Depends(get_import_job_runner),
+    user=Depends(get_current_user)
+):
+    try:
+        job = await runner.status(job_id)
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de importação não encontrado")
+    return job
+
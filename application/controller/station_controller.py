@@ -1,22 +1,28 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from application.controller.dependencies.authenticate_user_dependence import get_current_user
+from application.controller.dependencies.etag import CACHE_CONTROL, catalog_etag, not_modified
+from application.controller.dependencies.fast_json import FastJSONResponse, station_rows
+from application.controller.dependencies.pagination import decode_cursor, encode_cursor
+from application.controller.dependencies.station_codes import StationCodes
+from application.controller.dependencies.station_repository_dependence import get_station_repo
 from domain.models.station_model import StationModel
-from infrastructure.repository.station_repository import (
-    MongoStationRepository,
-    RepositoryError,
-)
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.repository.station_queries import STATION_FIELDS
+from infrastructure.settings.settings import get_settings
 
 router = APIRouter(prefix="/stations", tags=["Estações"])
 
-# ----- Dependency Injection (poderia ser singleton/pool se preferir) -----
-def get_station_repo() -> MongoStationRepository:
-    return MongoStationRepository()
-
 # -----------------------
 # CRUD endpoints
 # -----------------------
@@ -27,13 +33,13 @@ def get_station_repo() -> MongoStationRepository:
     status_code=status.HTTP_201_CREATED,
     summary="Cria/atualiza (upsert) uma estação",
 )
-def create_station(
+async def create_station(
     station: StationModel,
-    repo: MongoStationRepository = Depends(get_station_repo),
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
     user=Depends(get_current_user)
 ):
     try:
-        repo.save(station=station)  # upsert
+        await repo.save(station=station)  # upsert
         return station
     except RepositoryError as e:
         # erro da camada infra
@@ -44,17 +50,75 @@ def create_station(
     "/estacoes_lote",
     status_code=status.HTTP_200_OK,
     summary="Cria/atualiza (upsert) múltiplas estações",
+    description=(
+        "Estações sem mudança de conteúdo não são regravadas. Retorna as contagens `inserted`, `updated` e "
+        "`unchanged`; `affected` = inserted + updated."
+    ),
 )
-def create_many_stations(
+async def create_many_stations(
     stations: List[StationModel],
-    repo: MongoStationRepository = Depends(get_station_repo),
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+    user=Depends(get_current_user)
+):
+    try:
+        counts = await repo.save_many(stations=stations)
+        return {"status": "ok", "affected": counts["inserted"] + counts["updated"], **counts}
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _unique_codes(body: StationCodes) -> List[str]:
+    """Códigos sem repetição (ordem preservada), limitados a STATIONS_BULK_MAX_CODES."""
+    codes = list(dict.fromkeys(c.strip() for c in body.codigos if c.strip()))
+    max_codes = get_settings().stations_bulk_max_codes
+    if len(codes) > max_codes:
+        raise HTTPException(status_code=400, detail=f"Máximo de {max_codes} códigos por requisição")
+    return codes
+
+
+@router.post(
+    "/lookup",
+    status_code=status.HTTP_200_OK,
+    summary="Busca várias estações por código (uma consulta)",
+    description="Retorna as estações encontradas (`found`) e os códigos inexistentes (`missing`).",
+)
+async def lookup_stations(
+    body: StationCodes,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+):
+    codes = _unique_codes(body)
+    try:
+        found = await repo.find_stations_by_codes(codes)
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    found_codes = {doc["codigo_estacao"] for doc in found}
+    return FastJSONResponse(content={
+        "found": station_rows(found),
+        "missing": [c for c in codes if c not in found_codes],
+    })
+
+
+@router.post(
+    "/delete",
+    status_code=status.HTTP_200_OK,
+    summary="Remove várias estações por código (um delete_many)",
+    description="Retorna os códigos removidos (`deleted`) e os inexistentes (`missing`).",
+)
+async def delete_stations(
+    body: StationCodes,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
     user=Depends(get_current_user)
 ):
+    codes = _unique_codes(body)
     try:
-        affected = repo.save_many(stations=stations)
-        return {"status": "ok", "affected": affected}
+        removed = await repo.remove_stations_by_codes(codes)
     except RepositoryError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "status": "ok",
+        "deleted": [c for c in codes if c in removed],
+        "missing": [c for c in codes if c not in removed],
+    }
 
 
 
@@ -62,38 +126,362 @@ def create_many_stations(
     "",
     response_model=List[StationModel],
     status_code=status.HTTP_200_OK,
-    summary="Lista estações",
+    summary="Lista estações (paginado por codigo_estacao)",
+    description=(
+        "Paginação por cursor: quando houver mais registros, a resposta traz os headers "
+        "`X-Next-Cursor` e `Link: <...>; rel=\"next\"`. Envie o valor em `cursor` para obter a próxima página. "
+        "Respostas trazem `ETag`; com `If-None-Match` igual, a resposta é `304` (catálogo inalterado). "
+        "Filtros (`dados_estacao_manual`, `bacia`, `sensor`, `data_forecast`, `conversor`) são por igualdade, "
+        "combináveis, e atendidos por índice no servidor."
+    ),
 )
-def list_stations(
-    repo: MongoStationRepository = Depends(get_station_repo),
+async def list_stations(
+    request: Request,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
     dados_estacao_manual: Optional[bool] = Query(
         None,
         description="Filtra por estações manuais (true), não manuais (false). Omitir para retornar todas.",
     ),
+    bacia: Optional[str] = Query(None, description="Filtra pela bacia (valor exato)."),
+    sensor: Optional[str] = Query(None, description="Filtra pelo sensor (valor exato)."),
+    data_forecast: Optional[bool] = Query(None, description="Filtra por estações com (true) ou sem (false) previsão."),
+    conversor: Optional[int] = Query(None, description="Filtra pelo conversor."),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Tamanho da página (padrão STATIONS_PAGE_DEFAULT_LIMIT, máximo STATIONS_PAGE_MAX_LIMIT).",
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor opaco recebido em X-Next-Cursor."),
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a retornar, separados por vírgula (ex.: codigo_estacao,id_noaa). Omitir para todos.",
+    ),
 ):
+    settings = get_settings()
+    page_size = min(limit or settings.stations_page_default_limit, settings.stations_page_max_limit)
+    after = decode_cursor(cursor)
+
+    selected: Optional[List[str]] = None
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in StationModel.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Campos desconhecidos: {', '.join(unknown)}")
+
     try:
-        items = repo.list_all_stations(dados_estacao_manual=dados_estacao_manual)
-        # Se seu repo passar a aceitar paginação no find(), troque por skip/limit no Mongo
-        return items
+        # versão lida antes dos documentos: uma escrita no meio só pode tornar o ETag "velho" (nunca o conteúdo)
+        etag = catalog_etag(await repo.catalog_version(), request)
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
+
+        items, last_code = await repo.list_stations_page(
+            limit=page_size,
+            after=after,
+            fields=selected,
+            filters={
+                "dado_manual": dados_estacao_manual,
+                "bacia": bacia,
+                "sensor": sensor,
+                "data_forecast": data_forecast,
+                "conversor": conversor,
+            },
+        )
     except RepositoryError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_code is not None:
+        next_cursor = encode_cursor(last_code)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers.update({"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'})
+
+    # documentos crus (validados na escrita) direto para JSON: sem StationModel nem response_model
+    # (que fica só para a documentação); projeção parcial sai como veio
+    return FastJSONResponse(content=items if selected else station_rows(items), headers=headers)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def _ndjson_rows(batches: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(
+            orjson.dumps(doc, default=_json_default, option=orjson.OPT_APPEND_NEWLINE) for doc in batch
+        )
+
+
+async def _csv_rows(batches: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=STATION_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(
+            {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in doc.items()} for doc in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Exporta o catálogo de estações em streaming (NDJSON ou CSV)",
+    response_class=StreamingResponse,
+)
+async def export_stations(
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Formato de saída."),
+    dados_estacao_manual: Optional[bool] = Query(
+        None,
+        description="Filtra por estações manuais (true), não manuais (false). Omitir para exportar todas.",
+    ),
+):
+    # O cursor é percorrido em lotes; cada lote é codificado e enviado sem montar lista nem StationModel
+    batches = repo.iter_station_batches(
+        batch_size=get_settings().stations_export_batch_size,
+        dados_estacao_manual=dados_estacao_manual,
+    )
+    if format == "csv":
+        return StreamingResponse(
+            _csv_rows(batches),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="stations.csv"'},
+        )
+    return StreamingResponse(
+        _ndjson_rows(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="stations.ndjson"'},
+    )
+
+
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK,
+    summary="Contagens do catálogo (total, por bacia, por sensor, manuais, com previsão)",
+    description=(
+        "Calculadas no Mongo (uma agregação) e mantidas em cache até a próxima escrita no catálogo. "
+        "Resposta com `ETag`; com `If-None-Match` igual, a resposta é `304`."
+    ),
+)
+async def get_stations_stats(
+    request: Request,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+):
+    try:
+        etag = catalog_etag(await repo.catalog_version(), request)
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
+        stats = await repo.catalog_stats()
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return FastJSONResponse(content=stats, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def _changes_cursor(until: int, key: Tuple[int, str]) -> str:
+    """Cursor de /stations/changes: revisão final da sincronização + chave (revision, codigo) do último item."""
+    revision, code = key
+    return encode_cursor(f"{until}:{revision}:{code}")
+
+
+def _decode_changes_cursor(cursor: Optional[str]) -> Optional[Tuple[int, Tuple[int, str]]]:
+    value = decode_cursor(cursor)
+    if value is None:
+        return None
+    try:
+        until, revision, code = value.split(":", 2)
+        return int(until), (int(revision), code)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+@router.get(
+    "/changes",
+    status_code=status.HTTP_200_OK,
+    summary="Mudanças no catálogo desde uma revisão (sincronização incremental)",
+    description=(
+        "Retorna as estações gravadas (`op=upsert`, documento completo) e removidas (`op=delete`) "
+        "com revisão maior que `since`, em ordem de revisão; cada estação aparece uma vez, na última mudança. "
+        "Paginação por cursor (`X-Next-Cursor`/`Link`); na última página, guarde `revision` e envie-o como "
+        "`since` na próxima sincronização. `since=0` traz o catálogo inteiro. "
+        "`410`: as remoções desde `since` já foram descartadas — recomece com `since=0`."
+    ),
+)
+async def list_changes(
+    request: Request,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+    since: int = Query(0, ge=0, description="Última revisão já sincronizada (0 na primeira vez)."),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Tamanho da página (padrão STATIONS_PAGE_DEFAULT_LIMIT, máximo STATIONS_PAGE_MAX_LIMIT).",
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor opaco recebido em X-Next-Cursor."),
+):
+    settings = get_settings()
+    page_size = min(limit or settings.stations_page_default_limit, settings.stations_page_max_limit)
+    resumed = _decode_changes_cursor(cursor)
+
+    try:
+        revision, purged_through = await repo.catalog_revision()
+        if 0 < since < purged_through:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=f"Mudanças anteriores à revisão {purged_through} foram descartadas; sincronize com since=0",
+            )
+        # a sincronização inteira (todas as páginas) vai até a revisão segura lida na primeira página
+        until, after = resumed if resumed is not None else (max(revision, since), None)
+        changes, last_key = await repo.list_changes(since=since, until=until, limit=page_size, after=after)
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for change in changes:
+        if change["op"] == "upsert":
+            change["station"] = station_rows([change["station"]])[0]
+
+    headers = {}
+    next_cursor = None
+    if last_key is not None:
+        next_cursor = _changes_cursor(until, last_key)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers.update({"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'})
+    return FastJSONResponse(
+        content={"since": since, "revision": until, "changes": changes, "next_cursor": next_cursor},
+        headers=headers,
+    )
+
+
+@router.get(
+    "/near",
+    response_model=List[StationModel],
+    status_code=status.HTTP_200_OK,
+    summary="Estações próximas de um ponto (mais próximas primeiro)",
+    description=(
+        "Busca pelo índice geográfico (2dsphere) do ponto derivado de latitude/longitude da estação. "
+        "Cada item traz `distancia_m` (metros). Resposta com `ETag`/`304` como a listagem."
+    ),
+)
+async def list_stations_near(
+    request: Request,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+    latitude: float = Query(..., ge=-90, le=90, description="Latitude do ponto (graus decimais)."),
+    longitude: float = Query(..., ge=-180, le=180, description="Longitude do ponto (graus decimais)."),
+    raio_km: float = Query(50, gt=0, le=20000, description="Distância máxima em quilômetros."),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Máximo de estações (padrão STATIONS_PAGE_DEFAULT_LIMIT, máximo STATIONS_PAGE_MAX_LIMIT).",
+    ),
+):
+    settings = get_settings()
+    page_size = min(limit or settings.stations_page_default_limit, settings.stations_page_max_limit)
+    try:
+        etag = catalog_etag(await repo.catalog_version(), request)
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
+        items = await repo.find_stations_near(
+            latitude=latitude,
+            longitude=longitude,
+            max_distance_m=raio_km * 1000,
+            limit=page_size,
+        )
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return FastJSONResponse(content=station_rows(items), headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def _parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    """min_lon,min_lat,max_lon,max_lat (ordem GeoJSON/OGC), sem cruzar o antimeridiano."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox deve ser min_lon,min_lat,max_lon,max_lat")
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise HTTPException(status_code=400, detail="bbox fora dos limites ou com mínimo >= máximo")
+    if max_lon - min_lon >= 180:
+        # polígonos maiores que um hemisfério são ambíguos no 2dsphere
+        raise HTTPException(status_code=400, detail="bbox deve ter menos de 180 graus de longitude")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+@router.get(
+    "/bbox",
+    response_model=List[StationModel],
+    status_code=status.HTTP_200_OK,
+    summary="Estações dentro de um retângulo (paginado por codigo_estacao)",
+    description=(
+        "`bbox=min_lon,min_lat,max_lon,max_lat` em graus decimais. Busca pelo índice geográfico (2dsphere); "
+        "paginação por cursor e `ETag`/`304` como a listagem."
+    ),
+)
+async def list_stations_in_bbox(
+    request: Request,
+    bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat (ex.: -48.1,-16.1,-47.3,-15.4)."),
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Tamanho da página (padrão STATIONS_PAGE_DEFAULT_LIMIT, máximo STATIONS_PAGE_MAX_LIMIT).",
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor opaco recebido em X-Next-Cursor."),
+):
+    settings = get_settings()
+    page_size = min(limit or settings.stations_page_default_limit, settings.stations_page_max_limit)
+    min_lon, min_lat, max_lon, max_lat = _parse_bbox(bbox)
+    after = decode_cursor(cursor)
+    try:
+        etag = catalog_etag(await repo.catalog_version(), request)
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
+        items, last_code = await repo.list_stations_in_bbox(
+            min_lon=min_lon,
+            min_lat=min_lat,
+            max_lon=max_lon,
+            max_lat=max_lat,
+            limit=page_size,
+            after=after,
+        )
+    except RepositoryError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_code is not None:
+        next_cursor = encode_cursor(last_code)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers.update({"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'})
+    return FastJSONResponse(content=station_rows(items), headers=headers)
+
 
 @router.get(
     "/{codigo_estacao}",
     response_model=StationModel,
     status_code=status.HTTP_200_OK,
     summary="Obtém uma estação por código",
+    description="Resposta com `ETag`; com `If-None-Match` igual, a resposta é `304`.",
 )
-def get_station_by_code(
+async def get_station_by_code(
     codigo_estacao: str,
-    repo: MongoStationRepository = Depends(get_station_repo),
+    request: Request,
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
 ):
     try:
-        st = repo.find_station_by_code_station(code_station=codigo_estacao)
+        # versão lida antes da estação: o ETag nunca é mais novo que o conteúdo devolvido
+        etag = catalog_etag(await repo.catalog_version(), request)
+        st = await repo.find_station_by_code_station(code_station=codigo_estacao)
+        # 404 antes do If-None-Match: '*' ou o ETag do catálogo não valem para estação inexistente
         if not st:
             raise HTTPException(status_code=404, detail="Estação não encontrada")
-        return st
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
+        return FastJSONResponse(
+            content=st.model_dump(),
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
     except RepositoryError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -103,13 +491,13 @@ def get_station_by_code(
     status_code=status.HTTP_200_OK,
     summary="Remove uma estação por código",
 )
-def delete_station_by_code(
+async def delete_station_by_code(
     codigo_estacao: str,
-    repo: MongoStationRepository = Depends(get_station_repo),
+    repo: AsyncStationRepositoryPort = Depends(get_station_repo),
     user=Depends(get_current_user)
 ):
     try:
-        deleted = repo.remove_station_by_code_station(code_station=codigo_estacao)
+        deleted = await repo.remove_station_by_code_station(code_station=codigo_estacao)
         if deleted == 0:
             raise HTTPException(status_code=404, detail="Estação não encontrada")
         return {"status": "ok", "deleted": deleted}
@@ -0,0 +1,155 @@
+import asyncio
+import codecs
+import logging
+import os
+import socket
+import tempfile
+import time
+import uuid
+from typing import AsyncIterator, Awaitable, Callable
+
+from apscheduler.schedulers.base import BaseScheduler
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from domain.ports.import_job_port import ImportJobRepositoryPort
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+from domain.service.import_stations import ImportStationsUseCase
+from infrastructure.metrics.metrics import record_import
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+SPOOL_PREFIX = "station_import_"
+SPOOL_SUFFIX = ".txt"
+
+
+async def iter_lines(read: Callable[[int], Awaitable[bytes]], encoding: str = "latin1") -> AsyncIterator[str]:
+    """Lê em blocos (via `read`) e entrega linha a linha, sem carregar o arquivo inteiro."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    while chunk := await read(READ_SIZE):
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # a última linha pode estar incompleta (ou ser um "\r" de um "\r\n" partido entre blocos)
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    for line in pending.splitlines():
+        yield line
+
+
+class ImportJobRunner:
+    """
+    Importação de arquivos em background.
+    O upload é copiado para IMPORT_SPOOL_DIR, o job fica registrado no ImportJobRepositoryPort
+    e o processamento roda no scheduler da aplicação (event loop), publicando o progresso por bloco.
+    Os jobs ficam só na memória do processo: `maintain` (startup e a cada IMPORT_JOB_HEARTBEAT_SECONDS)
+    renova o sinal de vida dos jobs deste processo e encerra os de processos que pararam, com seus arquivos.
+    """
+
+    def __init__(self, repo: AsyncStationRepositoryPort, jobs: ImportJobRepositoryPort, scheduler: BaseScheduler):
+        self.settings = get_settings()
+        self.repo = repo
+        self.jobs = jobs
+        self.scheduler = scheduler
+        self._slots = asyncio.Semaphore(max(1, self.settings.import_max_concurrent_jobs))
+        # identifica os jobs deste processo (pid se repete entre reinícios; o sufixo não)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def submit(self, upload: UploadFile, upsert_existing: bool) -> dict:
+        """Copia o upload para disco, registra o job e agenda a execução. Retorna o job ('queued')."""
+        job_id = uuid.uuid4().hex
+        path = await self._spool(upload, job_id)
+        job = await run_in_threadpool(self.jobs.create, job_id, upload.filename or "", upsert_existing, self.owner)
+        # sem misfire_grace_time o job rodaria só se o loop o pegasse em 1s; atrasado, ficaria 'queued' para sempre
+        self.scheduler.add_job(
+            self.run, args=[job_id, path, upsert_existing], id=f"import-{job_id}", misfire_grace_time=None
+        )
+        return job
+
+    async def status(self, job_id: str) -> dict | None:
+        return await run_in_threadpool(self.jobs.get, job_id)
+
+    async def run(self, job_id: str, path: str, upsert_existing: bool) -> None:
+        async with self._slots:
+            try:
+                await run_in_threadpool(self.jobs.mark_running, job_id)
+
+                async def on_progress(progress: dict) -> None:
+                    await run_in_threadpool(self.jobs.update_progress, job_id, progress)
+
+                started = time.perf_counter()
+                with open(path, "rb") as f:
+                    usecase = ImportStationsUseCase(self.repo, chunk_size=self.settings.import_chunk_size)
+                    report = await usecase.execute(
+                        iter_lines(lambda n: run_in_threadpool(f.read, n), encoding="latin1"),
+                        upsert_existing=upsert_existing,
+                        on_progress=on_progress,
+                    )
+                record_import(report, time.perf_counter() - started, mode="background")
+                try:
+                    await run_in_threadpool(self.jobs.finish, job_id, report)
+                except Exception as ex:
+                    # os blocos já foram gravados: o erro é só do registro do relatório
+                    log.exception("Falha ao gravar o relatório do job de importação %s.", job_id)
+                    summary = {k: report.get(k) for k in ("imported", "summary")}
+                    await run_in_threadpool(
+                        self.jobs.fail, job_id, f"importação concluída ({summary}), mas o relatório não foi gravado: {ex}"
+                    )
+            except Exception as ex:
+                log.exception("Falha no job de importação %s.", job_id)
+                await run_in_threadpool(self.jobs.fail, job_id, str(ex))
+            finally:
+                try:
+                    os.remove(path)
+                except OSError:
+                    log.warning("Não foi possível remover o arquivo do job %s: %s", job_id, path)
+
+    async def maintain(self) -> None:
+        """
+        Heartbeat dos jobs deste processo; jobs sem heartbeat há IMPORT_JOB_STALE_SECONDS (processo reiniciado
+        ou morto) viram 'failed' e arquivos do spool sem job em andamento são removidos.
+        """
+        try:
+            await run_in_threadpool(self.jobs.heartbeat, self.owner)
+            failed = await run_in_threadpool(self.jobs.fail_stale, self.settings.import_job_stale_seconds)
+            if failed:
+                log.warning("Jobs de importação abandonados marcados como falha: %s", ", ".join(failed))
+            await run_in_threadpool(self._remove_orphan_spools)
+        except Exception:
+            log.exception("Falha na manutenção dos jobs de importação.")
+
+    def _remove_orphan_spools(self) -> None:
+        spool_dir = self._spool_dir()
+        if not os.path.isdir(spool_dir):
+            return
+        cutoff = time.time() - self.settings.import_job_stale_seconds
+        files = {}
+        for name in os.listdir(spool_dir):
+            path = os.path.join(spool_dir, name)
+            # arquivos recentes podem ser de um upload cujo job ainda não foi registrado
+            if name.startswith(SPOOL_PREFIX) and name.endswith(SPOOL_SUFFIX) and os.path.getmtime(path) < cutoff:
+                files[name[len(SPOOL_PREFIX):-len(SPOOL_SUFFIX)]] = path
+        active = self.jobs.active_ids(files)
+        for job_id, path in files.items():
+            if job_id not in active:
+                try:
+                    os.remove(path)
+                    log.info("Arquivo órfão do job de importação %s removido: %s", job_id, path)
+                except OSError:
+                    log.warning("Não foi possível remover o arquivo do job %s: %s", job_id, path)
+
+    def _spool_dir(self) -> str:
+        return self.settings.import_spool_dir or tempfile.gettempdir()
+
+    async def _spool(self, upload: UploadFile, job_id: str) -> str:
+        spool_dir = self._spool_dir()
+        os.makedirs(spool_dir, exist_ok=True)
+        path = os.path.join(spool_dir, f"{SPOOL_PREFIX}{job_id}{SPOOL_SUFFIX}")
+        with open(path, "wb") as f:
+            while chunk := await upload.read(READ_SIZE):
+                await run_in_threadpool(f.write, chunk)
+        return path
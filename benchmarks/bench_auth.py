@@ -0,0 +1,73 @@
+"""
+Microbenchmark do custo de autenticação por requisição (get_current_user).
+
+Compara:
+- antes: um JWTAuthProvider novo por requisição + jwt.decode (HS256) a cada chamada;
+- depois: provider único (get_jwt_provider) com cache de tokens verificados;
+- a dependência completa (get_current_user) com o provider único.
+
+Uso (usa o .env da aplicação, como o app):
+    python benchmarks/bench_auth.py [--iterations 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from application.controller.dependencies.authenticate_user_dependence import (  # noqa: E402
+    get_current_user,
+    get_jwt_provider,
+)
+from infrastructure.auth.jwt_bearer import JWTAuthProvider  # noqa: E402
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo de autenticação por requisição")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    provider = get_jwt_provider()
+    token = provider.create_access_token({"sub": "bench"}, expires_delta=timedelta(hours=1))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def before() -> None:
+        p = JWTAuthProvider()
+        p._max_entries = 0  # comportamento anterior: sem cache
+        p.verify_token(token)
+
+    def after() -> None:
+        get_jwt_provider().verify_token(token)
+
+    loop = asyncio.new_event_loop()
+
+    def dependency() -> None:
+        loop.run_until_complete(get_current_user(credentials))
+
+    results = {
+        "antes (provider por requisição, sem cache)": _per_call_us(before, args.iterations),
+        "depois (provider único + cache)": _per_call_us(after, args.iterations),
+        "get_current_user (depois, com event loop)": _per_call_us(dependency, args.iterations),
+    }
+    loop.close()
+
+    width = max(len(k) for k in results)
+    for name, us in results.items():
+        print(f"{name:<{width}}  {us:9.2f} µs/req")
+    print(f"ganho: {results['antes (provider por requisição, sem cache)'] / results['depois (provider único + cache)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Benchmark de vazão dos endpoints com a aplicação de verdade (uvicorn em subprocesso), um MongoDB local
+e a API ANA falsa (tools/fake_ana_server.py, latência configurável).
+
+Cenários, cada um em vários níveis de concorrência:
+- list:   GET /stations?limit=<page-size>
+- get:    GET /stations/{codigo} (códigos sorteados entre os semeados)
+- batch:  POST /stations/estacoes_lote (<batch-size> estações novas por requisição)
+- import: POST /station/import (arquivo de <import-lines> linhas novas por requisição)
+
+Para cada cenário/concorrência registra RPS, latências p50/p95/p99 (ms), erros e chamadas à API ANA
+(tokens + consultas ao inventário contadas no servidor falso, incluindo as do worker do outbox até o
+sistema assentar). O resultado é comparado com o baseline (--baseline, gravado na primeira execução
+ou com --update-baseline): sai com código 1 se o RPS cair ou o p95 / as chamadas ANA subirem além de
+--tolerance, ou se surgirem erros.
+
+MongoDB: --mongo-uri (ou BENCH_MONGO_URI); sem ele, sobe um mongod temporário (binário no PATH, dados num
+diretório temporário). O banco --db-name é apagado no início e no fim.
+
+Uso:
+    python benchmarks/bench_endpoints.py [--mongo-uri mongodb://127.0.0.1:27017] [--concurrency 1 8 32]
+        [--requests 300] [--ana-latency 0.05] [--workers 1] [--baseline benchmarks/baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+from pymongo import MongoClient  # noqa: E402
+
+from infrastructure.settings.settings import get_settings  # noqa: E402
+from tools.fake_ana_server import FakeAnaOptions, start_fake_ana_server  # noqa: E402
+
+SCENARIOS = ("list", "get", "batch", "import")
+# métricas comparadas com o baseline: (nome, maior é melhor)
+COMPARED = (("rps", True), ("p95_ms", False), ("ana_calls", False))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_http(url: str, proc: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"A aplicação terminou durante a subida (código {proc.returncode}).")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise SystemExit(f"A aplicação não respondeu em {timeout:.0f}s ({url}).")
+
+
+@contextmanager
+def _mongo(uri: Optional[str]) -> Iterator[str]:
+    if uri:
+        yield uri
+        return
+    mongod = shutil.which("mongod")
+    if not mongod:
+        raise SystemExit("mongod não encontrado no PATH; informe --mongo-uri (ou BENCH_MONGO_URI).")
+    dbpath = tempfile.mkdtemp(prefix="bench-mongo-")
+    port = _free_port()
+    proc = subprocess.Popen(
+        [mongod, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    uri = f"mongodb://127.0.0.1:{port}"
+    try:
+        with MongoClient(uri, serverSelectionTimeoutMS=30000) as client:
+            client.admin.command("ping")
+        yield uri
+    finally:
+        proc.terminate()
+        proc.wait(timeout=15)
+        shutil.rmtree(dbpath, ignore_errors=True)
+
+
+def _drop_database(uri: str, name: str) -> None:
+    with MongoClient(uri, serverSelectionTimeoutMS=5000) as client:
+        client.drop_database(name)
+
+
+@contextmanager
+def _app(env: Dict[str, str], port: int, workers: int) -> Iterator[str]:
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env={**os.environ, **env},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_http(f"{base_url}/docs", proc)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=15)
+
+
+# ---------------------------
+# Medição
+# ---------------------------
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Percentil por posto mais próximo (lista já ordenada)."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    send: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """Dispara `total` requisições com `concurrency` clientes simultâneos (laço fechado)."""
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in pending:
+            start = time.perf_counter()
+            try:
+                ok = (await send(client, i)).status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def _ana_calls(stats_url: str) -> int:
+    stats = httpx.get(stats_url, timeout=5).json()
+    return stats["tokens_issued"] + stats["inventory_requests"]
+
+
+def _settle(stats_url: str, quiet: float, timeout: float = 120) -> int:
+    """Espera as chamadas à ANA pararem (worker do outbox drenado) por `quiet` segundos; retorna o total."""
+    deadline = time.monotonic() + timeout
+    last, since = _ana_calls(stats_url), time.monotonic()
+    while time.monotonic() < deadline:
+        time.sleep(0.25)
+        current = _ana_calls(stats_url)
+        if current != last:
+            last, since = current, time.monotonic()
+        elif time.monotonic() - since >= quiet:
+            break
+    return last
+
+
+def _stations(prefix: str, count: int) -> List[dict]:
+    return [
+        {"ponto": f"P{prefix}{j}", "codigo_estacao": f"{prefix}{j:06d}", "id_noaa": f"N{prefix}{j}",
+         "conversor": 1, "sensor": "radar", "bacia": "PARANA"}
+        for j in range(count)
+    ]
+
+
+def _import_file(prefix: str, lines: int) -> bytes:
+    rows = ["ponto,codigo_estacao,id_noaa,conversor,sensor,bacia"]
+    rows += [f"P{prefix}{j},{prefix}{j:06d},N{prefix}{j},1,radar,PARANA" for j in range(lines)]
+    return "\n".join(rows).encode("latin1")
+
+
+# ---------------------------
+# Execução
+# ---------------------------
+
+async def _run_scenarios(base_url: str, stats_url: str, args: argparse.Namespace) -> Dict[str, dict]:
+    settings = get_settings()
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        r = await client.post("/OAuth/token", json={"user_name": settings.user_name, "password": settings.user_password})
+        r.raise_for_status()
+        auth = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        # catálogo inicial (enriquecido pelo worker antes de medir)
+        seeded = _stations("S", args.seed)
+        for i in range(0, len(seeded), 500):
+            (await client.post("/stations/estacoes_lote", json=seeded[i:i + 500], headers=auth)).raise_for_status()
+        _settle(stats_url, args.settle)
+        codes = [st["codigo_estacao"] for st in seeded]
+
+        senders: Dict[str, Callable[[int], Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]]] = {
+            "list": lambda c: lambda cl, i: cl.get("/stations", params={"limit": args.page_size}),
+            "get": lambda c: lambda cl, i: cl.get(f"/stations/{random.choice(codes)}"),
+            "batch": lambda c: lambda cl, i: cl.post(
+                "/stations/estacoes_lote", json=_stations(f"B{c}-{i}-", args.batch_size), headers=auth,
+            ),
+            "import": lambda c: lambda cl, i: cl.post(
+                "/station/import",
+                files={"upload": (f"import-{c}-{i}.csv", _import_file(f"I{c}-{i}-", args.import_lines), "text/csv")},
+                headers=auth,
+            ),
+        }
+
+        results: Dict[str, dict] = {}
+        for scenario in args.scenarios:
+            total = args.import_requests if scenario == "import" else args.requests
+            for c in args.concurrency:
+                before = _ana_calls(stats_url)
+                result = await _drive(client, senders[scenario](c), max(total, c), c)
+                result["ana_calls"] = _settle(stats_url, args.settle) - before
+                results[f"{scenario}@c{c}"] = result
+                print(
+                    f"{scenario:>7} c={c:<4} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}  "
+                    f"p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms  "
+                    f"erros {result['errors']:<4} ANA {result['ana_calls']}"
+                )
+        return results
+
+
+def _regressions(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    found = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric, higher_is_better in COMPARED:
+            old, new = base[metric], current[metric]
+            worse = new < old * (1 - tolerance) if higher_is_better else new > old * (1 + tolerance)
+            if worse and old:
+                found.append(f"{key}: {metric} {old} → {new}")
+        if current["errors"] > base["errors"]:
+            found.append(f"{key}: erros {base['errors']} → {current['errors']}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vazão e latência dos endpoints de estações")
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI"))
+    parser.add_argument("--db-name", default="station_manager_bench")
+    parser.add_argument("--workers", type=int, default=1, help="workers do uvicorn")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300, help="requisições por cenário/concorrência")
+    parser.add_argument("--import-requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=2000, help="estações semeadas antes de medir")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--import-lines", type=int, default=500)
+    parser.add_argument("--ana-latency", type=float, default=0.05, help="latência da API ANA falsa (s)")
+    parser.add_argument("--settle", type=float, default=2.0, help="segundos sem chamadas ANA para assentar")
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "benchmarks", "baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="variação aceita em relação ao baseline")
+    parser.add_argument("--output", help="grava o resultado desta execução (JSON)")
+    args = parser.parse_args()
+
+    meta = {k: getattr(args, k) for k in (
+        "workers", "concurrency", "requests", "import_requests", "seed",
+        "page_size", "batch_size", "import_lines", "ana_latency",
+    )}
+
+    ana_server, _ = start_fake_ana_server(options=FakeAnaOptions(latency=args.ana_latency))
+    ana_url = f"http://127.0.0.1:{ana_server.server_address[1]}"
+    try:
+        with _mongo(args.mongo_uri) as mongo_uri:
+            _drop_database(mongo_uri, args.db_name)
+            env = {
+                "MONGO_URI": mongo_uri,
+                "MONGO_DB_NAME": args.db_name,
+                "ANA_API_URL": f"{ana_url}/OAuth/v1",
+                "ANA_API_INVENTARIO_URL": f"{ana_url}/HidroInventarioEstacoes/v1",
+                # worker do outbox frequente (as chamadas ANA entram na conta do cenário); sem sweeper
+                "ENRICHMENT_WORKER_INTERVAL_SECONDS": "1",
+                "ENRICHMENT_SWEEP_ENABLED": "false",
+            }
+            try:
+                with _app(env, _free_port(), args.workers) as base_url:
+                    results = asyncio.run(_run_scenarios(base_url, f"{ana_url}/_stats", args))
+            finally:
+                _drop_database(mongo_uri, args.db_name)
+    finally:
+        ana_server.shutdown()
+
+    report = {"meta": meta, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline gravado em {args.baseline}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta") != meta:
+        print("parâmetros diferentes dos do baseline; comparação ignorada (use --update-baseline)")
+        return
+    regressions = _regressions(results, baseline["results"], args.tolerance)
+    if regressions:
+        print("REGRESSÃO em relação ao baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"sem regressões em relação ao baseline (tolerância {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
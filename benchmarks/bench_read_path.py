@@ -0,0 +1,90 @@
+"""
+Microbenchmark da listagem de estações (GET /stations) sem Mongo: do documento lido ao corpo JSON.
+
+Compara:
+- antes: StationModel(**doc) por documento + validação do response_model (List[StationModel])
+  + jsonable_encoder/json.dumps do JSONResponse padrão;
+- depois: documentos crus (projeção sem _id) completados com os defaults do modelo
+  e codificados com orjson (FastJSONResponse).
+
+Uso:
+    python benchmarks/bench_read_path.py [--rows 1000 5000 20000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from application.controller.dependencies.fast_json import FastJSONResponse, station_rows  # noqa: E402
+from domain.models.station_model import StationModel  # noqa: E402
+
+
+def _docs(n: int) -> List[dict]:
+    """Documentos como saem do Mongo (parte das estações sem os campos da ANA)."""
+    base = datetime(2001, 1, 1)
+    docs = []
+    for i in range(n):
+        doc = {
+            "ponto": f"P{i}", "codigo_estacao": f"{i:08d}", "id_noaa": f"N{i}", "conversor": i % 3,
+            "sensor": "radar", "bacia": "PARANA", "dado_manual": i % 2 == 0, "data_forecast": False,
+        }
+        if i % 4:
+            doc.update({
+                "nome_estacao": f"ESTACAO {i}", "nome_bacia": "RIO PARANA", "rio_nome": "RIO X",
+                "altitude": "100.0", "latitude": "-15.78", "longitude": "-47.92",
+                "data_periodo_escala_inicio": base + timedelta(days=i),
+            })
+        docs.append(doc)
+    return docs
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo do caminho de leitura da listagem de estações")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    field = create_model_field(name="Response_list_stations", type_=List[StationModel], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    print(f"{'linhas':>8}  {'antes (ms)':>11}  {'depois (ms)':>11}  {'ganho':>6}  {'linhas/s (depois)':>18}")
+    for n in args.rows:
+        docs = _docs(n)
+
+        def before() -> bytes:
+            models = [StationModel(**doc) for doc in docs]
+            content = loop.run_until_complete(serialize_response(field=field, response_content=models))
+            return JSONResponse(content).body
+
+        def after() -> bytes:
+            return FastJSONResponse(station_rows(docs)).body
+
+        # mesmo conteúdo (a formatação dos bytes difere: separadores do json.dumps)
+        assert json.loads(before()) == json.loads(after())
+        t_before = _best_ms(before, args.repeat)
+        t_after = _best_ms(after, args.repeat)
+        print(f"{n:>8}  {t_before:>11.1f}  {t_after:>11.1f}  {t_before / t_after:>5.1f}x  {n / t_after * 1000:>18,.0f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,10 @@ from typing import Any
 class AnaClientPort(ABC):
     @abstractmethod
     def fetch_data(self, codigo: str) -> Any:
+        pass
+
+
+class AsyncAnaClientPort(ABC):
+    @abstractmethod
+    async def fetch_data(self, codigo: str) -> Any:
         pass
\ No newline at end of file
@@ -0,0 +1,46 @@
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Set
+
+
+class ImportJobRepositoryPort(Protocol):
+    """
+    Contrato do armazenamento de jobs de importação em background.
+    Compartilhado entre workers: o status consultado pode vir de qualquer processo.
+    """
+
+    def create(self, job_id: str, filename: str, upsert_existing: bool, owner: str) -> Dict[str, Any]:
+        """Registra um job na fila (status 'queued') do processo `owner`. Retorna o documento criado."""
+        ...
+
+    def mark_running(self, job_id: str) -> None:
+        ...
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Atualiza os contadores parciais (linhas processadas, importadas, ignoradas, erros)."""
+        ...
+
+    def finish(self, job_id: str, report: Dict[str, Any]) -> None:
+        """Conclui o job com o relatório final (status 'done'); listas de ignoradas/erros podem ser resumidas."""
+        ...
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Conclui o job com erro (status 'failed')."""
+        ...
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o job (sem _id do Mongo) ou None."""
+        ...
+
+    def heartbeat(self, owner: str) -> None:
+        """Renova o sinal de vida dos jobs em andamento ('queued'/'running') do processo `owner`."""
+        ...
+
+    def fail_stale(self, stale_seconds: float) -> List[str]:
+        """
+        Conclui com erro os jobs em andamento sem sinal de vida há mais de `stale_seconds`
+        (processo reiniciado ou morto). Retorna os job_ids afetados.
+        """
+        ...
+
+    def active_ids(self, job_ids: Iterable[str]) -> Set[str]:
+        """Dos job_ids informados, os que ainda estão em andamento ('queued'/'running')."""
+        ...
@@ -1,4 +1,4 @@
-from typing import Iterable, Optional, Protocol
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Protocol, Sequence, Set, Tuple
 
 from domain.models.station_model import StationModel
 
@@ -15,18 +15,225 @@ class StationRepositoryPort(Protocol):
         """Upsert por codigo_estacao. Retorna True se persistiu com sucesso."""
         ...
 
-    def save_many(self, stations: Iterable[StationModel]) -> int:
-        """Upsert em lote. Retorna total afetado (matched + upserted)."""
+    def save_many(self, stations: Iterable[StationModel]) -> Dict[str, int]:
+        """
+        Upsert em lote que pula as estações sem mudança de conteúdo (content_hash igual ao gravado).
+        Retorna as contagens {"inserted", "updated", "unchanged"}.
+        """
         ...
 
     def list_all_stations(self, dados_estacao_manual: bool | None = False) -> Iterable[StationModel]:
         """Lista todas as estações (pode ser gerador/stream para evitar alta memória)."""
         ...
 
-    def find_by_code(self, code: str) -> Optional[StationModel]:
+    def list_stations_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Página de estações ordenada por codigo_estacao (keyset), filtrada por igualdade nos campos de `filters`.
+        Retorna (documentos projetados, último codigo_estacao se houver próxima página).
+        """
+        ...
+
+    def iter_station_batches(
+        self,
+        batch_size: int,
+        dados_estacao_manual: bool | None = None,
+    ) -> Iterator[List[dict]]:
+        """Percorre o cursor em lotes de documentos projetados (sem _id), sem materializar a coleção."""
+        ...
+
+    def catalog_version(self) -> int:
+        """Versão do catálogo: muda a cada escrita (base do ETag das leituras)."""
+        ...
+
+    def catalog_stats(self) -> dict:
+        """Contagens do catálogo (total, por bacia, por sensor, manuais, com previsão), em cache por versão."""
+        ...
+
+    def existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        """Dentre os códigos informados, retorna os que já existem (consulta indexada, só codigo_estacao)."""
+        ...
+
+    def find_station_by_code_station(self, code_station: str) -> Optional[StationModel]:
+        """Busca por codigo_estacao. Retorna None se não encontrar."""
+        ...
+
+    def find_stations_by_codes(self, codes: Iterable[str]) -> List[dict]:
+        """Estações com os códigos informados (uma consulta $in; documentos projetados, sem _id)."""
+        ...
+
+    def remove_station_by_code_station(self, code_station: str) -> int:
+        """Remove por codigo_estacao. Retorna quantos registros foram removidos (0/1)."""
+        ...
+
+    def remove_stations_by_codes(self, codes: Iterable[str]) -> Set[str]:
+        """Remove as estações com os códigos informados (delete_many). Retorna os códigos removidos."""
+        ...
+
+    def catalog_revision(self) -> Tuple[int, int]:
+        """(revisão até a qual todas as mudanças já estão gravadas, revisão até a qual remoções foram descartadas)."""
+        ...
+
+    def list_changes(
+        self,
+        since: int,
+        until: int,
+        limit: int,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+        """
+        Mudanças (upserts e remoções) com revisão em (since, until], ordem (revision, codigo_estacao).
+        Retorna (mudanças, chave (revision, codigo_estacao) da última se houver próxima página).
+        """
+        ...
+
+    def find_stations_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float,
+        limit: int,
+    ) -> List[dict]:
+        """Estações até max_distance_m metros do ponto, mais próximas primeiro (documentos com distancia_m)."""
+        ...
+
+    def list_stations_in_bbox(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Estações dentro do retângulo (graus), ordenadas por codigo_estacao (keyset).
+        Retorna (documentos projetados, último codigo_estacao se houver próxima página).
+        """
+        ...
+
+
+class AsyncStationRepositoryPort(Protocol):
+    """
+    Versão assíncrona do contrato do repositório de Estação (usada pelos endpoints).
+    Mesma semântica de StationRepositoryPort, com métodos awaitable.
+    """
+
+    async def save(self, station: StationModel) -> bool:
+        """Upsert por codigo_estacao. Retorna True se persistiu com sucesso."""
+        ...
+
+    async def save_many(self, stations: Iterable[StationModel]) -> Dict[str, int]:
+        """
+        Upsert em lote que pula as estações sem mudança de conteúdo (content_hash igual ao gravado).
+        Retorna as contagens {"inserted", "updated", "unchanged"}.
+        """
+        ...
+
+    async def list_all_stations(self, dados_estacao_manual: bool | None = None) -> List[StationModel]:
+        """Lista todas as estações."""
+        ...
+
+    async def list_stations_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Página de estações ordenada por codigo_estacao (keyset), filtrada por igualdade nos campos de `filters`.
+        Retorna (documentos projetados, último codigo_estacao se houver próxima página).
+        """
+        ...
+
+    def iter_station_batches(
+        self,
+        batch_size: int,
+        dados_estacao_manual: bool | None = None,
+    ) -> AsyncIterator[List[dict]]:
+        """Percorre o cursor em lotes de documentos projetados (sem _id), sem materializar a coleção."""
+        ...
+
+    async def catalog_version(self) -> int:
+        """Versão do catálogo: muda a cada escrita (base do ETag das leituras)."""
+        ...
+
+    async def catalog_stats(self) -> dict:
+        """Contagens do catálogo (total, por bacia, por sensor, manuais, com previsão), em cache por versão."""
+        ...
+
+    async def existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        """Dentre os códigos informados, retorna os que já existem (consulta indexada, só codigo_estacao)."""
+        ...
+
+    async def find_station_by_code_station(self, code_station: str) -> Optional[StationModel]:
         """Busca por codigo_estacao. Retorna None se não encontrar."""
         ...
 
-    def remove_by_code(self, code: str) -> int:
+    async def find_stations_by_codes(self, codes: Iterable[str]) -> List[dict]:
+        """Estações com os códigos informados (uma consulta $in; documentos projetados, sem _id)."""
+        ...
+
+    async def remove_station_by_code_station(self, code_station: str) -> int:
         """Remove por codigo_estacao. Retorna quantos registros foram removidos (0/1)."""
         ...
+
+    async def remove_stations_by_codes(self, codes: Iterable[str]) -> Set[str]:
+        """Remove as estações com os códigos informados (delete_many). Retorna os códigos removidos."""
+        ...
+
+    async def catalog_revision(self) -> Tuple[int, int]:
+        """(revisão até a qual todas as mudanças já estão gravadas, revisão até a qual remoções foram descartadas)."""
+        ...
+
+    async def list_changes(
+        self,
+        since: int,
+        until: int,
+        limit: int,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+        """
+        Mudanças (upserts e remoções) com revisão em (since, until], ordem (revision, codigo_estacao).
+        Retorna (mudanças, chave (revision, codigo_estacao) da última se houver próxima página).
+        """
+        ...
+
+    async def find_stations_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float,
+        limit: int,
+    ) -> List[dict]:
+        """Estações até max_distance_m metros do ponto, mais próximas primeiro (documentos com distancia_m)."""
+        ...
+
+    async def list_stations_in_bbox(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Estações dentro do retângulo (graus), ordenadas por codigo_estacao (keyset).
+        Retorna (documentos projetados, último codigo_estacao se houver próxima página).
+        """
+        ...
+
+    async def ensure_indexes(self) -> None:
+        """Prepara índices/coleções (startup)."""
+        ...
+
+    async def close(self) -> None:
+        """Libera conexões (shutdown)."""
+        ...
\ No newline at end of file
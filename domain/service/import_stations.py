@@ -1,40 +1,98 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterable, Awaitable, Callable, Optional, Tuple
 from unidecode import unidecode
 
 from domain.models.station_model import StationModel
-from domain.ports.station_repository_port import StationRepositoryPort
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
 
 
 class ImportStationsUseCase:
     MIN_COLS = 6  # ponto, codigo_estacao, id_noaa, conversor, sensor, bacia
 
-    def __init__(self, repo: StationRepositoryPort):
+    def __init__(self, repo: AsyncStationRepositoryPort, chunk_size: int = 1000):
         self._repo = repo
+        self._chunk_size = max(1, chunk_size)
 
     async def execute(
         self,
-        file_bytes: bytes,
-        encoding: str = "latin1",
+        lines: AsyncIterable[str],
         upsert_existing: bool = False,  # <— novo
+        on_progress: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     ) -> Dict[str, Any]:
-
-        text = file_bytes.decode(encoding, errors="replace")
+        """
+        Importa estações a partir de um fluxo de linhas (já decodificadas).
+        As linhas são validadas uma a uma e persistidas em blocos de `chunk_size` estações válidas,
+        então a memória fica limitada ao bloco corrente e uma falha tardia não descarta os blocos já gravados.
+        A verificação de duplicados no banco consulta só os códigos de cada bloco (custo proporcional ao arquivo).
+        Cada bloco informa inserted/updated/unchanged: com upsert_existing, estações já iguais às do banco
+        não são regravadas (unchanged).
+        `on_progress`, se informado, recebe os contadores parciais após cada bloco gravado.
+        """
 
         imported: int = 0
+        # imported = inserted + updated + unchanged (estações gravadas ou já iguais no banco)
+        written: Dict[str, int] = {"inserted": 0, "updated": 0, "unchanged": 0}
+        total_lines: int = 0
         ignored: List[Dict[str, Any]] = []
         errors: List[Dict[str, Any]] = []
-        estacoes_validas: List[StationModel] = []
-
-        # pré-carrega códigos existentes (para decidir ignorar ou não)
-        try:
-            existentes = {e.codigo_estacao for e in self._repo.list_all_stations()}
-        except Exception as ex:
-            existentes = set()
-            errors.append({"line": 0, "error": f"falha ao listar existentes: {ex}", "content": ""})
+        chunks: List[Dict[str, Any]] = []
+        # (linha, conteúdo, estação) do bloco corrente
+        estacoes_validas: List[Tuple[int, str, StationModel]] = []
 
         seen_in_file: set[str] = set()
-
-        for num, raw_line in enumerate(text.splitlines(), start=1):
+        num = 0
+
+        async def flush() -> None:
+            nonlocal imported, estacoes_validas
+            report: Dict[str, Any] = {
+                "chunk": len(chunks) + 1,
+                "first_line": estacoes_validas[0][0],
+                "last_line": estacoes_validas[-1][0],
+                "valid": len(estacoes_validas),
+                "ignored_existing": 0,
+                "imported": 0,
+                "inserted": 0,
+                "updated": 0,
+                "unchanged": 0,
+            }
+            try:
+                to_save = estacoes_validas
+                # já existe no banco → ignora (default) OU permite upsert
+                if not upsert_existing:
+                    existentes = await self._repo.existing_codes(st.codigo_estacao for _, _, st in estacoes_validas)
+                    to_save = []
+                    for line_no, content, st in estacoes_validas:
+                        if st.codigo_estacao in existentes:
+                            ignored.append({"line": line_no, "reason": "duplicado no banco (codigo_estacao)", "content": content})
+                        else:
+                            to_save.append((line_no, content, st))
+                    report["ignored_existing"] = len(estacoes_validas) - len(to_save)
+
+                if to_save:
+                    counts = await self._repo.save_many([st for _, _, st in to_save])
+                    report.update(counts)
+                    report["imported"] = sum(counts.values())
+                    imported += report["imported"]
+                    for key, value in counts.items():
+                        written[key] += value
+            except Exception as ex:
+                # o bloco falhou; os anteriores já estão gravados e os próximos seguem
+                report["error"] = str(ex)
+                errors.append({"line": report["first_line"], "error": f"falha ao gravar bloco {report['chunk']}: {ex}", "content": ""})
+            chunks.append(report)
+            estacoes_validas = []
+
+            if on_progress is not None:
+                await on_progress({
+                    "lines_processed": num,
+                    "imported": imported,
+                    "ignored": len(ignored),
+                    "errors": len(errors),
+                    "chunks": len(chunks),
+                })
+
+        async for raw_line in lines:
+            num += 1
+            total_lines = num
             line = raw_line.strip()
             if not line:
                 continue
@@ -72,12 +130,10 @@ class ImportStationsUseCase:
                     continue
                 seen_in_file.add(codigo)
 
-                # 4) já existe no banco → ignora (default) OU permite upsert
-                if not upsert_existing and codigo in existentes:
-                    ignored.append({"line": num, "reason": "duplicado no banco (codigo_estacao)", "content": line})
-                    continue
-
-                estacoes_validas.append(
+                # 4) duplicado no banco: verificado por bloco, no flush()
+                estacoes_validas.append((
+                    num,
+                    line,
                     StationModel(
                         ponto=ponto,
                         codigo_estacao=codigo,
@@ -85,20 +141,26 @@ class ImportStationsUseCase:
                         conversor=conversor_val,  # agora int
                         sensor=sensor,
                         bacia=bacia,
-                    )
-                )
+                    ),
+                ))
             except Exception as ex:
                 errors.append({"line": num, "error": str(ex), "content": line})
+                continue
+
+            if len(estacoes_validas) >= self._chunk_size:
+                await flush()
 
         if estacoes_validas:
-            imported = self._repo.save_many(estacoes_validas)
+            await flush()
 
         return {
             "imported": imported,
             "ignored": ignored,
             "errors": errors,
+            "chunks": chunks,
             "summary": {
-                "total_lines": len(text.splitlines()),
+                "total_lines": total_lines,
+                **written,
                 "processed": imported + len(ignored) + len(errors),
             },
         }
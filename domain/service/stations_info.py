@@ -5,7 +5,7 @@ from typing import Iterable, Any
 from pydantic import field_validator
 
 from domain.models.station_model import StationModel
-from domain.ports.ana_client_port import AnaClientPort
+from domain.ports.ana_client_port import AnaClientPort, AsyncAnaClientPort
 from infrastructure.gateway.ana_client.ana_api_client import AnaApiClient
 
 
@@ -20,15 +20,26 @@ class StationInformation:
         "data_periodo_escala_inicio",
     )
 
-    def __init__(self):
-        self.ana_client: AnaClientPort = AnaApiClient()
+    def __init__(self, ana_client: AnaClientPort | None = None):
+        self.ana_client: AnaClientPort = ana_client or AnaApiClient()
 
-    def get_additional_information(self, station: StationModel):
-        if not self._needs_enrichment(station, self._FIELDS_TO_FILL):
+    def get_additional_information(self, station: StationModel, force: bool = False):
+        """Completa a estação com o inventário ANA; `force` consulta mesmo com os campos preenchidos (reenriquecimento)."""
+        if not force and not self._needs_enrichment(station, self._FIELDS_TO_FILL):
             return station
 
         resp = self.ana_client.fetch_data(codigo=station.codigo_estacao) or {}
-        station_info = resp.get("items") or []
+        return self._apply_inventory(station, resp)
+
+    @classmethod
+    def needs_enrichment(cls, station: StationModel) -> bool:
+        """True se faltar algum dos campos preenchidos pela API ANA."""
+        return cls._needs_enrichment(station, cls._FIELDS_TO_FILL)
+
+    @staticmethod
+    def _apply_inventory(station: StationModel, resp: Any) -> StationModel:
+        """Copia os dados do inventário ANA (resposta de fetch_data) para a estação."""
+        station_info = (resp or {}).get("items") or []
         if not station_info:
             logging.warning(f"Não foram encontrado dados adicionais para a estação {station.codigo_estacao}")
             logging.warning(station_info)
@@ -57,3 +68,17 @@ class StationInformation:
             if isinstance(v, str) and v.strip() == "":
                 return True
         return False
+
+
+class AsyncStationInformation:
+    """Enriquecimento via API ANA para o fluxo assíncrono (mesmas regras de StationInformation)."""
+
+    def __init__(self, ana_client: AsyncAnaClientPort):
+        self.ana_client: AsyncAnaClientPort = ana_client
+
+    async def get_additional_information(self, station: StationModel, force: bool = False):
+        if not force and not StationInformation.needs_enrichment(station):
+            return station
+
+        resp = await self.ana_client.fetch_data(codigo=station.codigo_estacao) or {}
+        return StationInformation._apply_inventory(station, resp)
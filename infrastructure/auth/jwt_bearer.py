@@ -1,4 +1,8 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from dotenv import load_dotenv
@@ -8,11 +12,20 @@ from domain.ports.auth_port import AuthTokenProvider
 from infrastructure.settings.settings import get_settings
 
 class JWTAuthProvider(AuthTokenProvider):
+    """
+    Emissão e verificação de JWT (HS256).
+    Tokens já verificados ficam num cache LRU (JWT_VERIFY_CACHE_MAX_ENTRIES), chaveado pelo sha256 do token
+    e válido até o 'exp' de cada um; assim só a primeira requisição de cada token paga o jwt.decode.
+    Deve ser instanciado uma vez por processo (get_jwt_provider).
+    """
 
     def __init__(self):
         self.s = get_settings()
         self.SECRET_KEY = self.s.user_password
         self.ALGORITHM = "HS256"
+        self._max_entries = self.s.jwt_verify_cache_max_entries
+        self._verified: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
 
     def create_access_token(self, data: dict, expires_delta: timedelta) -> str:
         to_encode = data.copy()
@@ -21,7 +34,33 @@ class JWTAuthProvider(AuthTokenProvider):
         return jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
 
     def verify_token(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
         try:
-            return jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
         except JWTError:
             raise HTTPException(status_code=401, detail="Token inválido ou expirado")
+
+        exp = payload.get("exp")
+        if self._max_entries > 0 and isinstance(exp, (int, float)):  # sem exp não há prazo para o cache
+            with self._lock:
+                self._verified[key] = (float(exp), payload)
+                self._verified.move_to_end(key)
+                while len(self._verified) > self._max_entries:
+                    self._verified.popitem(last=False)
+        return dict(payload)
+
+    def _cached(self, key: bytes) -> dict | None:
+        with self._lock:
+            entry = self._verified.get(key)
+            if entry is None:
+                return None
+            exp, payload = entry
+            if exp <= time.time():
+                del self._verified[key]
+                return None
+            self._verified.move_to_end(key)
+            return dict(payload)  # cópia: o chamador não altera o cache
@@ -0,0 +1,2 @@
+class AnaUnavailableError(RuntimeError):
+    """API ANA indisponível: circuito aberto, chamadas falham sem tentar a rede."""
@@ -1,18 +1,55 @@
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any
 
 from domain.ports.ana_client_port import AnaClientPort
 from infrastructure.gateway.ana_client.ana_auth_service import AnaAuthService
+from infrastructure.gateway.ana_client.resilience import RETRYABLE_STATUS, build_resilience, call_with_retry
+from infrastructure.metrics.metrics import ANA_FETCH_ERRORS, ANA_FETCH_SECONDS, track
 from infrastructure.settings.settings import get_settings
 
 
+def _is_retryable(ex: BaseException) -> bool:
+    """Timeouts, falhas de conexão e respostas 429/5xx."""
+    if isinstance(ex, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(ex, requests.HTTPError) and ex.response is not None:
+        return ex.response.status_code in RETRYABLE_STATUS
+    return False
+
+
 class AnaApiClient(AnaClientPort):
     def __init__(self):
-        self.auth_service = AnaAuthService()
         self.settings = get_settings()
 
+        # Sessão com keep-alive; o pool comporta o enriquecimento concorrente
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, self.settings.ana_enrichment_concurrency),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.auth_service = AnaAuthService(self.session)
+        # Novas tentativas com backoff + circuit breaker (ANA_RETRY_*, ANA_CIRCUIT_*)
+        self.retry_policy, self.breaker = build_resilience()
+
     def fetch_data(self, codigo: str) -> Any:
-        headers = self.auth_service.get_auth_headers()
+        with track(ANA_FETCH_SECONDS, ANA_FETCH_ERRORS, client="sync"):
+            return call_with_retry(lambda: self._get_inventory(codigo), self.retry_policy, self.breaker, _is_retryable)
+
+    def _get_inventory(self, codigo: str) -> Any:
+        auth = self.auth_service.get_auth_headers()
+        response = self._request(codigo, auth)
+        if response.status_code == 401:
+            # token recusado antes do vencimento previsto: renova (single-flight) e repete uma vez
+            self.auth_service.invalidate(auth)
+            response = self._request(codigo, self.auth_service.get_auth_headers())
+        response.raise_for_status()
+        return response.json()
+
+    def _request(self, codigo: str, auth: dict) -> requests.Response:
+        headers = dict(auth)  # cópia: o cache é compartilhado entre threads
         headers["accept"] = "*/*"  # igual ao curl
 
         # 🔑 Usa os nomes dos parâmetros exatamente como no cURL
@@ -20,11 +57,9 @@ class AnaApiClient(AnaClientPort):
             "Código da Estação": codigo,
         }
 
-        response = requests.get(
+        return self.session.get(
             self.settings.ana_api_inventario_url,
             headers=headers,
             params=params,  # requests faz a URL-encoding automaticamente
             timeout=self.settings.request_timeout
         )
-        response.raise_for_status()
-        return response.json()
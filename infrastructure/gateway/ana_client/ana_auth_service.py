@@ -1,33 +1,139 @@
+import logging
+import threading
 import time
+import uuid
+
 import requests
 
+from infrastructure.gateway.ana_client.ana_token_store import MongoAnaTokenStore, SharedAnaToken
+from infrastructure.metrics.metrics import ANA_TOKEN_ERRORS, ANA_TOKEN_SECONDS, track
 from infrastructure.settings.settings import get_settings
 
+log = logging.getLogger(__name__)
+
+SHARED_POLL_SECONDS = 0.2
+
 
 class AnaAuthService:
-    def __init__(self):
+    """
+    Token da API ANA com renovação single-flight:
+    - dentro de ANA_TOKEN_REFRESH_MARGIN_SECONDS do vencimento, uma thread renova e as demais
+      seguem com o token atual (sem fila); se a renovação falhar, o token ainda válido continua em uso;
+    - vencido (ou invalidado após 401), as threads aguardam a única renovação em andamento.
+    Com ANA_TOKEN_SHARED o token vem do MongoAnaTokenStore: todos os workers reaproveitam o mesmo
+    e só o que obtém o lease busca um novo na ANA.
+    """
+
+    def __init__(self, session: requests.Session | None = None, store: MongoAnaTokenStore | None = None):
         self.settings = get_settings()
+        self.session = session or requests.Session()
+        self.store = store if store is not None else (MongoAnaTokenStore() if self.settings.ana_token_shared else None)
+        self._owner = uuid.uuid4().hex
         self.token_expiration: float = 0
+        self.refresh_at: float = 0
         self.cached_headers: dict | None = None
+        self._lock = threading.Lock()
 
     def _fetch_token(self) -> dict:
-        response = requests.get(
-            self.settings.ana_api_url,
-            headers={
-                "identificador": self.settings.ana_identificador,
-                "senha": self.settings.ana_senha
-            },
-            timeout=self.settings.request_timeout
-        )
-        response.raise_for_status()
-        token = response.json()["items"]["tokenautenticacao"]
+        with track(ANA_TOKEN_SECONDS, ANA_TOKEN_ERRORS, client="sync"):
+            response = self.session.get(
+                self.settings.ana_api_url,
+                headers={
+                    "identificador": self.settings.ana_identificador,
+                    "senha": self.settings.ana_senha
+                },
+                timeout=self.settings.request_timeout
+            )
+            response.raise_for_status()
+            token = response.json()["items"]["tokenautenticacao"]
         return {
             "Authorization": f"Bearer {token}",
             "accept": "*/*"
         }
 
     def get_auth_headers(self) -> dict:
-        if not self.cached_headers or time.time() >= self.token_expiration:
-            self.cached_headers = self._fetch_token()
-            self.token_expiration = time.time() + 580  # duração do token com margem de segurança
-        return self.cached_headers
+        headers = self.cached_headers
+        now = time.time()
+        if headers and now < self.refresh_at:
+            return headers
+
+        if headers and now < self.token_expiration:
+            # renovação proativa: se outra thread já está renovando, segue com o token atual
+            if not self._lock.acquire(blocking=False):
+                return headers
+        else:
+            self._lock.acquire()
+        try:
+            if not self.cached_headers or time.time() >= self.refresh_at:
+                try:
+                    self._refresh()
+                except Exception:
+                    if self.cached_headers and time.time() < self.token_expiration:
+                        log.warning("Falha na renovação antecipada do token ANA; usando o token atual.", exc_info=True)
+                    else:
+                        raise
+            return self.cached_headers
+        finally:
+            self._lock.release()
+
+    def invalidate(self, headers: dict) -> None:
+        """Descarta o token recusado pela API (401); ignora se outra thread já o substituiu."""
+        with self._lock:
+            if self.cached_headers is headers:
+                self.cached_headers = None
+                self.token_expiration = self.refresh_at = 0
+        if self.store is not None:
+            self.store.invalidate(headers)
+
+    def _refresh(self) -> None:
+        if self.store is None:
+            self._adopt(self._new_token())
+            return
+
+        shared = self.store.load()
+        if shared and time.time() < shared.refresh_at:
+            self._adopt(shared)  # outro worker já renovou
+            return
+
+        if self.store.try_lease(self._owner):
+            try:
+                token = self._new_token()
+            except Exception:
+                self.store.release(self._owner)
+                raise
+            self.store.publish(self._owner, token)
+            self._adopt(token)
+            return
+
+        # outro worker está renovando: segue com um token ainda válido e volta a olhar o store em instantes
+        current = shared if shared and time.time() < shared.expires_at else self._current()
+        if current is not None:
+            self._adopt(current, recheck=True)
+            return
+
+        # nenhum token válido: aguarda a publicação (até o lease vencer) antes de renovar por conta própria
+        deadline = time.time() + self.settings.ana_token_lease_seconds
+        while time.time() < deadline:
+            time.sleep(SHARED_POLL_SECONDS)
+            shared = self.store.load()
+            if shared and time.time() < shared.refresh_at:
+                self._adopt(shared)
+                return
+        log.warning("Token ANA compartilhado não foi publicado a tempo; renovando localmente.")
+        self._adopt(self._new_token())
+
+    def _new_token(self) -> SharedAnaToken:
+        headers = self._fetch_token()
+        expires_at = time.time() + self.settings.ana_token_ttl_seconds
+        return SharedAnaToken(headers, expires_at, expires_at - self.settings.ana_token_refresh_margin_seconds)
+
+    def _current(self) -> SharedAnaToken | None:
+        if self.cached_headers and time.time() < self.token_expiration:
+            return SharedAnaToken(self.cached_headers, self.token_expiration, self.refresh_at)
+        return None
+
+    def _adopt(self, token: SharedAnaToken, recheck: bool = False) -> None:
+        self.cached_headers = token.headers
+        self.token_expiration = token.expires_at
+        # recheck: o token está na janela de renovação de outro worker; consulta o store de novo logo
+        self.refresh_at = min(time.time() + SHARED_POLL_SECONDS * 5, token.expires_at) if recheck else token.refresh_at
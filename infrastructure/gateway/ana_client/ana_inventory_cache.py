@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Tuple
+
+from pymongo import errors as mg_errors
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.synchronous.collection import Collection
+
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+
+class BaseAnaInventoryCache:
+    """
+    Cache de respostas do inventário ANA, chaveado por codigo_estacao.
+    - Camada 1: LRU em memória, limitada (ANA_CACHE_MAX_ENTRIES) e com TTL.
+    - Camada 2: coleção Mongo com índice TTL; sobrevive a restarts e é compartilhada entre workers.
+    - Respostas sem "items" também são guardadas (cache negativo), com TTL próprio.
+    Falhas na camada persistente são logadas e nunca interrompem o fluxo.
+    As subclasses implementam a camada persistente (driver síncrono ou assíncrono).
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "persistent_hits": 0, "negative_hits": 0, "misses": 0}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "memory_entries": len(self._entries)}
+
+    # ---------------------------
+    # Camada em memória
+    # ---------------------------
+
+    def _memory_get(self, codigo: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(codigo)
+            if entry is None:
+                return False, None
+            expires_at, payload = entry
+            if expires_at <= now:
+                del self._entries[codigo]
+                return False, None
+            self._entries.move_to_end(codigo)
+            self._count_hit("memory_hits", payload)
+            return True, payload
+
+    def _remember(self, codigo: str, payload: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[codigo] = (expires_at, payload)
+            self._entries.move_to_end(codigo)
+            while len(self._entries) > self.settings.ana_cache_max_entries:
+                self._entries.popitem(last=False)
+
+    def _forget(self, codigo: str) -> None:
+        with self._lock:
+            self._entries.pop(codigo, None)
+
+    # ---------------------------
+    # Auxiliares da camada persistente
+    # ---------------------------
+
+    def _accept_persistent(self, codigo: str, doc: Optional[dict]) -> Tuple[bool, Any]:
+        """Promove um documento persistido (se válido) para a memória; conta hit/miss."""
+        if doc is not None:
+            expires_at = doc["expires_at"].replace(tzinfo=timezone.utc).timestamp()
+            if expires_at > time.time():
+                payload = doc.get("payload")
+                self._remember(codigo, payload, expires_at)
+                with self._lock:
+                    self._count_hit("persistent_hits", payload)
+                return True, payload
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return False, None
+
+    def _prepare_put(self, codigo: str, payload: Any) -> Optional[dict]:
+        """Grava na memória e devolve o documento da camada persistente (None se não deve cachear)."""
+        negative = self._is_negative(payload)
+        ttl = self.settings.ana_cache_negative_ttl_seconds if negative else self.settings.ana_cache_ttl_seconds
+        if ttl <= 0:
+            return None
+
+        self._remember(codigo, payload, time.time() + ttl)
+        now = datetime.now(timezone.utc)
+        return {
+            "payload": payload,
+            "negative": negative,
+            "cached_at": now,
+            "expires_at": now + timedelta(seconds=ttl),
+        }
+
+    def _count_hit(self, counter: str, payload: Any) -> None:
+        # chamado com self._lock adquirido
+        self._counters[counter] += 1
+        if self._is_negative(payload):
+            self._counters["negative_hits"] += 1
+
+    @staticmethod
+    def _is_negative(payload: Any) -> bool:
+        return not (payload or {}).get("items")
+
+
+class AnaInventoryCache(BaseAnaInventoryCache):
+    """Cache do inventário ANA com camada persistente via driver síncrono."""
+
+    def __init__(self, collection: Optional[Collection] = None) -> None:
+        super().__init__()
+        self.collection = collection if self.settings.ana_cache_persistent else None
+
+    def ensure_indexes(self) -> None:
+        if self.collection is None:
+            return
+        # Mongo remove documentos expirados em background (expireAfterSeconds=0 → usa o próprio expires_at)
+        self.collection.create_index("expires_at", expireAfterSeconds=0, name="ttl_expires_at")
+
+    def get(self, codigo: str) -> Tuple[bool, Any]:
+        """Retorna (hit, payload). Em miss, payload é None."""
+        hit, payload = self._memory_get(codigo)
+        if hit:
+            return hit, payload
+
+        doc = None
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one({"_id": codigo})
+            except mg_errors.PyMongoError:
+                log.warning("Falha ao ler cache ANA da estação %s.", codigo, exc_info=True)
+        return self._accept_persistent(codigo, doc)
+
+    def put(self, codigo: str, payload: Any) -> None:
+        doc = self._prepare_put(codigo, payload)
+        if doc is None or self.collection is None:
+            return
+        try:
+            self.collection.replace_one({"_id": codigo}, doc, upsert=True)
+        except mg_errors.PyMongoError:
+            log.warning("Falha ao gravar cache ANA da estação %s.", codigo, exc_info=True)
+
+    def invalidate(self, codigo: str) -> None:
+        self._forget(codigo)
+        if self.collection is None:
+            return
+        try:
+            self.collection.delete_one({"_id": codigo})
+        except mg_errors.PyMongoError:
+            log.warning("Falha ao invalidar cache ANA da estação %s.", codigo, exc_info=True)
+
+
+class AsyncAnaInventoryCache(BaseAnaInventoryCache):
+    """Cache do inventário ANA com camada persistente via driver assíncrono (AsyncMongoClient)."""
+
+    def __init__(self, collection: Optional[AsyncCollection] = None) -> None:
+        super().__init__()
+        self.collection = collection if self.settings.ana_cache_persistent else None
+
+    async def ensure_indexes(self) -> None:
+        if self.collection is None:
+            return
+        await self.collection.create_index("expires_at", expireAfterSeconds=0, name="ttl_expires_at")
+
+    async def get(self, codigo: str) -> Tuple[bool, Any]:
+        """Retorna (hit, payload). Em miss, payload é None."""
+        hit, payload = self._memory_get(codigo)
+        if hit:
+            return hit, payload
+
+        doc = None
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one({"_id": codigo})
+            except mg_errors.PyMongoError:
+                log.warning("Falha ao ler cache ANA da estação %s.", codigo, exc_info=True)
+        return self._accept_persistent(codigo, doc)
+
+    async def put(self, codigo: str, payload: Any) -> None:
+        doc = self._prepare_put(codigo, payload)
+        if doc is None or self.collection is None:
+            return
+        try:
+            await self.collection.replace_one({"_id": codigo}, doc, upsert=True)
+        except mg_errors.PyMongoError:
+            log.warning("Falha ao gravar cache ANA da estação %s.", codigo, exc_info=True)
+
+    async def invalidate(self, codigo: str) -> None:
+        self._forget(codigo)
+        if self.collection is None:
+            return
+        try:
+            await self.collection.delete_one({"_id": codigo})
+        except mg_errors.PyMongoError:
+            log.warning("Falha ao invalidar cache ANA da estação %s.", codigo, exc_info=True)
@@ -0,0 +1,98 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from pymongo import errors as mg_errors
+from pymongo.synchronous.collection import Collection
+
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SharedAnaToken:
+    headers: dict
+    expires_at: float  # epoch (s)
+    refresh_at: float  # epoch (s): a partir daqui um worker deve renovar
+
+
+class MongoAnaTokenStore:
+    """
+    Token da API ANA compartilhado entre processos na coleção 'ana_tokens' (um documento por credencial).
+    A renovação é coordenada por lease: só o worker que obtém o lease busca um token novo e o publica;
+    os demais reaproveitam o token publicado.
+    Falhas no Mongo nunca bloqueiam a API ANA: load → None e try_lease → True (cada worker renova o seu).
+    Métodos síncronos; o AsyncAnaAuthService os chama no threadpool.
+    """
+
+    def __init__(self, collection: Optional[Collection] = None) -> None:
+        self.settings = get_settings()
+        self.collection: Collection = collection if collection is not None else get_mongo_database()["ana_tokens"]
+        self.key = self.settings.ana_identificador
+
+    def load(self) -> Optional[SharedAnaToken]:
+        try:
+            doc = self.collection.find_one({"_id": self.key, "headers": {"$ne": None}})
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao ler o token ANA compartilhado: %s", e)
+            return None
+        if not doc:
+            return None
+        return SharedAnaToken(doc["headers"], doc["expires_at"], doc["refresh_at"])
+
+    def try_lease(self, owner: str) -> bool:
+        """True se este worker deve renovar o token (lease obtido ou store indisponível)."""
+        now = time.time()
+        try:
+            # com lease ativo o filtro não casa e o upsert colide no _id → outro worker está renovando
+            self.collection.update_one(
+                {"_id": self.key, "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+                {"$set": {"lease_owner": owner, "lease_until": now + self.settings.ana_token_lease_seconds}},
+                upsert=True,
+            )
+            return True
+        except mg_errors.DuplicateKeyError:
+            return False
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao obter o lease do token ANA compartilhado: %s", e)
+            return True
+
+    def publish(self, owner: str, token: SharedAnaToken) -> None:
+        """Grava o token renovado e libera o lease."""
+        try:
+            self.collection.update_one(
+                {"_id": self.key},
+                {"$set": {
+                    "headers": token.headers,
+                    "expires_at": token.expires_at,
+                    "refresh_at": token.refresh_at,
+                    "lease_owner": None,
+                    "lease_until": None,
+                }},
+                upsert=True,
+            )
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao publicar o token ANA compartilhado: %s", e)
+
+    def invalidate(self, headers: dict) -> None:
+        """Marca como vencido o token publicado, se for o recusado pela API (401)."""
+        try:
+            self.collection.update_one(
+                {"_id": self.key, "headers": headers},
+                {"$set": {"expires_at": 0, "refresh_at": 0}},
+            )
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao invalidar o token ANA compartilhado: %s", e)
+
+    def release(self, owner: str) -> None:
+        """Libera o lease sem publicar (a renovação falhou)."""
+        try:
+            self.collection.update_one(
+                {"_id": self.key, "lease_owner": owner},
+                {"$set": {"lease_owner": None, "lease_until": None}},
+            )
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao liberar o lease do token ANA compartilhado: %s", e)
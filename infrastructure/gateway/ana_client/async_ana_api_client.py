@@ -0,0 +1,67 @@
+from typing import Any
+
+import httpx
+
+from domain.ports.ana_client_port import AsyncAnaClientPort
+from infrastructure.gateway.ana_client.async_ana_auth_service import AsyncAnaAuthService
+from infrastructure.gateway.ana_client.resilience import RETRYABLE_STATUS, acall_with_retry, build_resilience
+from infrastructure.metrics.metrics import ANA_FETCH_ERRORS, ANA_FETCH_SECONDS, track
+from infrastructure.settings.settings import get_settings
+
+
+def _is_retryable(ex: BaseException) -> bool:
+    """Timeouts, falhas de conexão e respostas 429/5xx."""
+    if isinstance(ex, httpx.TransportError):
+        return True
+    if isinstance(ex, httpx.HTTPStatusError):
+        return ex.response.status_code in RETRYABLE_STATUS
+    return False
+
+
+class AsyncAnaApiClient(AsyncAnaClientPort):
+    def __init__(self):
+        self.settings = get_settings()
+        # Cliente com keep-alive; o pool comporta o enriquecimento concorrente
+        self.http = httpx.AsyncClient(
+            timeout=self.settings.request_timeout,
+            limits=httpx.Limits(
+                max_connections=max(1, self.settings.ana_enrichment_concurrency),
+                max_keepalive_connections=max(1, self.settings.ana_enrichment_concurrency),
+            ),
+        )
+        self.auth_service = AsyncAnaAuthService(self.http)
+        # Novas tentativas com backoff + circuit breaker (ANA_RETRY_*, ANA_CIRCUIT_*)
+        self.retry_policy, self.breaker = build_resilience()
+
+    async def fetch_data(self, codigo: str) -> Any:
+        with track(ANA_FETCH_SECONDS, ANA_FETCH_ERRORS, client="async"):
+            return await acall_with_retry(
+                lambda: self._get_inventory(codigo), self.retry_policy, self.breaker, _is_retryable
+            )
+
+    async def _get_inventory(self, codigo: str) -> Any:
+        auth = await self.auth_service.get_auth_headers()
+        response = await self._request(codigo, auth)
+        if response.status_code == 401:
+            # token recusado antes do vencimento previsto: renova (single-flight) e repete uma vez
+            await self.auth_service.invalidate(auth)
+            response = await self._request(codigo, await self.auth_service.get_auth_headers())
+        response.raise_for_status()
+        return response.json()
+
+    async def _request(self, codigo: str, auth: dict) -> httpx.Response:
+        headers = dict(auth)
+        headers["accept"] = "*/*"  # igual ao curl
+
+        params = {
+            "Código da Estação": codigo,
+        }
+
+        return await self.http.get(
+            self.settings.ana_api_inventario_url,
+            headers=headers,
+            params=params,
+        )
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
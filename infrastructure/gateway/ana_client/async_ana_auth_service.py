@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+import uuid
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from infrastructure.gateway.ana_client.ana_auth_service import SHARED_POLL_SECONDS
+from infrastructure.gateway.ana_client.ana_token_store import MongoAnaTokenStore, SharedAnaToken
+from infrastructure.metrics.metrics import ANA_TOKEN_ERRORS, ANA_TOKEN_SECONDS, track
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+
+class AsyncAnaAuthService:
+    """
+    Versão assíncrona do AnaAuthService (httpx); compartilha o cliente HTTP do AsyncAnaApiClient.
+    Mesma renovação single-flight e antecipada (ANA_TOKEN_REFRESH_MARGIN_SECONDS) e o mesmo
+    token compartilhado entre workers (MongoAnaTokenStore, acessado pelo threadpool).
+    """
+
+    def __init__(self, http: httpx.AsyncClient, store: MongoAnaTokenStore | None = None):
+        self.settings = get_settings()
+        self.http = http
+        self.store = store if store is not None else (MongoAnaTokenStore() if self.settings.ana_token_shared else None)
+        self._owner = uuid.uuid4().hex
+        self.token_expiration: float = 0
+        self.refresh_at: float = 0
+        self.cached_headers: dict | None = None
+        self._lock = asyncio.Lock()
+
+    async def _fetch_token(self) -> dict:
+        with track(ANA_TOKEN_SECONDS, ANA_TOKEN_ERRORS, client="async"):
+            response = await self.http.get(
+                self.settings.ana_api_url,
+                headers={
+                    "identificador": self.settings.ana_identificador,
+                    "senha": self.settings.ana_senha
+                },
+            )
+            response.raise_for_status()
+            token = response.json()["items"]["tokenautenticacao"]
+        return {
+            "Authorization": f"Bearer {token}",
+            "accept": "*/*"
+        }
+
+    async def get_auth_headers(self) -> dict:
+        headers = self.cached_headers
+        now = time.time()
+        if headers and now < self.refresh_at:
+            return headers
+        # renovação proativa: se outra task já está renovando, segue com o token atual
+        if headers and now < self.token_expiration and self._lock.locked():
+            return headers
+
+        async with self._lock:
+            if not self.cached_headers or time.time() >= self.refresh_at:
+                try:
+                    await self._refresh()
+                except Exception:
+                    if self.cached_headers and time.time() < self.token_expiration:
+                        log.warning("Falha na renovação antecipada do token ANA; usando o token atual.", exc_info=True)
+                    else:
+                        raise
+            return self.cached_headers
+
+    async def invalidate(self, headers: dict) -> None:
+        """Descarta o token recusado pela API (401); ignora se outra task já o substituiu."""
+        if self.cached_headers is headers:
+            self.cached_headers = None
+            self.token_expiration = self.refresh_at = 0
+        if self.store is not None:
+            await run_in_threadpool(self.store.invalidate, headers)
+
+    async def _refresh(self) -> None:
+        """Mesmo protocolo de AnaAuthService._refresh (store compartilhado + lease)."""
+        if self.store is None:
+            self._adopt(await self._new_token())
+            return
+
+        shared = await run_in_threadpool(self.store.load)
+        if shared and time.time() < shared.refresh_at:
+            self._adopt(shared)
+            return
+
+        if await run_in_threadpool(self.store.try_lease, self._owner):
+            try:
+                token = await self._new_token()
+            except Exception:
+                await run_in_threadpool(self.store.release, self._owner)
+                raise
+            await run_in_threadpool(self.store.publish, self._owner, token)
+            self._adopt(token)
+            return
+
+        current = shared if shared and time.time() < shared.expires_at else self._current()
+        if current is not None:
+            self._adopt(current, recheck=True)
+            return
+
+        deadline = time.time() + self.settings.ana_token_lease_seconds
+        while time.time() < deadline:
+            await asyncio.sleep(SHARED_POLL_SECONDS)
+            shared = await run_in_threadpool(self.store.load)
+            if shared and time.time() < shared.refresh_at:
+                self._adopt(shared)
+                return
+        log.warning("Token ANA compartilhado não foi publicado a tempo; renovando localmente.")
+        self._adopt(await self._new_token())
+
+    async def _new_token(self) -> SharedAnaToken:
+        headers = await self._fetch_token()
+        expires_at = time.time() + self.settings.ana_token_ttl_seconds
+        return SharedAnaToken(headers, expires_at, expires_at - self.settings.ana_token_refresh_margin_seconds)
+
+    def _current(self) -> SharedAnaToken | None:
+        if self.cached_headers and time.time() < self.token_expiration:
+            return SharedAnaToken(self.cached_headers, self.token_expiration, self.refresh_at)
+        return None
+
+    def _adopt(self, token: SharedAnaToken, recheck: bool = False) -> None:
+        self.cached_headers = token.headers
+        self.token_expiration = token.expires_at
+        self.refresh_at = min(time.time() + SHARED_POLL_SECONDS * 5, token.expires_at) if recheck else token.refresh_at
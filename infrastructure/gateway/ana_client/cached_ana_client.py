@@ -0,0 +1,46 @@
+from typing import Any
+
+from domain.ports.ana_client_port import AnaClientPort, AsyncAnaClientPort
+from infrastructure.gateway.ana_client.ana_inventory_cache import AnaInventoryCache, AsyncAnaInventoryCache
+from infrastructure.metrics.metrics import ANA_CACHE_LOOKUPS
+
+
+class CachedAnaClient(AnaClientPort):
+    """
+    Decorator de AnaClientPort: consulta o AnaInventoryCache antes de chamar a API ANA.
+    refresh=True (reenriquecimento): sempre chama a API e só atualiza o cache com a resposta.
+    """
+
+    def __init__(self, client: AnaClientPort, cache: AnaInventoryCache, refresh: bool = False):
+        self.client = client
+        self.cache = cache
+        self.refresh = refresh
+
+    def fetch_data(self, codigo: str) -> Any:
+        if not self.refresh:
+            hit, payload = self.cache.get(codigo)
+            ANA_CACHE_LOOKUPS.inc(result="hit" if hit else "miss")
+            if hit:
+                return payload
+
+        payload = self.client.fetch_data(codigo)
+        self.cache.put(codigo, payload)
+        return payload
+
+
+class AsyncCachedAnaClient(AsyncAnaClientPort):
+    """Decorator de AsyncAnaClientPort: consulta o AsyncAnaInventoryCache antes de chamar a API ANA."""
+
+    def __init__(self, client: AsyncAnaClientPort, cache: AsyncAnaInventoryCache):
+        self.client = client
+        self.cache = cache
+
+    async def fetch_data(self, codigo: str) -> Any:
+        hit, payload = await self.cache.get(codigo)
+        ANA_CACHE_LOOKUPS.inc(result="hit" if hit else "miss")
+        if hit:
+            return payload
+
+        payload = await self.client.fetch_data(codigo)
+        await self.cache.put(codigo, payload)
+        return payload
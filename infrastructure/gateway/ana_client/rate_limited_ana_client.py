@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Any
+
+from domain.ports.ana_client_port import AnaClientPort
+
+
+class TokenBucket:
+    """
+    Limitador de taxa (token bucket) thread-safe: até `rate` aquisições por segundo,
+    com rajada de até `burst`. acquire() bloqueia a thread chamadora até haver ficha.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = max(rate, 0.001)
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedAnaClient(AnaClientPort):
+    """Decorator de AnaClientPort: cada chamada à API ANA consome uma ficha do TokenBucket."""
+
+    def __init__(self, client: AnaClientPort, bucket: TokenBucket):
+        self.client = client
+        self.bucket = bucket
+
+    def fetch_data(self, codigo: str) -> Any:
+        self.bucket.acquire()
+        return self.client.fetch_data(codigo)
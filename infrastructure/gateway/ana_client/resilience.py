@@ -0,0 +1,185 @@
+"""
+Resiliência das chamadas à API ANA, compartilhada pelos clientes síncrono (requests) e assíncrono (httpx):
+- novas tentativas com backoff exponencial e jitter para timeouts, falhas de conexão e 429/5xx;
+- circuit breaker: após ANA_CIRCUIT_FAILURE_THRESHOLD falhas seguidas as chamadas falham na hora
+  (AnaUnavailableError) por ANA_CIRCUIT_RESET_SECONDS; depois uma chamada de teste decide se fecha.
+  A chamada de teste tem prazo (ANA_CIRCUIT_PROBE_TIMEOUT_SECONDS); se for cancelada ou não terminar nele,
+  o circuito volta a open.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from infrastructure.exceptions.ana_gateway_error import AnaUnavailableError
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitBreaker:
+    """
+    closed → (falhas seguidas ≥ limite) → open → (reset_seconds) → half_open → closed | open.
+    Em half_open só uma chamada de teste passa; as demais continuam falhando rápido.
+    Teste sem resultado após probe_timeout_seconds (travado) conta como falha: o circuito volta a open.
+    Thread-safe; as seções críticas não bloqueiam, então serve também ao cliente assíncrono.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, probe_timeout_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Libera a chamada; True se ela é a chamada de teste. Circuito aberto → AnaUnavailableError."""
+        with self._lock:
+            if self.state == "closed":
+                return False
+            now = time.monotonic()
+            if self.state == "half_open" and now - self._probe_started >= self.probe_timeout_seconds:
+                log.warning("Chamada de teste da API ANA sem resposta em %ss; circuito aberto.",
+                            self.probe_timeout_seconds)
+                self.state = "open"
+                self._opened_at = self._probe_started + self.probe_timeout_seconds
+            if self.state == "open" and now - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"  # esta chamada é o teste
+                self._probe_started = now
+                return True
+            raise AnaUnavailableError("API ANA indisponível (circuito aberto)")
+
+    def abandon_probe(self) -> None:
+        """Chamada de teste interrompida sem resultado (ex.: tarefa cancelada): volta a open."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                log.info("API ANA respondeu; circuito fechado.")
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    log.warning("API ANA falhando (%d falhas seguidas); circuito aberto por %ss.",
+                                self._failures, self.reset_seconds)
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Tentativas (ANA_RETRY_ATTEMPTS, incluindo a primeira) e espera com backoff exponencial + full jitter."""
+
+    def __init__(self, attempts: int, base_seconds: float, max_seconds: float):
+        self.attempts = max(1, attempts)
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes da nova tentativa número `attempt` (1, 2, ...)."""
+        return random.uniform(0, min(self.max_seconds, self.base_seconds * 2 ** (attempt - 1)))
+
+
+def build_resilience() -> tuple[RetryPolicy, CircuitBreaker]:
+    settings = get_settings()
+    policy = RetryPolicy(
+        settings.ana_retry_attempts,
+        settings.ana_retry_backoff_base_seconds,
+        settings.ana_retry_backoff_max_seconds,
+    )
+    breaker = CircuitBreaker(
+        settings.ana_circuit_failure_threshold,
+        settings.ana_circuit_reset_seconds,
+        settings.ana_circuit_probe_timeout_seconds,
+    )
+    return policy, breaker
+
+
+def call_with_retry(
+    op: Callable[[], T],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker,
+    retryable: Callable[[BaseException], bool],
+) -> T:
+    """
+    Executa `op` com novas tentativas e circuit breaker. Erros não retentáveis (ex.: 4xx) sobem direto.
+    A chamada síncrona não pode ser interrompida: um teste travado é liberado pelo prazo em before_call.
+    """
+    attempt = 0
+    while True:
+        probe = breaker.before_call()
+        try:
+            result = op()
+        except BaseException as ex:
+            if not isinstance(ex, Exception):
+                if probe:
+                    breaker.abandon_probe()
+                raise
+            if not retryable(ex):
+                breaker.record_success()  # a API respondeu; o erro é da requisição
+                raise
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= policy.attempts:
+                raise
+            delay = policy.delay(attempt)
+            log.debug("Falha na API ANA (%s); nova tentativa %d em %.2fs.", ex, attempt + 1, delay)
+            time.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+
+
+async def acall_with_retry(
+    op: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker,
+    retryable: Callable[[BaseException], bool],
+) -> T:
+    """
+    Versão assíncrona de call_with_retry (mesmas regras; espera com asyncio.sleep).
+    A chamada de teste é cancelada após ANA_CIRCUIT_PROBE_TIMEOUT_SECONDS e conta como falha.
+    """
+    attempt = 0
+    while True:
+        probe = breaker.before_call()
+        try:
+            result = await (asyncio.wait_for(op(), breaker.probe_timeout_seconds) if probe else op())
+        except BaseException as ex:
+            if not isinstance(ex, Exception):
+                # cancelada (TaskGroup do lote, cliente desconectado): o teste não terminou
+                if probe:
+                    breaker.abandon_probe()
+                raise
+            timed_out = probe and isinstance(ex, TimeoutError)
+            if not timed_out and not retryable(ex):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= policy.attempts:
+                if timed_out:
+                    raise AnaUnavailableError("API ANA sem resposta na chamada de teste (circuito aberto)") from ex
+                raise
+            delay = policy.delay(attempt)
+            log.debug("Falha na API ANA (%s); nova tentativa %d em %.2fs.", ex, attempt + 1, delay)
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
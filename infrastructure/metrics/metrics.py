@@ -0,0 +1,90 @@
+"""
+Métricas da aplicação (expostas em GET /metrics). Os nomes seguem as convenções do Prometheus:
+durações em segundos (histogramas), contadores com sufixo _total.
+"""
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from pymongo import monitoring
+
+from infrastructure.metrics.registry import Counter, Gauge, Histogram, metrics_enabled
+
+# HTTP (MetricsMiddleware)
+HTTP_REQUESTS = Counter("http_requests_total", "Requisições HTTP concluídas.", ("method", "route", "status"))
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Duração das requisições HTTP.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requisições HTTP em andamento.", ("method", "route"))
+
+# MongoDB (comandos enviados pelo driver: find, getMore, update, insert, delete, aggregate...)
+MONGO_COMMAND_SECONDS = Histogram("mongo_command_duration_seconds", "Duração dos comandos MongoDB.", ("command",))
+MONGO_COMMAND_ERRORS = Counter("mongo_command_errors_total", "Comandos MongoDB que falharam.", ("command",))
+
+# API ANA
+ANA_FETCH_SECONDS = Histogram(
+    "ana_fetch_duration_seconds", "Consulta ao inventário ANA (com novas tentativas).", ("client",)
+)
+ANA_FETCH_ERRORS = Counter("ana_fetch_errors_total", "Consultas ao inventário ANA que falharam.", ("client", "error"))
+ANA_TOKEN_SECONDS = Histogram("ana_token_fetch_duration_seconds", "Obtenção de token na API ANA.", ("client",))
+ANA_TOKEN_ERRORS = Counter("ana_token_fetch_errors_total", "Falhas ao obter token na API ANA.", ("client", "error"))
+ANA_CACHE_LOOKUPS = Counter("ana_cache_lookups_total", "Consultas ao cache do inventário ANA.", ("result",))
+
+# Enriquecimento e importação
+ENRICHMENTS = Counter(
+    "enrichment_total", "Estações enriquecidas com a API ANA (inline, outbox, sweep).", ("path", "result")
+)
+IMPORT_LINES = Counter("import_lines_total", "Linhas de arquivos importados, por resultado.", ("result",))
+IMPORT_SECONDS = Histogram(
+    "import_duration_seconds", "Duração das importações de arquivo.", ("mode",),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+# Amostrados a cada GET /metrics
+THREADPOOL_BUSY = Gauge("threadpool_busy_threads", "Threads em uso no threadpool do event loop (anyio).")
+THREADPOOL_LIMIT = Gauge("threadpool_max_threads", "Limite de threads do threadpool do event loop.")
+THREADPOOL_WAITING = Gauge("threadpool_tasks_waiting", "Tarefas aguardando uma thread livre do threadpool.")
+REPLICA_READY = Gauge("station_replica_ready", "Réplica em memória do catálogo pronta (1) ou não (0).")
+REPLICA_STATIONS = Gauge("station_replica_stations", "Estações na réplica em memória.")
+REPLICA_VERSION = Gauge("station_replica_catalog_version", "Versão do catálogo refletida na réplica.")
+REPLICA_STALENESS = Gauge(
+    "station_replica_staleness_seconds", "Segundos desde a última confirmação de que a réplica está em dia."
+)
+
+
+@contextmanager
+def track(histogram: Histogram, errors: Counter, **labels: Any) -> Iterator[None]:
+    """Observa a duração do bloco; exceções contam no contador de erros (rótulo error) e seguem."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as ex:
+        errors.inc(error=type(ex).__name__, **labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def record_import(report: Dict[str, Any], seconds: float, mode: str) -> None:
+    """Contabiliza o relatório de uma importação (ImportStationsUseCase.execute)."""
+    IMPORT_LINES.inc(report.get("imported", 0), result="imported")
+    IMPORT_LINES.inc(len(report.get("ignored", [])), result="ignored")
+    IMPORT_LINES.inc(len(report.get("errors", [])), result="error")
+    IMPORT_SECONDS.observe(seconds, mode=mode)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Listener do driver (síncrono e assíncrono): duração e falhas por comando."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name)
+        MONGO_COMMAND_ERRORS.inc(command=event.command_name)
+
+
+def mongo_event_listeners() -> List[monitoring.CommandListener]:
+    """event_listeners dos clientes Mongo: vazio com métricas desligadas (nenhum custo no driver)."""
+    return [MongoCommandMetrics()] if metrics_enabled() else []
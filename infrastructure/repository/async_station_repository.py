@@ -0,0 +1,580 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from pymongo import ASCENDING, AsyncMongoClient, errors as mg_errors
+from pymongo.asynchronous.collection import AsyncCollection
+
+from domain.models.station_model import StationModel
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+from domain.service.stations_info import AsyncStationInformation, StationInformation
+from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.gateway.ana_client.ana_inventory_cache import AsyncAnaInventoryCache
+from infrastructure.gateway.ana_client.async_ana_api_client import AsyncAnaApiClient
+from infrastructure.gateway.ana_client.cached_ana_client import AsyncCachedAnaClient
+from infrastructure.metrics.metrics import ENRICHMENTS, mongo_event_listeners
+from infrastructure.repository.catalog_revisions import (
+    CHANGES_PROJECTION,
+    TOMBSTONE_PROJECTION,
+    AsyncCatalogRevisions,
+    merge_changes,
+)
+from infrastructure.repository.enrichment_outbox import OUTBOX_COLLECTION, outbox_upserts
+from infrastructure.repository.station_queries import (
+    CATALOG_META_COLLECTION,
+    CATALOG_VERSION_FILTER,
+    CHANGES_INDEX,
+    STATION_INDEXES,
+    STATS_PIPELINE,
+    TOMBSTONE_INDEXES,
+    TOMBSTONES_COLLECTION,
+    VersionedCache,
+    bbox_filter,
+    bulk_error_counts,
+    bulk_write_counts,
+    changed_stations,
+    changes_filter,
+    codes_filter,
+    collection_scans,
+    content_hash,
+    enrichment_candidates,
+    filter_plan_checks,
+    manual_filter,
+    near_pipeline,
+    page_filter,
+    page_result,
+    removed_codes,
+    station_document,
+    revision_fields,
+    station_projection,
+    station_updates,
+    stats_document,
+    stored_projection,
+    tombstone_upserts,
+    write_counts,
+)
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+class AsyncMongoStationRepository(AsyncStationRepositoryPort):
+    """
+    Implementação MongoDB assíncrona (AsyncMongoClient) do AsyncStationRepositoryPort.
+    Mesmo comportamento do MongoStationRepository, sem bloquear o event loop:
+    - ENRICHMENT_MODE=inline (padrão): enriquece via AsyncStationInformation (API ANA com httpx + cache do inventário)
+      antes de gravar; outbox (opt-in): grava já e registra a pendência em 'enrichment_outbox' (EnrichmentWorker).
+    - Criação de índice (unique) em 'codigo_estacao' (ensure_indexes, chamado no startup).
+    - Uma instância por processo: o AsyncMongoClient mantém o pool de conexões.
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+        self.client = AsyncMongoClient(
+            self.settings.mongo_uri,
+            serverSelectionTimeoutMS=5000,  # evita pendurar fio em ambientes ruins
+            connectTimeoutMS=5000,
+            socketTimeoutMS=10000,
+            maxPoolSize=self.settings.mongo_max_pool_size,
+            minPoolSize=self.settings.mongo_min_pool_size,
+            event_listeners=mongo_event_listeners(),
+        )
+        self.db = self.client[self.settings.mongo_db_name]
+        self.collection: AsyncCollection = self.db["estacoes"]
+        self.outbox: AsyncCollection = self.db[OUTBOX_COLLECTION]
+        self.meta: AsyncCollection = self.db[CATALOG_META_COLLECTION]
+        self.tombstones: AsyncCollection = self.db[TOMBSTONES_COLLECTION]
+        # contagens de GET /stations/stats: (versão do catálogo, resultado); uma agregação por versão
+        self._stats = VersionedCache()
+        self._stats_lock = asyncio.Lock()
+        self.revisions = AsyncCatalogRevisions(self.meta)
+
+        self.ana_client = AsyncAnaApiClient()
+        self.ana_cache = AsyncAnaInventoryCache(self.db["ana_inventario_cache"])
+        self.station_information = AsyncStationInformation(AsyncCachedAnaClient(self.ana_client, self.ana_cache))
+
+    async def ensure_indexes(self) -> None:
+        """
+        Valida a conexão e cria os índices da coleção. Idempotente; deve rodar uma vez no startup.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            # Força um ping inicial para falhas rápidas de conexão
+            await self.client.admin.command("ping")
+        except mg_errors.PyMongoError as e:
+            log.exception("Falha ao conectar ao MongoDB.")
+            raise RepositoryError(f"Falha ao conectar ao MongoDB: {e}") from e
+
+        try:
+            for keys, options in STATION_INDEXES:
+                await self.collection.create_index(keys, **options)
+            for keys, options in TOMBSTONE_INDEXES:
+                await self.tombstones.create_index(keys, **options)
+            await self.ana_cache.ensure_indexes()
+            # estações gravadas antes das revisões entram todas numa mesma revisão
+            if await self.collection.find_one({"revision": None}, {"_id": 1}) is not None:
+                async with self.revisions.stamp() as revision:
+                    await self.collection.update_many({"revision": None}, {"$set": revision_fields(revision)})
+        except mg_errors.PyMongoError as e:
+            log.exception("Falha ao preparar a coleção/índices.")
+            raise RepositoryError(f"Falha ao preparar a coleção/índices: {e}") from e
+
+        try:
+            scans = await self.filter_collection_scans()
+        except RepositoryError:
+            return  # já logado; a verificação não impede o startup
+        if scans:
+            log.error("Filtros de GET /stations sem índice (COLLSCAN): %s", ", ".join(scans))
+
+    async def filter_collection_scans(self) -> Dict[str, List[str]]:
+        """
+        Explain de cada filtro suportado em GET /stations (sozinhos e combinados), no formato da listagem
+        (ordem por codigo_estacao). Retorna os filtros cujo plano vencedor varre a coleção.
+        Em falha, lança RepositoryError.
+        """
+        scans: Dict[str, List[str]] = {}
+        try:
+            for name, filtro in filter_plan_checks():
+                cursor = self.collection.find(filtro, station_projection()).sort("codigo_estacao", ASCENDING).limit(1)
+                if stages := collection_scans(await cursor.explain()):
+                    scans[name] = stages
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao verificar os planos dos filtros.")
+            raise RepositoryError(f"Erro ao verificar os planos dos filtros: {e}") from e
+        return scans
+
+    async def close(self) -> None:
+        """Fecha o pool de conexões e o cliente HTTP da ANA (shutdown da aplicação)."""
+        await self.ana_client.aclose()
+        await self.client.close()
+
+    # ---------------------------
+    # Operações de escrita
+    # ---------------------------
+
+    async def save(self, station: StationModel) -> bool:
+        """
+        Upsert por codigo_estacao.
+        Retorna True se houve upsert com sucesso.
+        Lança RepositoryError para erros de Mongo.
+        """
+        try:
+            digest = content_hash(station)
+            if self.settings.enrichment_mode == "outbox":
+                await self._write_first([(station, digest)], await self._stored_documents([station.codigo_estacao]))
+                return True
+
+            checked_ana = StationInformation.needs_enrichment(station)
+            station = await self._enrich(station)
+
+            async with self.revisions.stamp() as revision:
+                await self.collection.replace_one(
+                    {"codigo_estacao": station.codigo_estacao},
+                    station_document(station, checked_ana, revision, digest),
+                    upsert=True,
+                )
+            return True
+        except mg_errors.DuplicateKeyError as e:
+            log.exception("Violação de chave única em save(%s).", station.codigo_estacao)
+            raise RepositoryError(f"Duplicidade detectada para codigo_estacao={station.codigo_estacao}: {e}") from e
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao salvar estação %s.", station.codigo_estacao)
+            raise RepositoryError(f"Erro ao salvar estação {station.codigo_estacao}: {e}") from e
+
+    async def save_many(self, stations: Iterable[StationModel]) -> Dict[str, int]:
+        """
+        Upsert em lote (bulk_write, ordered=False) só do que mudou: mesma regra de MongoStationRepository.save_many
+        (content_hash igual ao gravado → pulada; demais → $set dos campos alterados).
+        No modo outbox grava direto; no modo inline o enriquecimento via API ANA roda antes,
+        em paralelo (ANA_ENRICHMENT_CONCURRENCY). A ordem das operações segue a ordem de entrada.
+        Retorna as contagens {"inserted", "updated", "unchanged"}.
+        Lança RepositoryError para erros graves de Mongo.
+        """
+        counts = write_counts(0, 0, 0, 0)
+        try:
+            stations = list(stations)
+            if not stations:
+                return counts
+
+            stored = await self._stored_documents(e.codigo_estacao for e in stations)
+            changed = changed_stations(stations, stored)
+            counts["unchanged"] = len(stations) - len(changed)
+            if not changed:
+                return counts
+
+            if self.settings.enrichment_mode == "outbox":
+                result, refreshed = await self._write_first(changed, stored)
+            else:
+                checked_ana = enrichment_candidates(e for e, _ in changed)
+                await self._enrich_many([e for e, _ in changed])
+                async with self.revisions.stamp() as revision:
+                    ops, refreshed = station_updates(changed, stored, revision, replace=True, checked_ana=checked_ana)
+                    result = await self.collection.bulk_write(ops, ordered=False)
+            return bulk_write_counts(result, refreshed, counts["unchanged"])
+
+        except mg_errors.BulkWriteError as e:
+            log.error("BulkWriteError em save_many: %s", e.details, exc_info=True)
+            try:
+                return bulk_error_counts(e, counts["unchanged"])
+            except Exception:
+                raise RepositoryError(f"Erro em operação bulk: {e}") from e
+
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo em save_many.")
+            raise RepositoryError(f"Erro ao salvar em lote: {e}") from e
+
+    async def _stored_documents(self, codes: Iterable[str]) -> Dict[str, dict]:
+        """Documentos gravados (campos de negócio + content_hash) das estações do lote, por codigo_estacao."""
+        cursor = self.collection.find(codes_filter(codes), stored_projection())
+        return {doc["codigo_estacao"]: doc async for doc in cursor}
+
+    async def _write_first(self, stations: List[Tuple[StationModel, str]], stored: Mapping[str, dict]):
+        """
+        Grava as estações ($set dos campos alterados, sem esperar a API ANA) e marca as incompletas no outbox.
+        Mesma ordem/atomicidade e retorno de MongoStationRepository._write_first.
+        """
+        pending = outbox_upserts(enrichment_candidates(e for e, _ in stations))
+
+        async def write(session=None):
+            if pending:
+                try:
+                    await self.outbox.bulk_write(pending, ordered=False, session=session)
+                except mg_errors.BulkWriteError as e:
+                    raise RepositoryError(f"Erro ao registrar enriquecimento pendente: {e}") from e
+            return await self.collection.bulk_write(ops, ordered=False, session=session)
+
+        async with self.revisions.stamp() as revision:
+            ops, refreshed = station_updates(stations, stored, revision)
+            if self.settings.enrichment_outbox_transactions:
+                async with self.client.start_session() as session:
+                    return await session.with_transaction(write), refreshed
+            return await write(), refreshed
+
+    async def _enrich(self, station: StationModel) -> StationModel:
+        try:
+            enriched = await self.station_information.get_additional_information(station=station)
+            ENRICHMENTS.inc(path="inline", result="ok")
+            return enriched
+        except Exception:
+            ENRICHMENTS.inc(path="inline", result="failed")
+            log.warning("Falha no enriquecimento da estação %s.",
+                        getattr(station, "codigo_estacao", "?"), exc_info=True)
+            raise RepositoryError(f"Falha ao buscar dados adicionais da estação {station.ponto} - {station.codigo_estacao}, na API ANA")
+
+    async def _enrich_many(self, stations: List[StationModel]) -> None:
+        """Enriquece as estações (in-place) com no máximo ANA_ENRICHMENT_CONCURRENCY chamadas simultâneas."""
+        semaphore = asyncio.Semaphore(max(1, self.settings.ana_enrichment_concurrency))
+
+        async def bounded(station: StationModel) -> StationModel:
+            async with semaphore:
+                return await self._enrich(station)
+
+        # TaskGroup cancela as demais tarefas na primeira falha
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for e in stations:
+                    tg.create_task(bounded(e))
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+
+    # ---------------------------
+    # Operações de leitura
+    # ---------------------------
+
+    async def list_all_stations(self, dados_estacao_manual: Optional[bool] = None) -> List[StationModel]:
+        """
+        Retorna todas as estações.
+        Se dados_estacao_manual for True/False filtra por esse valor; se for None retorna tudo.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            docs = await self.collection.find(manual_filter(dados_estacao_manual)).to_list()
+            return [StationModel(**doc) for doc in docs]
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao listar estações.")
+            raise RepositoryError(f"Erro ao listar estações: {e}") from e
+        except Exception as e:
+            log.exception("Erro ao materializar StationModel na listagem.")
+            raise RepositoryError(f"Erro ao montar modelos na listagem: {e}") from e
+
+    async def list_stations_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Página de estações ordenada por codigo_estacao (keyset, usa o índice único).
+        filters: igualdade nos campos de STATION_FILTER_FIELDS (índices ix_<campo>_codigo).
+        Os documentos voltam projetados (sem _id) e sem materializar StationModel.
+        Retorna (documentos, cursor) — cursor é o último codigo_estacao se houver próxima página.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            cursor = (
+                self.collection.find(page_filter(after, filters), station_projection(fields))
+                .sort("codigo_estacao", ASCENDING)
+                .limit(limit + 1)  # +1 indica se existe próxima página
+            )
+            docs = await cursor.to_list()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao paginar estações.")
+            raise RepositoryError(f"Erro ao listar estações: {e}") from e
+        return page_result(docs, limit)
+
+    async def iter_station_batches(
+        self,
+        batch_size: int,
+        dados_estacao_manual: Optional[bool] = None,
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Percorre as estações (ordem de codigo_estacao) em lotes de até batch_size documentos,
+        projetados e sem _id. Nada além do lote corrente fica em memória.
+        Em falha, lança RepositoryError.
+        """
+        cursor = (
+            self.collection.find(manual_filter(dados_estacao_manual), station_projection())
+            .sort("codigo_estacao", ASCENDING)
+            .batch_size(batch_size)
+        )
+        try:
+            batch: List[dict] = []
+            async for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao exportar estações.")
+            raise RepositoryError(f"Erro ao exportar estações: {e}") from e
+        finally:
+            await cursor.close()
+
+    async def catalog_version(self) -> int:
+        """
+        Versão atual do catálogo: muda a cada escrita (save, save_many, remoção, enriquecimento).
+        Leitura de um único documento; base do ETag das leituras.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            doc = await self.meta.find_one(CATALOG_VERSION_FILTER)
+            return int(doc["version"]) if doc else 0
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao ler a versão do catálogo.")
+            raise RepositoryError(f"Erro ao ler a versão do catálogo: {e}") from e
+
+    async def catalog_stats(self) -> dict:
+        """
+        Mesmo contrato de MongoStationRepository.catalog_stats (o lock serializa só o recálculo).
+        Em falha, lança RepositoryError.
+        """
+        version = await self.catalog_version()
+        async with self._stats_lock:
+            if (stats := self._stats.get(version)) is not None:
+                return stats
+            try:
+                cursor = await self.collection.aggregate(STATS_PIPELINE)
+                facets = await cursor.to_list()
+            except mg_errors.PyMongoError as e:
+                log.exception("Erro Mongo ao calcular as estatísticas do catálogo.")
+                raise RepositoryError(f"Erro ao calcular as estatísticas do catálogo: {e}") from e
+            return self._stats.put(version, stats_document(facets[0] if facets else {}))
+
+    async def existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        """
+        Retorna o subconjunto de `codes` já presente na coleção.
+        Usa $in sobre o índice único, projetando só codigo_estacao (covered query).
+        Em falha, lança RepositoryError.
+        """
+        codes = list(set(codes))
+        if not codes:
+            return set()
+        try:
+            cursor = self.collection.find(
+                {"codigo_estacao": {"$in": codes}},
+                {"_id": 0, "codigo_estacao": 1},
+            )
+            return {doc["codigo_estacao"] async for doc in cursor}
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao verificar códigos existentes.")
+            raise RepositoryError(f"Erro ao verificar estações existentes: {e}") from e
+
+    async def find_station_by_code_station(self, code_station: str) -> Optional[StationModel]:
+        """
+        Busca por codigo_estacao.
+        Retorna StationModel ou None.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            doc = await self.collection.find_one({"codigo_estacao": code_station})
+            return StationModel(**doc) if doc else None
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao buscar estação %s.", code_station)
+            raise RepositoryError(f"Erro ao buscar estação {code_station}: {e}") from e
+        except Exception as e:
+            log.exception("Erro ao materializar StationModel em find_station_by_code_station.")
+            raise RepositoryError(f"Erro ao montar modelo da estação {code_station}: {e}") from e
+
+    async def find_stations_by_codes(self, codes: Iterable[str]) -> List[dict]:
+        """
+        Estações com os códigos informados: um único $in sobre o índice único.
+        Documentos projetados (sem _id), na ordem de codigo_estacao.
+        Em falha, lança RepositoryError.
+        """
+        codes = list(set(codes))
+        if not codes:
+            return []
+        try:
+            cursor = self.collection.find({"codigo_estacao": {"$in": codes}}, station_projection())
+            return await cursor.sort("codigo_estacao", ASCENDING).to_list()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao buscar estações por código.")
+            raise RepositoryError(f"Erro ao buscar estações: {e}") from e
+
+    # ---------------------------
+    # Operações de remoção
+    # ---------------------------
+
+    async def remove_station_by_code_station(self, code_station: str) -> int:
+        """
+        Remove por codigo_estacao.
+        Retorna a contagem de removidos (0 ou 1).
+        Em falha, lança RepositoryError.
+        """
+        try:
+            res = await self.collection.delete_one({"codigo_estacao": code_station})
+            if res.deleted_count:
+                await self._record_removals([code_station])
+            return int(res.deleted_count or 0)
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao remover estação %s.", code_station)
+            raise RepositoryError(f"Erro ao remover estação {code_station}: {e}") from e
+
+    async def remove_stations_by_codes(self, codes: Iterable[str]) -> Set[str]:
+        """
+        Remove as estações com os códigos informados com um único delete_many (por _id).
+        Retorna os códigos efetivamente removidos: se a contagem do delete não bate com os
+        documentos lidos (remoção ou reinserção concorrente), os que continuam no banco saem do resultado.
+        Em falha, lança RepositoryError.
+        """
+        codes = list(set(codes))
+        if not codes:
+            return set()
+        try:
+            matched = {
+                doc["_id"]: doc["codigo_estacao"]
+                async for doc in self.collection.find({"codigo_estacao": {"$in": codes}}, {"codigo_estacao": 1})
+            }
+            if not matched:
+                return set()
+            async with self.revisions.stamp() as revision:
+                res = await self.collection.delete_many({"_id": {"$in": list(matched)}})
+                remaining = set()
+                if res.deleted_count != len(matched):
+                    remaining = {
+                        doc["codigo_estacao"]
+                        async for doc in self.collection.find(
+                            codes_filter(matched.values()), {"_id": 0, "codigo_estacao": 1}
+                        )
+                    }
+                removed = removed_codes(matched, res.deleted_count, remaining)
+                if removed:
+                    await self.tombstones.bulk_write(tombstone_upserts(removed, revision), ordered=False)
+            return removed
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao remover estações em lote.")
+            raise RepositoryError(f"Erro ao remover estações: {e}") from e
+
+    async def _record_removals(self, codes: Iterable[str]) -> None:
+        """Tombstones das estações removidas (as remoções também entram na sincronização incremental)."""
+        async with self.revisions.stamp() as revision:
+            await self.tombstones.bulk_write(tombstone_upserts(codes, revision), ordered=False)
+
+    # ---------------------------
+    # Sincronização incremental
+    # ---------------------------
+
+    async def catalog_revision(self) -> Tuple[int, int]:
+        """
+        (revisão segura, purged_through) — mesmo contrato de MongoStationRepository.catalog_revision.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            return await self.revisions.current()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao ler a revisão do catálogo.")
+            raise RepositoryError(f"Erro ao ler a revisão do catálogo: {e}") from e
+
+    async def list_changes(
+        self,
+        since: int,
+        until: int,
+        limit: int,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+        """
+        Mudanças (upserts e remoções) com revisão em (since, until], em ordem de (revision, codigo_estacao).
+        Mesmo contrato de MongoStationRepository.list_changes.
+        Em falha, lança RepositoryError.
+        """
+        filtro = changes_filter(since, until, after)
+        try:
+            stations = await (
+                self.collection.find(filtro, CHANGES_PROJECTION).sort(CHANGES_INDEX).limit(limit + 1).to_list()
+            )
+            tombstones = await (
+                self.tombstones.find(filtro, TOMBSTONE_PROJECTION).sort(CHANGES_INDEX).limit(limit + 1).to_list()
+            )
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao listar mudanças do catálogo.")
+            raise RepositoryError(f"Erro ao listar mudanças do catálogo: {e}") from e
+        return merge_changes(stations, tombstones, limit)
+
+    # ---------------------------
+    # Consultas geográficas
+    # ---------------------------
+
+    async def find_stations_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float,
+        limit: int,
+    ) -> List[dict]:
+        """
+        Mesmo contrato de MongoStationRepository.find_stations_near.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            cursor = await self.collection.aggregate(near_pipeline(latitude, longitude, max_distance_m, limit))
+            return await cursor.to_list()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo na busca por proximidade.")
+            raise RepositoryError(f"Erro na busca por proximidade: {e}") from e
+
+    async def list_stations_in_bbox(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Mesmo contrato de MongoStationRepository.list_stations_in_bbox.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            cursor = (
+                self.collection.find(bbox_filter(min_lon, min_lat, max_lon, max_lat, after), station_projection())
+                .sort("codigo_estacao", ASCENDING)
+                .limit(limit + 1)  # +1 indica se existe próxima página
+            )
+            docs = await cursor.to_list()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo na busca por bbox.")
+            raise RepositoryError(f"Erro na busca por bbox: {e}") from e
+        return page_result(docs, limit)
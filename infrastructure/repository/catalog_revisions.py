@@ -0,0 +1,236 @@
+"""
+Revisões do catálogo (sincronização incremental, GET /stations/changes).
+
+Toda escrita em 'estacoes' reserva uma revisão no documento de 'catalog_meta' (contador monotônico),
+carimba os documentos tocados com ela e, ao terminar, libera a reserva e incrementa a versão (ETag).
+Reservas em andamento ficam em `pending`: com vários workers uma revisão maior pode ser gravada antes de
+uma menor, então os consumidores só enxergam até a revisão "segura" (abaixo da menor reserva aberta).
+Enquanto o bloco da escrita roda, a reserva é renovada (heartbeat a cada STATION_CHANGES_PENDING_SECONDS / 3):
+só reservas de escritores que morreram no meio expiram após STATION_CHANGES_PENDING_SECONDS.
+"""
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pymongo import ReturnDocument, UpdateOne, errors as mg_errors
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.synchronous.collection import Collection
+
+from infrastructure.repository.station_queries import CATALOG_VERSION_FILTER, CHANGES_INDEX, station_projection
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+# $inc da revisão e registro da reserva numa única operação (pipeline de update, MongoDB 4.2+)
+RESERVE_REVISION = [
+    {"$set": {"revision": {"$add": [{"$ifNull": ["$revision", 0]}, 1]}}},
+    {"$set": {"pending": {"$concatArrays": [
+        {"$ifNull": ["$pending", []]},
+        [{"rev": "$revision", "at": "$$NOW"}],
+    ]}}},
+]
+
+CHANGES_PROJECTION = {**station_projection(), "revision": 1, "updated_at": 1}
+TOMBSTONE_PROJECTION = {"_id": 0, "codigo_estacao": 1, "revision": 1, "deleted_at": 1}
+
+
+def release_revision(revision: int) -> dict:
+    """Fecha a reserva e incrementa a versão do catálogo (a escrita terminou, com ou sem sucesso)."""
+    return {"$pull": {"pending": {"rev": revision}}, "$inc": {"version": 1}}
+
+
+def touch_revisions(revisions: Iterable[int]) -> List[UpdateOne]:
+    """Heartbeat das reservas abertas deste processo: renova `at` de cada uma (reservas já liberadas não casam)."""
+    now = datetime.now(timezone.utc)
+    return [
+        UpdateOne({**CATALOG_VERSION_FILTER, "pending.rev": revision}, {"$set": {"pending.$.at": now}})
+        for revision in revisions
+    ]
+
+
+def heartbeat_seconds(pending_seconds: float) -> float:
+    """Intervalo do heartbeat: três renovações por janela de expiração."""
+    return max(0.1, pending_seconds / 3)
+
+
+def safe_revision(meta: Optional[dict], pending_seconds: float) -> Tuple[int, int]:
+    """
+    (revisão segura, purged_through) a partir do documento de 'catalog_meta'.
+    Segura = tudo até ela já foi gravado: revisão atual, ou a menor reserva aberta - 1.
+    """
+    if not meta:
+        return 0, 0
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=pending_seconds)
+    open_revs = [
+        p["rev"] for p in meta.get("pending") or []
+        if _aware(p.get("at")) is None or _aware(p["at"]) >= cutoff
+    ]
+    revision = int(meta.get("revision") or 0)
+    if open_revs:
+        revision = min(revision, min(open_revs) - 1)
+    return revision, int(meta.get("purged_through") or 0)
+
+
+def merge_changes(
+    stations: List[dict],
+    tombstones: List[dict],
+    limit: int,
+) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+    """
+    Intercala estações e remoções (cada lista já em ordem de revision, codigo_estacao).
+    Retorna (mudanças, chave da última) — a chave só vem se houver próxima página.
+    """
+    upserts = (
+        {
+            "op": "upsert",
+            "revision": doc.pop("revision"),
+            "updated_at": doc.pop("updated_at", None),
+            "station": doc,
+        }
+        for doc in stations
+    )
+    deletes = ({"op": "delete", **doc} for doc in tombstones)
+    changes = list(heapq.merge(upserts, deletes, key=_change_key))[: limit + 1]
+    if len(changes) > limit:
+        changes = changes[:limit]
+        return changes, _change_key(changes[-1])
+    return changes, None
+
+
+def _change_key(change: dict) -> Tuple[int, str]:
+    code = change["station"]["codigo_estacao"] if change["op"] == "upsert" else change["codigo_estacao"]
+    return change["revision"], code
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # o cliente Mongo devolve datas ingênuas (UTC)
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class CatalogRevisions:
+    """Reserva/liberação de revisões e limpeza de remoções antigas (driver síncrono)."""
+
+    def __init__(self, meta: Collection, tombstones: Collection) -> None:
+        self.settings = get_settings()
+        self.meta = meta
+        self.tombstones = tombstones
+        # reservas abertas deste processo, renovadas por uma thread que só existe enquanto há alguma
+        self._open: Set[int] = set()
+        self._open_lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    @contextmanager
+    def stamp(self) -> Iterator[int]:
+        """
+        Revisão para a escrita do bloco; renovada enquanto o bloco roda e liberada
+        (com a versão incrementada) mesmo se a escrita falhar.
+        """
+        doc = self.meta.find_one_and_update(
+            CATALOG_VERSION_FILTER,
+            RESERVE_REVISION,
+            projection={"revision": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        revision = int(doc["revision"])
+        with self._open_lock:
+            self._open.add(revision)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name="catalog-revisions", daemon=True)
+                self._heartbeat.start()
+        try:
+            yield revision
+        finally:
+            with self._open_lock:
+                self._open.discard(revision)
+            self.meta.update_one(CATALOG_VERSION_FILTER, release_revision(revision))
+
+    def _beat(self) -> None:
+        interval = heartbeat_seconds(self.settings.station_changes_pending_seconds)
+        while True:
+            time.sleep(interval)
+            with self._open_lock:
+                if not self._open:
+                    self._heartbeat = None
+                    return
+                revisions = list(self._open)
+            try:
+                self.meta.bulk_write(touch_revisions(revisions), ordered=False)
+            except mg_errors.PyMongoError as e:
+                log.warning("Falha ao renovar as reservas de revisão %s: %s", revisions, e)
+
+    def current(self) -> Tuple[int, int]:
+        return safe_revision(self.meta.find_one(CATALOG_VERSION_FILTER), self.settings.station_changes_pending_seconds)
+
+    def purge(self) -> int:
+        """
+        Remove tombstones mais antigos que STATION_TOMBSTONE_RETENTION_DAYS e reservas expiradas.
+        purged_through avança antes da remoção: quem pedir mudanças desde antes dela recebe 410.
+        Retorna quantos tombstones foram removidos.
+        """
+        now = datetime.now(timezone.utc)
+        self.meta.update_one(
+            CATALOG_VERSION_FILTER,
+            {"$pull": {"pending": {"at": {"$lt": now - timedelta(seconds=self.settings.station_changes_pending_seconds)}}}},
+        )
+        expired = {"deleted_at": {"$lt": now - timedelta(days=self.settings.station_tombstone_retention_days)}}
+        newest = self.tombstones.find_one(expired, {"revision": 1}, sort=[("revision", -1)])
+        if newest is None:
+            return 0
+        self.meta.update_one(CATALOG_VERSION_FILTER, {"$max": {"purged_through": newest["revision"]}}, upsert=True)
+        removed = self.tombstones.delete_many({**expired, "revision": {"$lte": newest["revision"]}}).deleted_count
+        log.info("Tombstones do catálogo removidos: %d (até a revisão %d).", removed, newest["revision"])
+        return removed
+
+
+class AsyncCatalogRevisions:
+    """Mesmo contrato de CatalogRevisions para o driver assíncrono (a limpeza roda só no job síncrono)."""
+
+    def __init__(self, meta: AsyncCollection) -> None:
+        self.settings = get_settings()
+        self.meta = meta
+        # reservas abertas deste processo, renovadas por uma tarefa que só existe enquanto há alguma
+        self._open: Set[int] = set()
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def stamp(self) -> AsyncIterator[int]:
+        doc = await self.meta.find_one_and_update(
+            CATALOG_VERSION_FILTER,
+            RESERVE_REVISION,
+            projection={"revision": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        revision = int(doc["revision"])
+        self._open.add(revision)
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._beat(), name="catalog-revisions")
+        try:
+            yield revision
+        finally:
+            self._open.discard(revision)
+            await self.meta.update_one(CATALOG_VERSION_FILTER, release_revision(revision))
+
+    async def _beat(self) -> None:
+        interval = heartbeat_seconds(self.settings.station_changes_pending_seconds)
+        while True:
+            await asyncio.sleep(interval)
+            if not self._open:
+                return
+            revisions = list(self._open)
+            try:
+                await self.meta.bulk_write(touch_revisions(revisions), ordered=False)
+            except mg_errors.PyMongoError as e:
+                log.warning("Falha ao renovar as reservas de revisão %s: %s", revisions, e)
+
+    async def current(self) -> Tuple[int, int]:
+        meta = await self.meta.find_one(CATALOG_VERSION_FILTER)
+        return safe_revision(meta, self.settings.station_changes_pending_seconds)
@@ -0,0 +1,136 @@
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, DeleteMany, UpdateOne, errors as mg_errors
+from pymongo.synchronous.collection import Collection
+
+from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+OUTBOX_COLLECTION = "enrichment_outbox"
+
+
+def outbox_upserts(codes: Iterable[str], now: Optional[datetime] = None) -> List[UpdateOne]:
+    """
+    Operações que marcam as estações como pendentes de enriquecimento (uma entrada por codigo_estacao).
+    Uma nova escrita reabre a entrada: zera tentativas, erro e lease.
+    Usadas pelos repositórios (síncrono e assíncrono) junto com a gravação da estação.
+    """
+    now = now or datetime.now(timezone.utc)
+    return [
+        UpdateOne(
+            {"_id": code},
+            {
+                "$set": {
+                    "status": "pending",
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                    "lease_owner": None,
+                    "last_error": None,
+                    "updated_at": now,
+                },
+                "$setOnInsert": {"codigo_estacao": code, "enqueued_at": now},
+            },
+            upsert=True,
+        )
+        for code in dict.fromkeys(codes)  # sem repetidos: upserts paralelos do mesmo _id colidem
+    ]
+
+
+class MongoEnrichmentOutbox:
+    """
+    Fila de enriquecimento pendente na coleção 'enrichment_outbox' (_id = codigo_estacao).
+    - claim: reserva um lote de entradas vencidas; a reserva (lease) é o próprio next_attempt_at
+      empurrado ENRICHMENT_LEASE_SECONDS à frente — se o worker morrer, a entrada volta sozinha.
+    - complete: remove as entradas processadas (só se ainda forem do mesmo lease).
+    - retry: reagenda com backoff exponencial e jitter; após ENRICHMENT_MAX_ATTEMPTS fica 'failed'.
+    """
+
+    def __init__(self, collection: Optional[Collection] = None) -> None:
+        self.settings = get_settings()
+        self.collection: Collection = collection if collection is not None else get_mongo_database()[OUTBOX_COLLECTION]
+
+    def ensure_indexes(self) -> None:
+        try:
+            self.collection.create_index(
+                [("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+                name="ix_status_next_attempt_at",
+            )
+        except mg_errors.PyMongoError as e:
+            log.exception("Falha ao preparar a coleção do outbox de enriquecimento.")
+            raise RepositoryError(f"Falha ao preparar a coleção do outbox de enriquecimento: {e}") from e
+
+    def claim(self, batch_size: int) -> Tuple[str, List[str]]:
+        """Reserva até batch_size entradas vencidas. Retorna (lease, códigos reservados)."""
+        now = datetime.now(timezone.utc)
+        due = {"status": "pending", "next_attempt_at": {"$lte": now}}
+        lease = uuid.uuid4().hex
+        try:
+            candidates = [
+                doc["_id"]
+                for doc in self.collection.find(due, {"_id": 1}).sort("next_attempt_at", ASCENDING).limit(batch_size)
+            ]
+            if not candidates:
+                return lease, []
+            # o filtro repete a condição de vencimento: entre dois workers, só um reserva cada entrada
+            self.collection.update_many(
+                {"_id": {"$in": candidates}, **due},
+                {"$set": {
+                    "lease_owner": lease,
+                    "next_attempt_at": now + timedelta(seconds=self.settings.enrichment_lease_seconds),
+                }},
+            )
+            claimed = [doc["_id"] for doc in self.collection.find({"_id": {"$in": candidates}, "lease_owner": lease}, {"_id": 1})]
+            return lease, claimed
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao reservar entradas do outbox de enriquecimento.")
+            raise RepositoryError(f"Erro ao reservar entradas do outbox de enriquecimento: {e}") from e
+
+    def complete(self, lease: str, codes: List[str]) -> None:
+        """Remove as entradas concluídas; uma entrada reaberta por nova escrita (outro lease) permanece."""
+        if not codes:
+            return
+        try:
+            self.collection.bulk_write([DeleteMany({"_id": {"$in": codes}, "lease_owner": lease})])
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao concluir entradas do outbox de enriquecimento.")
+            raise RepositoryError(f"Erro ao concluir entradas do outbox de enriquecimento: {e}") from e
+
+    def retry(self, lease: str, failures: Dict[str, str]) -> None:
+        """Reagenda as entradas com falha (código → mensagem de erro)."""
+        if not failures:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            attempts = {
+                doc["_id"]: int(doc.get("attempts") or 0) + 1
+                for doc in self.collection.find({"_id": {"$in": list(failures)}, "lease_owner": lease}, {"attempts": 1})
+            }
+            ops = []
+            for code, n in attempts.items():
+                fields = {"attempts": n, "last_error": failures[code][:500], "lease_owner": None, "updated_at": now}
+                if n >= self.settings.enrichment_max_attempts:
+                    fields["status"] = "failed"
+                    log.error("Enriquecimento da estação %s desistido após %d tentativas: %s", code, n, failures[code])
+                else:
+                    fields["next_attempt_at"] = now + timedelta(seconds=self._backoff(n))
+                ops.append(UpdateOne({"_id": code, "lease_owner": lease}, {"$set": fields}))
+            if ops:
+                self.collection.bulk_write(ops, ordered=False)
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao reagendar entradas do outbox de enriquecimento.")
+            raise RepositoryError(f"Erro ao reagendar entradas do outbox de enriquecimento: {e}") from e
+
+    def _backoff(self, attempts: int) -> float:
+        """Backoff exponencial limitado, com jitter (50–100% do intervalo) para espalhar as novas tentativas."""
+        ceiling = min(
+            self.settings.enrichment_retry_max_seconds,
+            self.settings.enrichment_retry_base_seconds * 2 ** (attempts - 1),
+        )
+        return ceiling * random.uniform(0.5, 1.0)
@@ -0,0 +1,172 @@
+import logging
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, errors as mg_errors
+from pymongo.synchronous.collection import Collection
+
+from domain.models.station_model import StationModel
+from domain.service.stations_info import StationInformation
+from infrastructure.gateway.ana_client.ana_api_client import AnaApiClient
+from infrastructure.gateway.ana_client.ana_inventory_cache import AnaInventoryCache
+from infrastructure.gateway.ana_client.cached_ana_client import CachedAnaClient
+from infrastructure.gateway.ana_client.rate_limited_ana_client import RateLimitedAnaClient, TokenBucket
+from infrastructure.metrics.metrics import ENRICHMENTS
+from infrastructure.repository.catalog_revisions import CatalogRevisions
+from infrastructure.repository.enrichment_worker import apply_enrichment, enrichment_fields
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.repository.station_queries import (
+    CATALOG_META_COLLECTION,
+    STATION_FIELDS,
+    TOMBSTONES_COLLECTION,
+    stale_enrichment_filter,
+)
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+# lease da rodada: com vários processos só um varre por vez (o orçamento da ANA é global, não por processo)
+LEASE_COLLECTION = "job_leases"
+SWEEP_LEASE_ID = "enrichment-sweep"
+
+
+class EnrichmentSweeper:
+    """
+    Reenriquecimento periódico do catálogo: percorre (índice ix_enriched_at, mais antigas primeiro)
+    as estações nunca consultadas na ANA ou consultadas há mais de ENRICHMENT_SWEEP_MAX_AGE_SECONDS,
+    consulta a API dentro do orçamento ENRICHMENT_SWEEP_RPS / ENRICHMENT_SWEEP_CONCURRENCY
+    e grava o resultado por lote (bulk $set). Falhas ficam para a próxima rodada.
+    Agendado em todos os processos; cada rodada exige o lease em 'job_leases' (ENRICHMENT_SWEEP_LEASE_SECONDS,
+    renovado a cada lote), então só um processo consulta a ANA por vez.
+    """
+
+    def __init__(
+        self,
+        collection: Optional[Collection] = None,
+        station_information: Optional[StationInformation] = None,
+    ) -> None:
+        self.settings = get_settings()
+        db = get_mongo_database()
+        self.collection: Collection = collection if collection is not None else db["estacoes"]
+        # revisão/versão do catálogo (sync incremental e ETag): o enriquecimento também muda o conteúdo servido
+        database = self.collection.database
+        self.revisions = CatalogRevisions(database[CATALOG_META_COLLECTION], database[TOMBSTONES_COLLECTION])
+        self.leases: Collection = database[LEASE_COLLECTION]
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # reenriquecer é consultar a ANA de novo: o cache não é lido (uma resposta de até ANA_CACHE_TTL_SECONDS
+        # seria carimbada como nova), só atualizado com o resultado para as demais escritas
+        bucket = TokenBucket(self.settings.enrichment_sweep_rps, burst=self.settings.enrichment_sweep_concurrency)
+        self.station_information = station_information or StationInformation(
+            CachedAnaClient(
+                RateLimitedAnaClient(AnaApiClient(), bucket),
+                AnaInventoryCache(db["ana_inventario_cache"]),
+                refresh=True,
+            )
+        )
+
+    def run_once(self) -> Dict[str, int]:
+        """Uma rodada (até ENRICHMENT_SWEEP_MAX_PER_RUN estações). Retorna os contadores da rodada."""
+        batch_size = max(1, self.settings.enrichment_sweep_batch_size)
+        counters = {"scanned": 0, "refreshed": 0, "changed": 0, "failed": 0}
+        if not self._acquire_lease():
+            return counters
+        try:
+            # um único cursor: estações já carimbadas saem do intervalo do índice e não voltam na mesma rodada
+            cursor = (
+                self.collection.find(
+                    stale_enrichment_filter(self.settings.enrichment_sweep_max_age_seconds),
+                    {"_id": 0, **{f: 1 for f in STATION_FIELDS}},
+                )
+                .sort("enriched_at", ASCENDING)
+                .limit(self.settings.enrichment_sweep_max_per_run)
+                .batch_size(batch_size)
+            )
+            with cursor:
+                batch: List[StationModel] = []
+                for doc in cursor:
+                    batch.append(StationModel(**doc))
+                    if len(batch) >= batch_size:
+                        self._refresh(batch, counters)
+                        batch = []
+                        if not self._renew_lease():
+                            log.warning("Lease do reenriquecimento perdido; rodada interrompida.")
+                            break
+                else:
+                    if batch:
+                        self._refresh(batch, counters)
+        except mg_errors.PyMongoError as e:
+            log.warning("Erro Mongo no reenriquecimento periódico: %s", e)
+        finally:
+            self._release_lease()
+
+        if counters["scanned"]:
+            log.info("Reenriquecimento ANA: %s", counters)
+        return counters
+
+    def _acquire_lease(self) -> bool:
+        """True se esta rodada pode varrer: lease livre ou vencido. Mongo indisponível → pula a rodada."""
+        now = time.time()
+        try:
+            # com lease ativo o filtro não casa e o upsert colide no _id → outro processo está varrendo
+            self.leases.update_one(
+                {"_id": SWEEP_LEASE_ID, "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+                {"$set": {"lease_owner": self.owner, "lease_until": now + self.settings.enrichment_sweep_lease_seconds}},
+                upsert=True,
+            )
+            return True
+        except mg_errors.DuplicateKeyError:
+            return False
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao obter o lease do reenriquecimento: %s", e)
+            return False
+
+    def _renew_lease(self) -> bool:
+        try:
+            result = self.leases.update_one(
+                {"_id": SWEEP_LEASE_ID, "lease_owner": self.owner},
+                {"$set": {"lease_until": time.time() + self.settings.enrichment_sweep_lease_seconds}},
+            )
+            return result.matched_count == 1
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao renovar o lease do reenriquecimento: %s", e)
+            return False
+
+    def _release_lease(self) -> None:
+        try:
+            self.leases.update_one(
+                {"_id": SWEEP_LEASE_ID, "lease_owner": self.owner},
+                {"$set": {"lease_owner": None, "lease_until": None}},
+            )
+        except mg_errors.PyMongoError as e:
+            log.warning("Falha ao liberar o lease do reenriquecimento: %s", e)
+
+    def _refresh(self, stations: List[StationModel], counters: Dict[str, int]) -> None:
+        workers = max(1, min(self.settings.enrichment_sweep_concurrency, len(stations)))
+        # o enriquecimento altera a estação no lugar: guarda o gravado para comparar
+        stored = [st.model_dump() for st in stations]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ana-sweep") as pool:
+            results = list(pool.map(self._fetch, stations))
+
+        updates = [
+            (st.codigo_estacao, doc, fields)
+            for st, doc, fields in zip(stations, stored, results)
+            if fields is not None
+        ]
+        counters["changed"] += apply_enrichment(self.collection, self.revisions, updates)
+        counters["scanned"] += len(stations)
+        counters["refreshed"] += len(updates)
+        counters["failed"] += len(stations) - len(updates)
+
+    def _fetch(self, station: StationModel) -> Optional[Dict]:
+        try:
+            enriched = self.station_information.get_additional_information(station=station, force=True)
+        except Exception as ex:
+            ENRICHMENTS.inc(path="sweep", result="failed")
+            log.warning("Falha no reenriquecimento da estação %s: %s", station.codigo_estacao, ex)
+            return None
+        ENRICHMENTS.inc(path="sweep", result="ok")
+        return enrichment_fields(enriched)
@@ -0,0 +1,148 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from pymongo import errors as mg_errors
+from pymongo.synchronous.collection import Collection
+
+from domain.models.station_model import StationModel
+from domain.service.stations_info import StationInformation
+from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.gateway.ana_client.ana_api_client import AnaApiClient
+from infrastructure.gateway.ana_client.ana_inventory_cache import AnaInventoryCache
+from infrastructure.gateway.ana_client.cached_ana_client import CachedAnaClient
+from infrastructure.metrics.metrics import ENRICHMENTS
+from infrastructure.repository.catalog_revisions import CatalogRevisions
+from infrastructure.repository.enrichment_outbox import MongoEnrichmentOutbox
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.repository.station_queries import (
+    CATALOG_META_COLLECTION,
+    TOMBSTONES_COLLECTION,
+    changed_fields,
+    enrichment_update,
+    location_fields,
+    station_projection,
+)
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+
+class EnrichmentWorker:
+    """
+    Drena o outbox de enriquecimento: reserva um lote, consulta a API ANA (com o cache do inventário)
+    em paralelo (ANA_ENRICHMENT_CONCURRENCY) e aplica só os campos da ANA com $set em bulk.
+    Falhas voltam para o outbox com backoff. Roda no scheduler da aplicação (thread do executor);
+    vários processos podem rodar o worker ao mesmo tempo, o lease evita trabalho duplicado.
+    """
+
+    def __init__(
+        self,
+        outbox: Optional[MongoEnrichmentOutbox] = None,
+        collection: Optional[Collection] = None,
+        station_information: Optional[StationInformation] = None,
+    ) -> None:
+        self.settings = get_settings()
+        db = get_mongo_database()
+        self.outbox = outbox or MongoEnrichmentOutbox()
+        self.collection: Collection = collection if collection is not None else db["estacoes"]
+        # revisão/versão do catálogo (sync incremental e ETag): o enriquecimento também muda o conteúdo servido
+        database = self.collection.database
+        self.revisions = CatalogRevisions(database[CATALOG_META_COLLECTION], database[TOMBSTONES_COLLECTION])
+        self.station_information = station_information or StationInformation(
+            CachedAnaClient(AnaApiClient(), AnaInventoryCache(db["ana_inventario_cache"]))
+        )
+
+    def run_once(self) -> int:
+        """Processa lotes até esvaziar as entradas vencidas. Retorna quantas entradas foram concluídas."""
+        done = 0
+        while True:
+            try:
+                lease, codes = self.outbox.claim(self.settings.enrichment_worker_batch_size)
+                if not codes:
+                    return done
+                done += self._process(lease, codes)
+            except RepositoryError:
+                # já logado; as entradas reservadas voltam quando o lease vencer
+                return done
+
+    def _process(self, lease: str, codes: List[str]) -> int:
+        try:
+            docs = self.collection.find({"codigo_estacao": {"$in": codes}}, station_projection())
+            stored = {doc["codigo_estacao"]: doc for doc in docs}
+            stations = [StationModel(**doc) for doc in stored.values()]
+        except mg_errors.PyMongoError as e:
+            log.warning("Erro Mongo ao carregar estações do outbox: %s", e)
+            self.outbox.retry(lease, {code: str(e) for code in codes})
+            return 0
+
+        results = self._enrich_many(stations)
+        failures = {code: error for code, _, error in results if error is not None}
+        updates = [(code, stored[code], fields) for code, fields, error in results if error is None and fields]
+        try:
+            apply_enrichment(self.collection, self.revisions, updates)
+        except mg_errors.PyMongoError as e:
+            log.warning("Erro Mongo ao aplicar enriquecimento: %s", e)
+            self.outbox.retry(lease, {code: str(e) for code in codes})
+            return 0
+
+        # estações inexistentes (removidas depois da escrita) também saem do outbox
+        completed = [code for code in codes if code not in failures]
+        self.outbox.complete(lease, completed)
+        self.outbox.retry(lease, failures)
+        return len(completed)
+
+    def _enrich_many(self, stations: List[StationModel]) -> List[Tuple[str, Dict, Optional[str]]]:
+        workers = min(self.settings.ana_enrichment_concurrency, len(stations))
+        if workers <= 1:
+            return [self._enrich(st) for st in stations]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ana-outbox") as pool:
+            return list(pool.map(self._enrich, stations))
+
+    def _enrich(self, station: StationModel) -> Tuple[str, Dict, Optional[str]]:
+        """(codigo, campos da ANA a gravar, erro)."""
+        if not StationInformation.needs_enrichment(station):
+            return station.codigo_estacao, {}, None
+        try:
+            enriched = self.station_information.get_additional_information(station=station)
+        except Exception as ex:
+            ENRICHMENTS.inc(path="outbox", result="failed")
+            log.warning("Falha no enriquecimento da estação %s: %s", station.codigo_estacao, ex)
+            return station.codigo_estacao, {}, str(ex) or type(ex).__name__
+        ENRICHMENTS.inc(path="outbox", result="ok")
+        return station.codigo_estacao, enrichment_fields(enriched), None
+
+
+def apply_enrichment(
+    collection: Collection,
+    revisions: CatalogRevisions,
+    updates: Sequence[Tuple[str, Mapping, Dict]],
+) -> int:
+    """
+    Grava o resultado da ANA de cada (codigo, documento gravado, enrichment_fields) em um bulk.
+    Só estações com campos alterados avançam a revisão; se nenhuma mudou, nem a reserva é feita.
+    Retorna quantas estações mudaram.
+    """
+    changes = [(code, changed_fields(stored, fields), fields["enriched_at"]) for code, stored, fields in updates]
+    changed = sum(1 for _, diff, _ in changes if diff)
+    if changed:
+        with revisions.stamp() as revision:
+            collection.bulk_write(
+                [enrichment_update(code, diff, at, revision) for code, diff, at in changes], ordered=False
+            )
+    elif changes:
+        collection.bulk_write([enrichment_update(code, {}, at, None) for code, _, at in changes], ordered=False)
+    return changed
+
+
+def enrichment_fields(station: StationModel) -> Dict:
+    """$set aplicado após consultar a ANA: campos do inventário preenchidos + ponto GeoJSON + enriched_at."""
+    fields = {
+        f: getattr(station, f)
+        for f in StationInformation._FIELDS_TO_FILL
+        if getattr(station, f) is not None
+    }
+    fields.update(location_fields(station.latitude, station.longitude))
+    fields["enriched_at"] = datetime.now(timezone.utc)
+    return fields
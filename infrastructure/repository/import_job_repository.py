@@ -0,0 +1,133 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pymongo import errors as mg_errors
+from pymongo.synchronous.collection import Collection
+
+from domain.ports.import_job_port import ImportJobRepositoryPort
+from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ["queued", "running"]
+
+
+def stored_report(report: Dict[str, Any], sample_size: int) -> Dict[str, Any]:
+    """
+    Relatório gravado no job: contadores e resumo por bloco completos; de `ignored`/`errors` só as contagens
+    e as primeiras `sample_size` entradas, sem o conteúdo da linha (o documento tem limite de 16 MB no BSON).
+    """
+    stored = {k: v for k, v in report.items() if k not in ("ignored", "errors")}
+    for key in ("ignored", "errors"):
+        entries = report.get(key) or []
+        stored[f"{key}_count"] = len(entries)
+        stored[key] = [{k: v for k, v in e.items() if k != "content"} for e in entries[:sample_size]]
+    return stored
+
+
+class MongoImportJobRepository(ImportJobRepositoryPort):
+    """
+    Jobs de importação na coleção 'import_jobs'.
+    Documentos expiram (índice TTL em created_at) após IMPORT_JOB_RETENTION_SECONDS.
+    Jobs em andamento guardam o processo dono (owner) e o último sinal de vida (heartbeat_at).
+    O relatório final é resumido (stored_report): no máximo IMPORT_JOB_REPORT_SAMPLE_SIZE ignoradas/erros.
+    """
+
+    def __init__(self, collection: Optional[Collection] = None) -> None:
+        self.settings = get_settings()
+        self.collection: Collection = collection if collection is not None else get_mongo_database()["import_jobs"]
+
+    def ensure_indexes(self) -> None:
+        try:
+            self.collection.create_index(
+                "created_at",
+                expireAfterSeconds=self.settings.import_job_retention_seconds,
+                name="ttl_created_at",
+            )
+        except mg_errors.PyMongoError as e:
+            log.exception("Falha ao preparar a coleção de jobs de importação.")
+            raise RepositoryError(f"Falha ao preparar a coleção de jobs de importação: {e}") from e
+
+    def create(self, job_id: str, filename: str, upsert_existing: bool, owner: str) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        doc = {
+            "_id": job_id,
+            "job_id": job_id,
+            "filename": filename,
+            "upsert_existing": upsert_existing,
+            "status": "queued",
+            "progress": {"lines_processed": 0, "imported": 0, "ignored": 0, "errors": 0, "chunks": 0},
+            "created_at": now,
+            "owner": owner,
+            "heartbeat_at": now,
+        }
+        self._run("criar", job_id, lambda: self.collection.insert_one(doc))
+        doc.pop("_id")
+        return doc
+
+    def mark_running(self, job_id: str) -> None:
+        self._set(job_id, {"status": "running", "started_at": datetime.now(timezone.utc)})
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        self._set(job_id, {"progress": progress, "updated_at": datetime.now(timezone.utc)})
+
+    def finish(self, job_id: str, report: Dict[str, Any]) -> None:
+        report = stored_report(report, self.settings.import_job_report_sample_size)
+        self._set(job_id, {"status": "done", "report": report, "finished_at": datetime.now(timezone.utc)})
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._set(job_id, {"status": "failed", "error": error, "finished_at": datetime.now(timezone.utc)})
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._run("buscar", job_id, lambda: self.collection.find_one({"_id": job_id}, {"_id": 0}))
+
+    def heartbeat(self, owner: str) -> None:
+        self._run("renovar", owner, lambda: self.collection.update_many(
+            {"owner": owner, "status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"heartbeat_at": datetime.now(timezone.utc)}},
+        ))
+
+    def fail_stale(self, stale_seconds: float) -> List[str]:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+        # jobs gravados antes do heartbeat: vale o created_at
+        stale = {
+            "status": {"$in": ACTIVE_STATUSES},
+            "$or": [{"heartbeat_at": {"$lt": cutoff}}, {"heartbeat_at": None, "created_at": {"$lt": cutoff}}],
+        }
+
+        def op() -> List[str]:
+            failed = []
+            for doc in self.collection.find(stale, {"_id": 1}):
+                # mesmo filtro no update: um heartbeat concorrente mantém o job vivo
+                result = self.collection.update_one({**stale, "_id": doc["_id"]}, {"$set": {
+                    "status": "failed",
+                    "error": "job interrompido (processo da aplicação reiniciado ou encerrado)",
+                    "finished_at": datetime.now(timezone.utc),
+                }})
+                if result.modified_count:
+                    failed.append(doc["_id"])
+            return failed
+
+        return self._run("recuperar", "abandonados", op)
+
+    def active_ids(self, job_ids: Iterable[str]) -> Set[str]:
+        ids = list(job_ids)
+        if not ids:
+            return set()
+        return self._run("buscar", "em andamento", lambda: {
+            doc["_id"] for doc in self.collection.find({"_id": {"$in": ids}, "status": {"$in": ACTIVE_STATUSES}}, {"_id": 1})
+        })
+
+    def _set(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self._run("atualizar", job_id, lambda: self.collection.update_one({"_id": job_id}, {"$set": fields}))
+
+    @staticmethod
+    def _run(action: str, job_id: str, op):
+        try:
+            return op()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao %s job de importação %s.", action, job_id)
+            raise RepositoryError(f"Erro ao {action} job de importação {job_id}: {e}") from e
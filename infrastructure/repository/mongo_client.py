@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+from pymongo import MongoClient
+from pymongo.synchronous.database import Database
+
+from infrastructure.metrics.metrics import mongo_event_listeners
+from infrastructure.settings.settings import get_settings
+
+
+@lru_cache
+def get_mongo_client() -> MongoClient:
+    """MongoClient (driver síncrono) único do processo; o pool é compartilhado por repositórios e workers."""
+    settings = get_settings()
+    return MongoClient(
+        settings.mongo_uri,
+        serverSelectionTimeoutMS=5000,  # evita pendurar fio em ambientes ruins
+        connectTimeoutMS=5000,
+        socketTimeoutMS=10000,
+        maxPoolSize=settings.mongo_max_pool_size,
+        minPoolSize=settings.mongo_min_pool_size,
+        event_listeners=mongo_event_listeners(),
+    )
+
+
+def get_mongo_database() -> Database:
+    return get_mongo_client()[get_settings().mongo_db_name]
@@ -0,0 +1,127 @@
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from domain.models.station_model import StationModel
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+from infrastructure.repository.station_catalog_replica import StationCatalogReplica
+
+
+class ReplicatedStationRepository(AsyncStationRepositoryPort):
+    """
+    Decora o repositório da aplicação com a StationCatalogReplica (STATION_REPLICA_ENABLED=true).
+    Leituras por código, listagens e a versão do catálogo saem da memória enquanto a réplica estiver pronta;
+    escritas vão ao repositório e, em seguida, atualizam na réplica as estações tocadas
+    (o próprio worker lê o que escreveu sem esperar o evento de sincronização).
+    """
+
+    def __init__(self, repo: AsyncStationRepositoryPort, replica: StationCatalogReplica) -> None:
+        self.repo = repo
+        self.replica = replica
+
+    async def ensure_indexes(self) -> None:
+        await self.repo.ensure_indexes()
+
+    async def close(self) -> None:
+        await self.repo.close()
+
+    async def save(self, station: StationModel) -> bool:
+        saved = await self.repo.save(station)
+        await run_in_threadpool(self.replica.refresh_codes, [station.codigo_estacao])
+        return saved
+
+    async def save_many(self, stations: Iterable[StationModel]) -> Dict[str, int]:
+        stations = list(stations)
+        counts = await self.repo.save_many(stations)
+        if counts["inserted"] or counts["updated"]:
+            await run_in_threadpool(self.replica.refresh_codes, [st.codigo_estacao for st in stations])
+        return counts
+
+    async def list_all_stations(self, dados_estacao_manual: Optional[bool] = None) -> List[StationModel]:
+        if self.replica.ready:
+            return self.replica.list_models(dados_estacao_manual)
+        return await self.repo.list_all_stations(dados_estacao_manual)
+
+    async def list_stations_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        if self.replica.ready:
+            return self.replica.page(limit, after, fields, filters)
+        return await self.repo.list_stations_page(limit, after, fields, filters)
+
+    def iter_station_batches(
+        self,
+        batch_size: int,
+        dados_estacao_manual: Optional[bool] = None,
+    ) -> AsyncIterator[List[dict]]:
+        return self.repo.iter_station_batches(batch_size, dados_estacao_manual)
+
+    async def catalog_version(self) -> int:
+        # a versão que a réplica já reflete: o ETag nunca anuncia conteúdo que ela ainda não tem
+        if self.replica.ready:
+            return self.replica.version
+        return await self.repo.catalog_version()
+
+    async def catalog_stats(self) -> dict:
+        return await self.repo.catalog_stats()
+
+    async def existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        return await self.repo.existing_codes(codes)
+
+    async def find_station_by_code_station(self, code_station: str) -> Optional[StationModel]:
+        if self.replica.ready:
+            return self.replica.get(code_station)
+        return await self.repo.find_station_by_code_station(code_station)
+
+    async def find_stations_by_codes(self, codes: Iterable[str]) -> List[dict]:
+        if self.replica.ready:
+            return self.replica.find_many(codes)
+        return await self.repo.find_stations_by_codes(codes)
+
+    async def remove_station_by_code_station(self, code_station: str) -> int:
+        removed = await self.repo.remove_station_by_code_station(code_station)
+        await run_in_threadpool(self.replica.refresh_codes, [code_station])
+        return removed
+
+    async def remove_stations_by_codes(self, codes: Iterable[str]) -> Set[str]:
+        codes = list(codes)
+        removed = await self.repo.remove_stations_by_codes(codes)
+        await run_in_threadpool(self.replica.refresh_codes, codes)
+        return removed
+
+    async def catalog_revision(self) -> Tuple[int, int]:
+        return await self.repo.catalog_revision()
+
+    async def list_changes(
+        self,
+        since: int,
+        until: int,
+        limit: int,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+        # a réplica não guarda revisões nem remoções: a sincronização incremental vai sempre ao Mongo
+        return await self.repo.list_changes(since, until, limit, after)
+
+    async def find_stations_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float,
+        limit: int,
+    ) -> List[dict]:
+        return await self.repo.find_stations_near(latitude, longitude, max_distance_m, limit)
+
+    async def list_stations_in_bbox(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        return await self.repo.list_stations_in_bbox(min_lon, min_lat, max_lon, max_lat, limit, after)
@@ -0,0 +1,283 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pymongo import errors as mg_errors
+from pymongo.synchronous.database import Database
+
+from domain.models.station_model import StationModel
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.repository.station_queries import (
+    CATALOG_META_COLLECTION,
+    CATALOG_VERSION_FILTER,
+    STATION_FIELDS,
+    station_projection,
+)
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+STATIONS_COLLECTION = "estacoes"
+
+
+class _Snapshot:
+    """
+    Estado servido às leituras. A carga completa troca o snapshot inteiro; eventos alteram o atual
+    no lugar (sob o lock dos escritores). Leitores não usam lock: copiam a fatia de `codes` que percorrem
+    e toleram códigos que sumiram no meio do caminho.
+    """
+
+    __slots__ = ("docs", "models", "codes")
+
+    def __init__(self, docs: Dict[str, dict], models: Dict[str, StationModel]):
+        self.docs = docs
+        self.models = models
+        self.codes = sorted(docs)  # mesma ordem do índice uk_codigo_estacao (comparação binária)
+
+    def upsert(self, doc: dict) -> None:
+        code = doc["codigo_estacao"]
+        model = StationModel(**doc)
+        if code not in self.docs:
+            bisect.insort(self.codes, code)
+        self.docs[code] = doc
+        self.models[code] = model
+
+    def remove(self, code: str) -> None:
+        if self.docs.pop(code, None) is None:
+            return
+        self.models.pop(code, None)
+        idx = bisect.bisect_left(self.codes, code)
+        if idx < len(self.codes) and self.codes[idx] == code:
+            del self.codes[idx]
+
+
+class StationCatalogReplica:
+    """
+    Réplica em memória (por processo) da coleção 'estacoes', indexada por codigo_estacao.
+    - load(): carga completa no startup (documentos validados uma única vez em StationModel).
+    - Mantida em dia por change stream (database.watch em 'estacoes' e 'catalog_meta'); sem replica set
+      o change stream não existe e a réplica cai para polling da versão do catálogo
+      (STATION_REPLICA_POLL_SECONDS), recarregando tudo quando ela muda.
+    - version: versão do catálogo já refletida na réplica (base do ETag enquanto a réplica serve as leituras).
+    - status(): modo, tamanho e staleness (segundos desde a última confirmação de que está em dia).
+    Os objetos devolvidos são compartilhados: somente leitura.
+    """
+
+    def __init__(self, db: Optional[Database] = None) -> None:
+        self.settings = get_settings()
+        self.db: Database = db if db is not None else get_mongo_database()
+        self.collection = self.db[STATIONS_COLLECTION]
+        self.meta = self.db[CATALOG_META_COLLECTION]
+        self.version = 0
+        self.mode = "loading"
+        self.ready = False
+        self._snapshot = _Snapshot({}, {})
+        self._ids: Dict[Any, str] = {}  # _id → codigo_estacao (eventos de delete só trazem o _id)
+        self._synced_at = 0.0
+        self._lock = threading.Lock()  # serializa escritores (thread de sync e refresh pós-escrita)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------------------------
+    # Leituras (em memória)
+    # ---------------------------
+
+    def get(self, codigo: str) -> Optional[StationModel]:
+        return self._snapshot.models.get(codigo)
+
+    def list_models(self, dados_estacao_manual: Optional[bool] = None) -> List[StationModel]:
+        snap = self._snapshot
+        if dados_estacao_manual is None:
+            return [m for m in map(snap.models.get, snap.codes[:]) if m is not None]
+        # mesma semântica do filtro {"dado_manual": {"$eq": ...}} (campo ausente não casa)
+        return [
+            m for c in snap.codes[:]
+            if snap.docs.get(c, {}).get("dado_manual") == dados_estacao_manual
+            and (m := snap.models.get(c)) is not None
+        ]
+
+    def find_many(self, codes: Iterable[str]) -> List[dict]:
+        """Mesmo contrato de find_stations_by_codes (documentos sem _id, na ordem de codigo_estacao)."""
+        docs = self._snapshot.docs
+        return [doc for doc in map(docs.get, sorted(set(codes))) if doc is not None]
+
+    def page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Mesmo contrato de list_stations_page (keyset por codigo_estacao, projeção sem _id)."""
+        snap = self._snapshot
+        start = bisect.bisect_right(snap.codes, after) if after is not None else 0
+        keys = [k for k in station_projection(fields) if k != "_id"]
+        wanted = [(f, v) for f, v in (filters or {}).items() if v is not None]
+        docs: List[dict] = []
+        for code in snap.codes[start:]:
+            doc = snap.docs.get(code)
+            if doc is None:
+                continue
+            # mesma semântica de {"campo": {"$eq": v}} (campo ausente não casa)
+            if any(f not in doc or doc[f] != v or type(doc[f]) is not type(v) for f, v in wanted):
+                continue
+            docs.append({k: doc[k] for k in keys if k in doc})
+            if len(docs) > limit:  # +1 indica se existe próxima página
+                break
+        if len(docs) > limit:
+            docs = docs[:limit]
+            return docs, docs[-1]["codigo_estacao"]
+        return docs, None
+
+    def status(self) -> dict:
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "stations": len(self._snapshot.docs),
+            "version": self.version,
+            "staleness_seconds": round(time.time() - self._synced_at, 3) if self._synced_at else None,
+        }
+
+    # ---------------------------
+    # Sincronização
+    # ---------------------------
+
+    def load(self) -> None:
+        """Carga completa: versão primeiro, documentos depois (a réplica nunca fica atrás da versão que anuncia)."""
+        started = time.time()
+        version = self._read_version()
+        docs: Dict[str, dict] = {}
+        models: Dict[str, StationModel] = {}
+        ids: Dict[Any, str] = {}
+        projection = {**station_projection(), "_id": 1}
+        for doc in self.collection.find({}, projection):
+            ids[doc.pop("_id")] = doc["codigo_estacao"]
+            docs[doc["codigo_estacao"]] = doc
+            models[doc["codigo_estacao"]] = StationModel(**doc)
+        with self._lock:
+            self._snapshot = _Snapshot(docs, models)
+            self._ids = ids
+            self.version = version
+            self._synced_at = started
+            self.ready = True
+        log.info("Réplica do catálogo carregada: %d estações (versão %d).", len(docs), version)
+
+    def refresh_codes(self, codes: Sequence[str]) -> None:
+        """Relê do Mongo as estações informadas (leitura das próprias escritas antes do evento de sync)."""
+        codes = list(dict.fromkeys(codes))
+        if not codes or not self.ready:
+            return
+        try:
+            version = self._read_version()
+            if version > self.version + 1:
+                # houve outras escritas desde a última sincronização: aplicar só as nossas deixaria a versão
+                # (ETag) atrás do conteúdo servido, e um ETag antigo com dados novos geraria 304 indevido
+                self.load()
+                return
+            projection = {**station_projection(), "_id": 1}
+            cursor = self.collection.find({"codigo_estacao": {"$in": codes}}, projection)
+            found = {doc["codigo_estacao"]: doc for doc in cursor}
+        except mg_errors.PyMongoError as e:
+            # a escrita já foi feita; até a sincronização recarregar, as leituras vão ao Mongo
+            log.warning("Falha ao atualizar a réplica após escrita: %s", e)
+            self.ready = False
+            return
+        with self._lock:
+            # só a nossa escrita mudou o catálogo: a réplica já reflete a nova versão
+            if version == self.version + 1:
+                self.version = version
+            for code in codes:
+                doc = found.get(code)
+                if doc is None:
+                    self._snapshot.remove(code)
+                    continue
+                self._ids[doc.pop("_id")] = code
+                self._snapshot.upsert(doc)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="station-replica", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if not self.ready:
+                    self.load()
+                if self.mode != "polling":
+                    self._watch()
+                else:
+                    self._poll()
+            except mg_errors.OperationFailure as e:
+                log.warning("Erro na sincronização da réplica do catálogo: %s", e)
+                self._stop.wait(self.settings.station_replica_poll_seconds)
+            except Exception:
+                log.exception("Erro na sincronização da réplica do catálogo; recarregando.")
+                self.ready = False
+                self._stop.wait(self.settings.station_replica_poll_seconds)
+
+    def _watch(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": [STATIONS_COLLECTION, CATALOG_META_COLLECTION]}}}]
+        try:
+            stream = self.db.watch(pipeline, full_document="updateLookup", max_await_time_ms=1000)
+        except mg_errors.OperationFailure as e:
+            # ex.: MongoDB standalone (change streams exigem replica set)
+            log.warning("Change stream indisponível (%s); réplica em polling da versão do catálogo.", e)
+            self.mode = "polling"
+            return
+        with stream:
+            self.mode = "change_stream"
+            # eventos entre a carga e a abertura do stream se perderiam: recarrega com o stream aberto
+            self.load()
+            while not self._stop.is_set() and stream.alive:
+                if not self.ready:  # refresh_codes falhou: recarrega
+                    self.load()
+                change = stream.try_next()
+                if change is not None:
+                    self._apply(change)
+                    continue
+                self._synced_at = time.time()  # lote vazio: o servidor confirmou que não há mais eventos
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.settings.station_replica_poll_seconds):
+            started = time.time()
+            if not self.ready or self._read_version() != self.version:
+                self.load()
+            else:
+                self._synced_at = started
+
+    def _apply(self, change: dict) -> None:
+        op = change["operationType"]
+        coll = change.get("ns", {}).get("coll")
+        if op in ("invalidate", "drop", "dropDatabase", "rename"):
+            self.load()
+            return
+        if coll == CATALOG_META_COLLECTION:
+            doc = change.get("fullDocument") or {}
+            if doc.get("_id") == CATALOG_VERSION_FILTER["_id"]:
+                self.version = int(doc.get("version") or 0)
+            return
+
+        _id = change["documentKey"]["_id"]
+        with self._lock:
+            if op == "delete":
+                code = self._ids.pop(_id, None)
+                if code is not None:
+                    self._snapshot.remove(code)
+                return
+            full = change.get("fullDocument")
+            if full is None:  # removido antes do lookup; o delete vem em seguida
+                return
+            doc = {k: full[k] for k in STATION_FIELDS if k in full}
+            self._ids[_id] = doc["codigo_estacao"]
+            self._snapshot.upsert(doc)
+
+    def _read_version(self) -> int:
+        doc = self.meta.find_one(CATALOG_VERSION_FILTER)
+        return int(doc.get("version") or 0) if doc else 0
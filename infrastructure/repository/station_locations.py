@@ -0,0 +1,56 @@
+import logging
+from typing import List, Optional
+
+from pymongo import UpdateOne, errors as mg_errors
+from pymongo.synchronous.database import Database
+
+from infrastructure.repository.mongo_client import get_mongo_database
+from infrastructure.repository.station_queries import (
+    CATALOG_META_COLLECTION,
+    CATALOG_VERSION_FILTER,
+    LOCATION_FIELD,
+    location_fields,
+)
+
+log = logging.getLogger(__name__)
+
+BACKFILL_FLAG = "locations_backfilled"
+
+
+def backfill_station_locations(db: Optional[Database] = None, batch_size: int = 1000) -> int:
+    """
+    Grava o ponto GeoJSON (índice 2dsphere) nas estações gravadas antes dele existir.
+    Roda no startup até concluir uma vez (marca em 'catalog_meta'); a partir daí as escritas já gravam o ponto.
+    Não altera revisão/versão do catálogo: o ponto não faz parte do conteúdo servido.
+    Retorna quantas estações foram atualizadas. Falhas são logadas e a carga recomeça no próximo startup.
+    """
+    db = db if db is not None else get_mongo_database()
+    meta = db[CATALOG_META_COLLECTION]
+    collection = db["estacoes"]
+    try:
+        if meta.find_one({**CATALOG_VERSION_FILTER, BACKFILL_FLAG: True}, {"_id": 1}) is not None:
+            return 0
+
+        updated = 0
+        ops: List[UpdateOne] = []
+        cursor = collection.find(
+            {LOCATION_FIELD: None, "latitude": {"$ne": None}, "longitude": {"$ne": None}},
+            {"_id": 1, "latitude": 1, "longitude": 1},
+        ).batch_size(batch_size)
+        with cursor:
+            for doc in cursor:
+                if fields := location_fields(doc["latitude"], doc["longitude"]):
+                    # sem sobrescrever o ponto gravado por uma escrita concorrente
+                    ops.append(UpdateOne({"_id": doc["_id"], LOCATION_FIELD: None}, {"$set": fields}))
+                if len(ops) >= batch_size:
+                    updated += collection.bulk_write(ops, ordered=False).modified_count
+                    ops = []
+        if ops:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+
+        meta.update_one(CATALOG_VERSION_FILTER, {"$set": {BACKFILL_FLAG: True}}, upsert=True)
+        log.info("Pontos GeoJSON gravados em %d estações existentes.", updated)
+        return updated
+    except mg_errors.PyMongoError as e:
+        log.warning("Falha ao gravar os pontos GeoJSON das estações existentes: %s", e)
+        return 0
@@ -0,0 +1,447 @@
+"""
+Montagem de filtros/projeções e planejamento das escritas (operações, contagens, páginas) compartilhados
+pelos adapters Mongo (síncrono e assíncrono): nos adapters ficam só as chamadas ao driver.
+"""
+import hashlib
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from pymongo import ASCENDING, GEOSPHERE, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from domain.models.station_model import StationModel
+from domain.service.stations_info import StationInformation
+
+STATION_FIELDS: tuple[str, ...] = tuple(StationModel.model_fields)
+
+# Versão (ETag) e revisão (sincronização incremental) do catálogo, na coleção 'catalog_meta':
+# avançam a cada escrita em 'estacoes' (ver catalog_revisions)
+CATALOG_META_COLLECTION = "catalog_meta"
+CATALOG_VERSION_FILTER = {"_id": "estacoes"}
+
+# Remoções registradas para a sincronização incremental (GET /stations/changes)
+TOMBSTONES_COLLECTION = "estacoes_tombstones"
+
+# Ponto GeoJSON (longitude, latitude) derivado de latitude/longitude (strings da ANA), no índice 2dsphere
+LOCATION_FIELD = "location"
+# lados do bbox ficam sobre paralelos; no 2dsphere as arestas são geodésicas, então os lados são
+# adensados com vértices a cada BBOX_EDGE_STEP graus (desvio desprezível na escala de estações)
+BBOX_EDGE_STEP = 0.5
+
+# Hash do conteúdo de negócio recebido na última escrita (save/save_many): lotes com o mesmo conteúdo
+# não reescrevem o documento nem avançam a revisão (ver station_update)
+CONTENT_HASH_FIELD = "content_hash"
+
+# Filtros de igualdade de GET /stations: cada campo tem índice composto (campo, codigo_estacao),
+# que atende o filtro e a ordem do keyset sem varrer a coleção nem ordenar em memória
+STATION_FILTER_FIELDS: tuple[str, ...] = ("dado_manual", "bacia", "sensor", "data_forecast", "conversor")
+STATION_FILTER_INDEXES = [
+    ([(f, ASCENDING), ("codigo_estacao", ASCENDING)], f"ix_{f}_codigo") for f in STATION_FILTER_FIELDS
+]
+
+# Keyset da sincronização incremental (GET /stations/changes) nas estações e nos tombstones
+CHANGES_INDEX = [("revision", ASCENDING), ("codigo_estacao", ASCENDING)]
+
+# Índices criados por ensure_indexes (adapters síncrono e assíncrono): (chaves, opções de create_index)
+STATION_INDEXES: List[Tuple[Any, dict]] = [
+    ("codigo_estacao", {"unique": True, "name": "uk_codigo_estacao"}),
+    # varredura do EnrichmentSweeper (estações sem consulta ou com consulta antiga à ANA)
+    ("enriched_at", {"name": "ix_enriched_at"}),
+    (CHANGES_INDEX, {"name": "ix_revision_codigo"}),
+    # filtros de GET /stations (igualdade + keyset por codigo_estacao)
+    *[(keys, {"name": name}) for keys, name in STATION_FILTER_INDEXES],
+    # buscas por proximidade e bbox (ponto GeoJSON gravado junto com latitude/longitude)
+    ([(LOCATION_FIELD, GEOSPHERE)], {"name": "ix_location"}),
+]
+TOMBSTONE_INDEXES: List[Tuple[Any, dict]] = [
+    ("codigo_estacao", {"unique": True, "name": "uk_codigo_estacao"}),
+    (CHANGES_INDEX, {"name": "ix_revision_codigo"}),
+]
+
+
+def manual_filter(dados_estacao_manual: Optional[bool]) -> dict:
+    """Filtro por dado_manual; None → sem filtro (todas as estações)."""
+    if dados_estacao_manual is None:
+        return {}
+    return {"dado_manual": {"$eq": dados_estacao_manual}}
+
+
+def station_projection(fields: Optional[Sequence[str]] = None) -> dict:
+    """
+    Projeção dos campos de StationModel, sem o _id do Mongo.
+    codigo_estacao é sempre incluído (chave do cursor de paginação).
+    """
+    selected = fields or STATION_FIELDS
+    projection = {"_id": 0, "codigo_estacao": 1}
+    projection.update({f: 1 for f in selected})
+    return projection
+
+
+def station_filter(filters: Optional[Mapping[str, Any]]) -> dict:
+    """Filtro de igualdade ($eq) pelos campos de STATION_FILTER_FIELDS; valores None são ignorados."""
+    return {f: {"$eq": v} for f, v in (filters or {}).items() if v is not None}
+
+
+def page_filter(after: Optional[str], filters: Optional[Mapping[str, Any]]) -> dict:
+    """Filtro keyset: estações com codigo_estacao > after (ordem crescente do índice único)."""
+    filtro = station_filter(filters)
+    if after is not None:
+        filtro["codigo_estacao"] = {"$gt": after}
+    return filtro
+
+
+def codes_filter(codes: Iterable[str]) -> dict:
+    """$in por codigo_estacao (índice único), sem códigos repetidos."""
+    return {"codigo_estacao": {"$in": list(set(codes))}}
+
+
+def page_result(docs: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    Página keyset a partir de até limit + 1 documentos lidos (o excedente indica a próxima página).
+    Retorna (documentos, cursor) — cursor é o último codigo_estacao se houver próxima página.
+    """
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, docs[-1]["codigo_estacao"]
+    return docs, None
+
+
+def revision_fields(revision: int) -> dict:
+    """Carimbo de toda escrita em 'estacoes': revisão do catálogo (sincronização incremental) + updated_at."""
+    return {"revision": revision, "updated_at": datetime.now(timezone.utc)}
+
+
+def station_location(latitude: Any, longitude: Any) -> Optional[dict]:
+    """Ponto GeoJSON a partir das coordenadas gravadas como texto; None se ausentes ou inválidas."""
+    try:
+        lat = float(str(latitude).strip().replace(",", "."))
+        lon = float(str(longitude).strip().replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):  # também descarta NaN
+        return None
+    return {"type": "Point", "coordinates": [lon, lat]}
+
+
+def location_fields(latitude: Any, longitude: Any) -> dict:
+    """$set do ponto GeoJSON (vazio quando não há coordenadas válidas: o ponto anterior é mantido)."""
+    point = station_location(latitude, longitude)
+    return {LOCATION_FIELD: point} if point is not None else {}
+
+
+def content_hash(station: StationModel) -> str:
+    """
+    Hash estável (sha256 do JSON canônico) dos campos de negócio informados, sem os ausentes (None).
+    Calculado sobre a estação recebida, antes do enriquecimento pela ANA: reenviar o mesmo conteúdo gera o mesmo hash.
+    """
+    payload = json.dumps(station.model_dump(mode="json", exclude_none=True), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def stored_projection() -> dict:
+    """Projeção do documento gravado usada na comparação das escritas em lote (campos de negócio + hash)."""
+    return {**station_projection(), CONTENT_HASH_FIELD: 1}
+
+
+def station_update(
+    station: StationModel,
+    stored: Optional[Mapping[str, Any]],
+    digest: str,
+    revision: int,
+    replace: bool = False,
+    checked_ana: bool = False,
+) -> Tuple[UpdateOne, bool]:
+    """
+    Upsert por codigo_estacao que leva o documento gravado (`stored`; None se a estação é nova) ao conteúdo da estação:
+    $set só dos campos com valor diferente (e do ponto GeoJSON, se as coordenadas mudaram) e do content_hash.
+    Campos ausentes (None) não são tocados; com `replace` (modo inline, estação já enriquecida) os campos de negócio
+    gravados e ausentes na estação são removidos, como no ReplaceOne.
+    Sem mudança de conteúdo a revisão não avança: a estação não aparece na sincronização incremental.
+    Retorna (operação, houve mudança de conteúdo).
+    """
+    fields = station.model_dump(exclude_none=True)
+    stored = stored or {}
+    changes = changed_fields(stored, fields)
+    removed = [f for f in STATION_FIELDS if replace and f in stored and f not in fields]
+    if "latitude" in removed or "longitude" in removed:
+        removed.append(LOCATION_FIELD)
+
+    update: Dict[str, Any] = {"$set": {**changes, CONTENT_HASH_FIELD: digest}}
+    if changes or removed:
+        update["$set"].update(revision_fields(revision))
+    if removed:
+        update["$unset"] = {f: "" for f in removed}
+    if checked_ana:
+        update["$set"]["enriched_at"] = datetime.now(timezone.utc)
+    changed = bool(changes or removed)
+    # sem mudança de conteúdo o documento já existe: não recria uma estação removida nesse meio tempo
+    return UpdateOne({"codigo_estacao": station.codigo_estacao}, update, upsert=changed), changed
+
+
+def station_updates(
+    stations: Sequence[Tuple[StationModel, str]],
+    stored: Mapping[str, Mapping[str, Any]],
+    revision: int,
+    replace: bool = False,
+    checked_ana: Iterable[str] = (),
+) -> Tuple[List[UpdateOne], int]:
+    """station_update de cada (estação, content_hash). Retorna (operações, quantas só atualizam o hash)."""
+    checked_ana = set(checked_ana)
+    ops: List[UpdateOne] = []
+    refreshed = 0
+    for station, digest in stations:
+        code = station.codigo_estacao
+        op, changed = station_update(station, stored.get(code), digest, revision, replace, code in checked_ana)
+        ops.append(op)
+        refreshed += not changed
+    return ops, refreshed
+
+
+def write_counts(upserted: int, matched: int, refreshed: int, unchanged: int) -> Dict[str, int]:
+    """
+    Contagens de save_many: inseridas, atualizadas e inalteradas.
+    refreshed são as estações que casaram mas só tiveram o content_hash gravado (conteúdo igual ao do banco).
+    """
+    return {
+        "inserted": upserted,
+        "updated": max(0, matched - refreshed),
+        "unchanged": unchanged + refreshed,
+    }
+
+
+def changed_stations(
+    stations: Iterable[StationModel],
+    stored: Mapping[str, Mapping[str, Any]],
+) -> List[Tuple[StationModel, str]]:
+    """
+    (estação, content_hash) das estações cujo hash difere do documento gravado, na ordem de entrada.
+    As demais ficam de fora da escrita (sem revisão nem consulta à ANA).
+    """
+    pairs = ((station, content_hash(station)) for station in stations)
+    return [
+        (station, digest)
+        for station, digest in pairs
+        if stored.get(station.codigo_estacao, {}).get(CONTENT_HASH_FIELD) != digest
+    ]
+
+
+def enrichment_candidates(stations: Iterable[StationModel]) -> Set[str]:
+    """Códigos das estações incompletas (antes do enriquecimento): consultadas na ANA no modo inline, outbox no outro."""
+    return {station.codigo_estacao for station in stations if StationInformation.needs_enrichment(station)}
+
+
+def bulk_write_counts(result: Any, refreshed: int, unchanged: int) -> Dict[str, int]:
+    """write_counts a partir do BulkWriteResult de save_many."""
+    return write_counts(result.upserted_count, result.matched_count, refreshed, unchanged)
+
+
+def bulk_error_counts(error: BulkWriteError, unchanged: int) -> Dict[str, int]:
+    """Efeito parcial de um bulk_write de save_many que falhou (details do BulkWriteError)."""
+    details = error.details or {}
+    return {
+        "inserted": int(details.get("nUpserted", 0)),
+        "updated": int(details.get("nMatched", 0)),
+        "unchanged": unchanged,
+    }
+
+
+def removed_codes(matched: Mapping[Any, str], deleted_count: int, remaining: Iterable[str] = ()) -> Set[str]:
+    """
+    Códigos removidos por um delete_many sobre os _id de `matched` (_id → codigo_estacao lidos antes).
+    Quando deleted_count não bate (remoção ou reinserção concorrente), `remaining` são os códigos
+    que continuam no banco e saem do resultado.
+    """
+    removed = set(matched.values())
+    if deleted_count != len(matched):
+        removed -= set(remaining)
+    return removed
+
+
+def changed_fields(stored: Mapping[str, Any], fields: Mapping[str, Any]) -> dict:
+    """
+    Campos de negócio (STATION_FIELDS) de `fields` com valor diferente do documento gravado,
+    mais o ponto GeoJSON quando as coordenadas mudam. Os demais campos de `fields` são ignorados.
+    """
+    changes = {f: v for f, v in fields.items() if f in STATION_FIELDS and not _same_value(stored.get(f), v)}
+    if "latitude" in changes or "longitude" in changes:
+        changes.update(location_fields(fields.get("latitude"), fields.get("longitude")))
+    return changes
+
+
+def enrichment_update(code: str, changes: Mapping[str, Any], enriched_at: datetime, revision: Optional[int]) -> UpdateOne:
+    """
+    $set do resultado da ANA (worker do outbox e sweeper): campos alterados (changed_fields) com a revisão do catálogo;
+    sem mudança, só enriched_at — a estação não entra em /stations/changes nem muda a versão (ETag).
+    Sem upsert: estação removida não volta.
+    """
+    fields: Dict[str, Any] = {**changes, "enriched_at": enriched_at}
+    if changes:
+        fields.update(revision_fields(revision))
+    return UpdateOne({"codigo_estacao": code}, {"$set": fields})
+
+
+def _same_value(stored: Any, value: Any) -> bool:
+    # o Mongo devolve datas ingênuas (UTC) com precisão de milissegundos
+    if isinstance(stored, datetime) and isinstance(value, datetime):
+        def ms(d: datetime) -> datetime:
+            d = d.replace(tzinfo=timezone.utc) if d.tzinfo is None else d.astimezone(timezone.utc)
+            return d.replace(microsecond=d.microsecond // 1000 * 1000)
+        return ms(stored) == ms(value)
+    return type(stored) is type(value) and stored == value
+
+
+def station_document(station: StationModel, checked_ana: bool, revision: int, digest: str) -> dict:
+    """
+    Documento completo da estação (ReplaceOne do save no modo inline).
+    checked_ana → a API ANA acabou de ser consultada: carimba enriched_at (usado pelo sweeper).
+    digest é o content_hash da estação recebida (antes do enriquecimento).
+    """
+    doc = {
+        **station.model_dump(exclude_none=True),
+        **location_fields(station.latitude, station.longitude),
+        **revision_fields(revision),
+        CONTENT_HASH_FIELD: digest,
+    }
+    if checked_ana:
+        doc["enriched_at"] = datetime.now(timezone.utc)
+    return doc
+
+
+# Contagens do catálogo (GET /stations/stats): uma passada pela coleção, um $facet por dimensão
+STATS_PIPELINE: List[dict] = [
+    {"$facet": {
+        "total": [{"$count": "n"}],
+        "por_bacia": [{"$group": {"_id": "$bacia", "n": {"$sum": 1}}}],
+        "por_sensor": [{"$group": {"_id": "$sensor", "n": {"$sum": 1}}}],
+        "dado_manual": [{"$group": {"_id": "$dado_manual", "n": {"$sum": 1}}}],
+        "data_forecast": [{"$group": {"_id": "$data_forecast", "n": {"$sum": 1}}}],
+    }},
+]
+
+
+def stats_document(facets: Mapping[str, Any]) -> dict:
+    """Resultado do STATS_PIPELINE no formato da resposta (campo ausente conta como o default do modelo: false)."""
+    def counts(name: str) -> dict:
+        return {row["_id"]: row["n"] for row in facets.get(name) or []}
+
+    total = (facets.get("total") or [{"n": 0}])[0]["n"]
+    manual = counts("dado_manual").get(True, 0)
+    forecast = counts("data_forecast").get(True, 0)
+    return {
+        "total": total,
+        "por_bacia": dict(sorted(counts("por_bacia").items(), key=lambda kv: str(kv[0]))),
+        "por_sensor": dict(sorted(counts("por_sensor").items(), key=lambda kv: str(kv[0]))),
+        "dado_manual": {"manual": manual, "automatica": total - manual},
+        "data_forecast": {"com_previsao": forecast, "sem_previsao": total - forecast},
+    }
+
+
+class VersionedCache:
+    """
+    Último valor calculado e a versão do catálogo em que foi calculado (cache de catalog_stats).
+    Não sincroniza: cada adapter usa o seu lock (threading ou asyncio) em volta do recálculo.
+    """
+
+    def __init__(self) -> None:
+        self._entry: Optional[Tuple[int, Any]] = None
+
+    def get(self, version: int) -> Optional[Any]:
+        """Valor calculado nesta versão; None se ainda não calculado ou se o catálogo mudou."""
+        if self._entry is not None and self._entry[0] == version:
+            return self._entry[1]
+        return None
+
+    def put(self, version: int, value: Any) -> Any:
+        self._entry = (version, value)
+        return value
+
+
+def stale_enrichment_filter(max_age_seconds: float) -> dict:
+    """Estações nunca consultadas na ANA (enriched_at ausente) ou consultadas há mais de max_age_seconds."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+    return {"$or": [{"enriched_at": None}, {"enriched_at": {"$lt": cutoff}}]}
+
+
+def tombstone_upserts(codes: Iterable[str], revision: int) -> List[UpdateOne]:
+    """Registro da remoção (um por codigo_estacao; remoções repetidas só avançam a revisão)."""
+    deleted_at = datetime.now(timezone.utc)
+    return [
+        UpdateOne({"codigo_estacao": code}, {"$set": {"revision": revision, "deleted_at": deleted_at}}, upsert=True)
+        for code in codes
+    ]
+
+
+def changes_filter(since: int, until: int, after: Optional[Tuple[int, str]]) -> dict:
+    """
+    Keyset por (revision, codigo_estacao) no intervalo (since, until] — índice ix_revision_codigo.
+    after é a chave do último item da página anterior.
+    """
+    if after is None:
+        return {"revision": {"$gt": since, "$lte": until}}
+    revision, code = after
+    return {
+        "revision": {"$gte": revision, "$lte": until},
+        "$or": [{"revision": {"$gt": revision}}, {"codigo_estacao": {"$gt": code}}],
+    }
+
+
+def filter_plan_checks() -> Iterator[Tuple[str, dict]]:
+    """Consultas de GET /stations a verificar com explain: cada filtro sozinho e todos combinados."""
+    samples = {"dado_manual": True, "bacia": "", "sensor": "", "data_forecast": True, "conversor": 0}
+    for f in STATION_FILTER_FIELDS:
+        yield f, page_filter(None, {f: samples[f]})
+    yield "+".join(STATION_FILTER_FIELDS), page_filter("", samples)
+
+
+def plan_stages(plan: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    """Estágios de um plano do explain (queryPlanner.winningPlan), do topo às folhas."""
+    yield plan
+    for child in ([plan["inputStage"]] if "inputStage" in plan else []) + list(plan.get("inputStages", [])):
+        yield from plan_stages(child)
+
+
+def collection_scans(explain: Mapping[str, Any]) -> List[str]:
+    """Estágios que varrem a coleção (COLLSCAN) no plano vencedor; vazio quando a consulta usa índice."""
+    planner = explain.get("queryPlanner", {})
+    plan = planner.get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)  # motor de execução SBE (MongoDB 7+) aninha o plano
+    return [stage["stage"] for stage in plan_stages(plan) if stage.get("stage") == "COLLSCAN"]
+
+
+def near_pipeline(latitude: float, longitude: float, max_distance_m: float, limit: int) -> List[dict]:
+    """
+    Estações até max_distance_m do ponto, da mais próxima para a mais distante ($geoNear no índice 2dsphere),
+    projetadas (sem _id) e com a distância em metros em distancia_m.
+    """
+    return [
+        {"$geoNear": {
+            "near": {"type": "Point", "coordinates": [longitude, latitude]},
+            "key": LOCATION_FIELD,
+            "distanceField": "distancia_m",
+            "maxDistance": max_distance_m,
+            "spherical": True,
+        }},
+        {"$limit": limit},
+        {"$project": {**station_projection(), "distancia_m": 1}},
+    ]
+
+
+def bbox_filter(min_lon: float, min_lat: float, max_lon: float, max_lat: float, after: Optional[str]) -> dict:
+    """Estações dentro do retângulo (graus; lados adensados, ver BBOX_EDGE_STEP), keyset por codigo_estacao."""
+    def steps(start: float, end: float) -> List[float]:
+        n = max(1, math.ceil(abs(end - start) / BBOX_EDGE_STEP))
+        return [start + (end - start) * i / n for i in range(n)]
+
+    ring = (
+        [[lon, min_lat] for lon in steps(min_lon, max_lon)]
+        + [[max_lon, lat] for lat in steps(min_lat, max_lat)]
+        + [[lon, max_lat] for lon in steps(max_lon, min_lon)]
+        + [[min_lon, lat] for lat in steps(max_lat, min_lat)]
+    )
+    ring.append(ring[0])
+    filtro = {LOCATION_FIELD: {"$geoWithin": {"$geometry": {"type": "Polygon", "coordinates": [ring]}}}}
+    if after is not None:
+        filtro["codigo_estacao"] = {"$gt": after}
+    return filtro
\ No newline at end of file
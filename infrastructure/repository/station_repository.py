@@ -1,13 +1,60 @@
 import logging
-from typing import Iterable, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
-from pymongo import MongoClient, ReplaceOne, errors as mg_errors
+from pymongo import ASCENDING, errors as mg_errors
 from pymongo.synchronous.collection import Collection
 
 from domain.models.station_model import StationModel
 from domain.ports.station_repository_port import StationRepositoryPort
 from domain.service.stations_info import StationInformation
 from infrastructure.exceptions.repository_error import RepositoryError
+from infrastructure.gateway.ana_client.ana_api_client import AnaApiClient
+from infrastructure.gateway.ana_client.ana_inventory_cache import AnaInventoryCache
+from infrastructure.gateway.ana_client.cached_ana_client import CachedAnaClient
+from infrastructure.metrics.metrics import ENRICHMENTS
+from infrastructure.repository.catalog_revisions import (
+    CHANGES_PROJECTION,
+    TOMBSTONE_PROJECTION,
+    CatalogRevisions,
+    merge_changes,
+)
+from infrastructure.repository.enrichment_outbox import OUTBOX_COLLECTION, outbox_upserts
+from infrastructure.repository.mongo_client import get_mongo_client
+from infrastructure.repository.station_queries import (
+    CATALOG_META_COLLECTION,
+    CATALOG_VERSION_FILTER,
+    CHANGES_INDEX,
+    STATION_INDEXES,
+    STATS_PIPELINE,
+    TOMBSTONE_INDEXES,
+    TOMBSTONES_COLLECTION,
+    VersionedCache,
+    bbox_filter,
+    bulk_error_counts,
+    bulk_write_counts,
+    changed_stations,
+    changes_filter,
+    codes_filter,
+    collection_scans,
+    content_hash,
+    enrichment_candidates,
+    filter_plan_checks,
+    manual_filter,
+    near_pipeline,
+    page_filter,
+    page_result,
+    removed_codes,
+    station_document,
+    revision_fields,
+    station_projection,
+    station_updates,
+    stats_document,
+    stored_projection,
+    tombstone_upserts,
+    write_counts,
+)
 from infrastructure.settings.settings import get_settings
 
 log = logging.getLogger(__name__)
@@ -15,36 +62,89 @@ log = logging.getLogger(__name__)
 class MongoStationRepository(StationRepositoryPort):
     """
     Implementação MongoDB do StationRepositoryPort, com tratamento de erros.
-    - Enriquecimento de estação via StationInformation (falha não bloqueia persistência).
-    - Criação de índice (unique) em 'codigo_estacao'.
+    - ENRICHMENT_MODE=inline (padrão): enriquece via StationInformation antes de gravar; outbox (opt-in):
+      grava sem esperar a API ANA e registra a pendência em 'enrichment_outbox' (drenado pelo EnrichmentWorker).
+    - Cache do inventário ANA (memória + coleção 'ana_inventario_cache').
+    - Criação de índice (unique) em 'codigo_estacao' (ensure_indexes, chamado no startup).
+    - Uma instância por processo: usa o MongoClient compartilhado (get_mongo_client), que mantém o pool
+      e é fechado uma única vez por quem encerra o processo (lifespan da aplicação, ferramentas).
     """
 
     def __init__(self) -> None:
         self.settings = get_settings()
         try:
-            self.client = MongoClient(
-                self.settings.mongo_uri,
-                serverSelectionTimeoutMS=5000,  # evita pendurar fio em ambientes ruins
-                connectTimeoutMS=5000,
-                socketTimeoutMS=10000,
-            )
+            self.client = get_mongo_client()
             # Força um ping inicial para falhas rápidas de conexão
             self.client.admin.command("ping")
         except mg_errors.PyMongoError as e:
             log.exception("Falha ao conectar ao MongoDB.")
             raise RepositoryError(f"Falha ao conectar ao MongoDB: {e}") from e
 
+        self.db = self.client[self.settings.mongo_db_name]
+        self.collection: Collection = self.db["estacoes"]
+        self.outbox: Collection = self.db[OUTBOX_COLLECTION]
+        self.meta: Collection = self.db[CATALOG_META_COLLECTION]
+        self.tombstones: Collection = self.db[TOMBSTONES_COLLECTION]
+        # contagens de GET /stations/stats: (versão do catálogo, resultado); uma agregação por versão
+        self._stats = VersionedCache()
+        self._stats_lock = threading.Lock()
+        self.revisions = CatalogRevisions(self.meta, self.tombstones)
+
+        # Serviço de enriquecimento (não levanta exceção para não acoplar repositório a rede)
+        # com cache do inventário ANA (memória + coleção compartilhada entre workers)
+        self.ana_cache = AnaInventoryCache(self.db["ana_inventario_cache"])
+        self.ana_client = AnaApiClient()
+        self.station_information = StationInformation(CachedAnaClient(self.ana_client, self.ana_cache))
+
+    def ensure_indexes(self) -> None:
+        """
+        Cria os índices da coleção. Idempotente; deve rodar uma vez no startup.
+        Em falha, lança RepositoryError.
+        """
         try:
-            self.db = self.client[self.settings.mongo_db_name]
-            self.collection: Collection = self.db["estacoes"]
-            # Garante índice único por codigo_estacao
-            self.collection.create_index("codigo_estacao", unique=True, name="uk_codigo_estacao")
+            for keys, options in STATION_INDEXES:
+                self.collection.create_index(keys, **options)
+            for keys, options in TOMBSTONE_INDEXES:
+                self.tombstones.create_index(keys, **options)
+            self.ana_cache.ensure_indexes()
+            # estações gravadas antes das revisões entram todas numa mesma revisão
+            if self.collection.find_one({"revision": None}, {"_id": 1}) is not None:
+                with self.revisions.stamp() as revision:
+                    self.collection.update_many({"revision": None}, {"$set": revision_fields(revision)})
         except mg_errors.PyMongoError as e:
             log.exception("Falha ao preparar a coleção/índices.")
             raise RepositoryError(f"Falha ao preparar a coleção/índices: {e}") from e
 
-        # Serviço de enriquecimento (não levanta exceção para não acoplar repositório a rede)
-        self.station_information = StationInformation()
+        try:
+            scans = self.filter_collection_scans()
+        except RepositoryError:
+            return  # já logado; a verificação não impede o startup
+        if scans:
+            log.error("Filtros de GET /stations sem índice (COLLSCAN): %s", ", ".join(scans))
+
+    def filter_collection_scans(self) -> Dict[str, List[str]]:
+        """
+        Explain de cada filtro suportado em GET /stations (sozinhos e combinados), no formato da listagem
+        (ordem por codigo_estacao). Retorna os filtros cujo plano vencedor varre a coleção.
+        Em falha, lança RepositoryError.
+        """
+        scans: Dict[str, List[str]] = {}
+        try:
+            for name, filtro in filter_plan_checks():
+                cursor = self.collection.find(filtro, station_projection()).sort("codigo_estacao", ASCENDING).limit(1)
+                if stages := collection_scans(cursor.explain()):
+                    scans[name] = stages
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao verificar os planos dos filtros.")
+            raise RepositoryError(f"Erro ao verificar os planos dos filtros: {e}") from e
+        return scans
+
+    def close(self) -> None:
+        """
+        Libera o que o repositório criou (sessão HTTP da ANA) no shutdown da aplicação.
+        O MongoClient é compartilhado com outros componentes (token ANA, outbox, réplica, jobs): não é fechado aqui.
+        """
+        self.ana_client.session.close()
 
     # ---------------------------
     # Operações de escrita
@@ -57,20 +157,20 @@ class MongoStationRepository(StationRepositoryPort):
         Lança RepositoryError para erros de Mongo.
         """
         try:
-            # Tenta enriquecer, mas não bloqueia persistência se falhar
-            try:
-                station = self.station_information.get_additional_information(station=station)
-            except Exception:
-                log.warning("Falha no enriquecimento da estação %s. Seguindo com persistência.",
-                            getattr(station, "codigo_estacao", "?"), exc_info=True)
-                raise RepositoryError(f"Falha ao buscar dados adicionais da estação {station.ponto} - {station.codigo_estacao}, na API ANA")
-
-            payload = station.model_dump(exclude_none=True)
-            res = self.collection.replace_one(
-                {"codigo_estacao": station.codigo_estacao},
-                payload,
-                upsert=True,
-            )
+            digest = content_hash(station)
+            if self.settings.enrichment_mode == "outbox":
+                self._write_first([(station, digest)], self._stored_documents([station.codigo_estacao]))
+                return True
+
+            checked_ana = StationInformation.needs_enrichment(station)
+            station = self._enrich(station)
+
+            with self.revisions.stamp() as revision:
+                self.collection.replace_one(
+                    {"codigo_estacao": station.codigo_estacao},
+                    station_document(station, checked_ana, revision, digest),
+                    upsert=True,
+                )
             # acknowledged sempre True com drivers modernos; consideramos sucesso se não lançou exceção
             return True
         except mg_errors.DuplicateKeyError as e:
@@ -81,38 +181,37 @@ class MongoStationRepository(StationRepositoryPort):
             log.exception("Erro Mongo ao salvar estação %s.", station.codigo_estacao)
             raise RepositoryError(f"Erro ao salvar estação {station.codigo_estacao}: {e}") from e
 
-    def save_many(self, stations: Iterable[StationModel]) -> int:
+    def save_many(self, stations: Iterable[StationModel]) -> Dict[str, int]:
         """
-        Upsert em lote (bulk_write, ordered=False).
-        Retorna o total de registros afetados (matched + upserted).
+        Upsert em lote (bulk_write, ordered=False) só do que mudou.
+        Estações com o mesmo content_hash do documento gravado são puladas (sem escrita, revisão nem consulta à ANA);
+        as demais recebem $set apenas dos campos alterados.
+        No modo outbox grava direto; no modo inline o enriquecimento via API ANA roda antes,
+        em paralelo (ANA_ENRICHMENT_CONCURRENCY). A ordem das operações segue a ordem de entrada.
+        Retorna as contagens {"inserted", "updated", "unchanged"}.
         Lança RepositoryError para erros graves de Mongo.
         """
+        counts = write_counts(0, 0, 0, 0)
         try:
-            ops: List[ReplaceOne] = []
+            stations = list(stations)
+            if not stations:
+                return counts
 
-            for e in stations:
-                # Enriquecimento best-effort
-                try:
-                    self.station_information.get_additional_information(station=e)
-                except Exception:
-                    log.warning("Falha no enriquecimento da estação %s durante bulk.",
-                                getattr(e, "codigo_estacao", "?"), exc_info=True)
-                    raise RepositoryError(f"Falha ao buscar dados adicionais da estação {e.ponto} - {e.codigo_estacao}, na API ANA")
-
-                ops.append(
-                    ReplaceOne(
-                        {"codigo_estacao": e.codigo_estacao},
-                        e.model_dump(exclude_none=True),
-                        upsert=True,
-                    )
-                )
-
-            if not ops:
-                return 0
+            stored = self._stored_documents(e.codigo_estacao for e in stations)
+            changed = changed_stations(stations, stored)
+            counts["unchanged"] = len(stations) - len(changed)
+            if not changed:
+                return counts
 
-            result = self.collection.bulk_write(ops, ordered=False)
-            affected = (result.matched_count or 0) + (len(result.upserted_ids or {}) if result.upserted_ids else 0)
-            return affected
+            if self.settings.enrichment_mode == "outbox":
+                result, refreshed = self._write_first(changed, stored)
+            else:
+                checked_ana = enrichment_candidates(e for e, _ in changed)
+                self._enrich_many([e for e, _ in changed])
+                with self.revisions.stamp() as revision:
+                    ops, refreshed = station_updates(changed, stored, revision, replace=True, checked_ana=checked_ana)
+                    result = self.collection.bulk_write(ops, ordered=False)
+            return bulk_write_counts(result, refreshed, counts["unchanged"])
 
         except mg_errors.BulkWriteError as e:
             # BulkWriteError tem detalhes parciais; tentamos extrair efeito parcial
@@ -120,10 +219,7 @@ class MongoStationRepository(StationRepositoryPort):
             # Se quiser falhar de vez: raise RepositoryError(...)
             # Aqui tentamos retornar o que foi possível (parcial) se houver detalhes
             try:
-                details = e.details or {}
-                n_matched = int(details.get("nMatched", 0))
-                n_upserted = int(details.get("nUpserted", 0))
-                return n_matched + n_upserted
+                return bulk_error_counts(e, counts["unchanged"])
             except Exception:
                 raise RepositoryError(f"Erro em operação bulk: {e}") from e
 
@@ -131,6 +227,65 @@ class MongoStationRepository(StationRepositoryPort):
             log.exception("Erro Mongo em save_many.")
             raise RepositoryError(f"Erro ao salvar em lote: {e}") from e
 
+    def _stored_documents(self, codes: Iterable[str]) -> Dict[str, dict]:
+        """Documentos gravados (campos de negócio + content_hash) das estações do lote, por codigo_estacao."""
+        cursor = self.collection.find(codes_filter(codes), stored_projection())
+        return {doc["codigo_estacao"]: doc for doc in cursor}
+
+    def _write_first(self, stations: List[Tuple[StationModel, str]], stored: Mapping[str, dict]):
+        """
+        Grava as estações (pares estação, content_hash) com $set dos campos alterados, sem esperar a API ANA,
+        e marca as incompletas no outbox de enriquecimento.
+        Com ENRICHMENT_OUTBOX_TRANSACTIONS as duas escritas são atômicas; sem transação o outbox vai antes:
+        se a escrita da estação falhar, o worker apenas descarta a entrada órfã.
+        Retorna (resultado do bulk_write, quantas só tiveram o content_hash gravado).
+        """
+        pending = outbox_upserts(enrichment_candidates(e for e, _ in stations))
+
+        def write(session=None):
+            if pending:
+                try:
+                    self.outbox.bulk_write(pending, ordered=False, session=session)
+                except mg_errors.BulkWriteError as e:
+                    raise RepositoryError(f"Erro ao registrar enriquecimento pendente: {e}") from e
+            return self.collection.bulk_write(ops, ordered=False, session=session)
+
+        # a revisão é reservada fora da transação (o documento de 'catalog_meta' é disputado por todas as escritas)
+        with self.revisions.stamp() as revision:
+            ops, refreshed = station_updates(stations, stored, revision)
+            if self.settings.enrichment_outbox_transactions:
+                with self.client.start_session() as session:
+                    return session.with_transaction(write), refreshed
+            return write(), refreshed
+
+    def _enrich(self, station: StationModel) -> StationModel:
+        # Enriquecimento best-effort
+        try:
+            enriched = self.station_information.get_additional_information(station=station)
+            ENRICHMENTS.inc(path="inline", result="ok")
+            return enriched
+        except Exception:
+            ENRICHMENTS.inc(path="inline", result="failed")
+            log.warning("Falha no enriquecimento da estação %s.",
+                        getattr(station, "codigo_estacao", "?"), exc_info=True)
+            raise RepositoryError(f"Falha ao buscar dados adicionais da estação {station.ponto} - {station.codigo_estacao}, na API ANA")
+
+    def _enrich_many(self, stations: List[StationModel]) -> None:
+        """Enriquece as estações (in-place) com no máximo ANA_ENRICHMENT_CONCURRENCY chamadas simultâneas."""
+        workers = min(self.settings.ana_enrichment_concurrency, len(stations))
+        if workers <= 1:
+            for e in stations:
+                self._enrich(e)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ana-enrich")
+        try:
+            # map preserva a ordem; a primeira falha interrompe o lote
+            for _ in pool.map(self._enrich, stations):
+                pass
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
     # ---------------------------
     # Operações de leitura
     # ---------------------------
@@ -142,10 +297,7 @@ class MongoStationRepository(StationRepositoryPort):
         Em falha, lança RepositoryError.
         """
         try:
-            if dados_estacao_manual is None:
-                filtro = {}  # sem filtro — retorna todas as estações
-            else:
-                filtro = {"dado_manual": {"$eq": dados_estacao_manual}}
+            filtro = manual_filter(dados_estacao_manual)  # None → sem filtro — retorna todas as estações
 
             docs = list(self.collection.find(filtro))
             return [StationModel(**doc) for doc in docs]
@@ -156,6 +308,112 @@ class MongoStationRepository(StationRepositoryPort):
             log.exception("Erro ao materializar StationModel na listagem.")
             raise RepositoryError(f"Erro ao montar modelos na listagem: {e}") from e
 
+    def list_stations_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Página de estações ordenada por codigo_estacao (keyset, usa o índice único).
+        filters: igualdade nos campos de STATION_FILTER_FIELDS (índices ix_<campo>_codigo).
+        Os documentos voltam projetados (sem _id) e sem materializar StationModel.
+        Retorna (documentos, cursor) — cursor é o último codigo_estacao se houver próxima página.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            cursor = (
+                self.collection.find(page_filter(after, filters), station_projection(fields))
+                .sort("codigo_estacao", ASCENDING)
+                .limit(limit + 1)  # +1 indica se existe próxima página
+            )
+            docs = list(cursor)
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao paginar estações.")
+            raise RepositoryError(f"Erro ao listar estações: {e}") from e
+        return page_result(docs, limit)
+
+    def iter_station_batches(
+        self,
+        batch_size: int,
+        dados_estacao_manual: Optional[bool] = None,
+    ) -> Iterator[List[dict]]:
+        """
+        Percorre as estações (ordem de codigo_estacao) em lotes de até batch_size documentos,
+        projetados e sem _id. Nada além do lote corrente fica em memória.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            cursor = (
+                self.collection.find(manual_filter(dados_estacao_manual), station_projection())
+                .sort("codigo_estacao", ASCENDING)
+                .batch_size(batch_size)
+            )
+            with cursor:
+                batch: List[dict] = []
+                for doc in cursor:
+                    batch.append(doc)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao exportar estações.")
+            raise RepositoryError(f"Erro ao exportar estações: {e}") from e
+
+    def catalog_version(self) -> int:
+        """
+        Versão atual do catálogo: muda a cada escrita (save, save_many, remoção, enriquecimento).
+        Leitura de um único documento; base do ETag das leituras.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            doc = self.meta.find_one(CATALOG_VERSION_FILTER)
+            return int(doc["version"]) if doc else 0
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao ler a versão do catálogo.")
+            raise RepositoryError(f"Erro ao ler a versão do catálogo: {e}") from e
+
+    def catalog_stats(self) -> dict:
+        """
+        Contagens do catálogo (total, por bacia, por sensor, manuais, com previsão) numa agregação ($facet).
+        O resultado fica em cache pela versão do catálogo: qualquer escrita (deste processo ou de outro,
+        inclusive o enriquecimento) muda a versão e invalida; requisições simultâneas calculam uma vez só.
+        O dicionário devolvido é compartilhado: somente leitura.
+        Em falha, lança RepositoryError.
+        """
+        version = self.catalog_version()
+        with self._stats_lock:
+            if (stats := self._stats.get(version)) is not None:
+                return stats
+            try:
+                facets = list(self.collection.aggregate(STATS_PIPELINE))
+            except mg_errors.PyMongoError as e:
+                log.exception("Erro Mongo ao calcular as estatísticas do catálogo.")
+                raise RepositoryError(f"Erro ao calcular as estatísticas do catálogo: {e}") from e
+            return self._stats.put(version, stats_document(facets[0] if facets else {}))
+
+    def existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        """
+        Retorna o subconjunto de `codes` já presente na coleção.
+        Usa $in sobre o índice único, projetando só codigo_estacao (covered query).
+        Em falha, lança RepositoryError.
+        """
+        codes = list(set(codes))
+        if not codes:
+            return set()
+        try:
+            cursor = self.collection.find(
+                {"codigo_estacao": {"$in": codes}},
+                {"_id": 0, "codigo_estacao": 1},
+            )
+            return {doc["codigo_estacao"] for doc in cursor}
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao verificar códigos existentes.")
+            raise RepositoryError(f"Erro ao verificar estações existentes: {e}") from e
+
     def find_station_by_code_station(self, code_station: str) -> Optional[StationModel]:
         """
         Busca por codigo_estacao.
@@ -172,6 +430,22 @@ class MongoStationRepository(StationRepositoryPort):
             log.exception("Erro ao materializar StationModel em find_station_by_code_station.")
             raise RepositoryError(f"Erro ao montar modelo da estação {code_station}: {e}") from e
 
+    def find_stations_by_codes(self, codes: Iterable[str]) -> List[dict]:
+        """
+        Estações com os códigos informados: um único $in sobre o índice único.
+        Documentos projetados (sem _id), na ordem de codigo_estacao.
+        Em falha, lança RepositoryError.
+        """
+        codes = list(set(codes))
+        if not codes:
+            return []
+        try:
+            cursor = self.collection.find({"codigo_estacao": {"$in": codes}}, station_projection())
+            return list(cursor.sort("codigo_estacao", ASCENDING))
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao buscar estações por código.")
+            raise RepositoryError(f"Erro ao buscar estações: {e}") from e
+
     # ---------------------------
     # Operações de remoção
     # ---------------------------
@@ -184,7 +458,140 @@ class MongoStationRepository(StationRepositoryPort):
         """
         try:
             res = self.collection.delete_one({"codigo_estacao": code_station})
+            if res.deleted_count:
+                self._record_removals([code_station])
             return int(res.deleted_count or 0)
         except mg_errors.PyMongoError as e:
             log.exception("Erro Mongo ao remover estação %s.", code_station)
-            raise RepositoryError(f"Erro ao remover estação {code_station}: {e}") from e
\ No newline at end of file
+            raise RepositoryError(f"Erro ao remover estação {code_station}: {e}") from e
+
+    def remove_stations_by_codes(self, codes: Iterable[str]) -> Set[str]:
+        """
+        Remove as estações com os códigos informados com um único delete_many (por _id).
+        Retorna os códigos efetivamente removidos: se a contagem do delete não bate com os
+        documentos lidos (remoção ou reinserção concorrente), os que continuam no banco saem do resultado.
+        Em falha, lança RepositoryError.
+        """
+        codes = list(set(codes))
+        if not codes:
+            return set()
+        try:
+            matched = {
+                doc["_id"]: doc["codigo_estacao"]
+                for doc in self.collection.find({"codigo_estacao": {"$in": codes}}, {"codigo_estacao": 1})
+            }
+            if not matched:
+                return set()
+            with self.revisions.stamp() as revision:
+                res = self.collection.delete_many({"_id": {"$in": list(matched)}})
+                remaining = set()
+                if res.deleted_count != len(matched):
+                    remaining = {
+                        doc["codigo_estacao"]
+                        for doc in self.collection.find(
+                            codes_filter(matched.values()), {"_id": 0, "codigo_estacao": 1}
+                        )
+                    }
+                removed = removed_codes(matched, res.deleted_count, remaining)
+                if removed:
+                    self.tombstones.bulk_write(tombstone_upserts(removed, revision), ordered=False)
+            return removed
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao remover estações em lote.")
+            raise RepositoryError(f"Erro ao remover estações: {e}") from e
+
+    def _record_removals(self, codes: Iterable[str]) -> None:
+        """Tombstones das estações removidas (as remoções também entram na sincronização incremental)."""
+        with self.revisions.stamp() as revision:
+            self.tombstones.bulk_write(tombstone_upserts(codes, revision), ordered=False)
+
+    # ---------------------------
+    # Sincronização incremental
+    # ---------------------------
+
+    def catalog_revision(self) -> Tuple[int, int]:
+        """
+        (revisão segura, purged_through): mudanças até a revisão segura já estão todas gravadas;
+        remoções até purged_through já foram descartadas (quem sincronizou antes disso precisa recomeçar).
+        Em falha, lança RepositoryError.
+        """
+        try:
+            return self.revisions.current()
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao ler a revisão do catálogo.")
+            raise RepositoryError(f"Erro ao ler a revisão do catálogo: {e}") from e
+
+    def list_changes(
+        self,
+        since: int,
+        until: int,
+        limit: int,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+        """
+        Mudanças (upserts e remoções) com revisão em (since, until], em ordem de (revision, codigo_estacao).
+        Cada estação aparece uma vez, na sua revisão mais recente. Keyset pelo índice ix_revision_codigo
+        nas duas coleções; retorna (mudanças, chave da última) se houver próxima página.
+        Em falha, lança RepositoryError.
+        """
+        filtro = changes_filter(since, until, after)
+        try:
+            stations = list(
+                self.collection.find(filtro, CHANGES_PROJECTION).sort(CHANGES_INDEX).limit(limit + 1)
+            )
+            tombstones = list(
+                self.tombstones.find(filtro, TOMBSTONE_PROJECTION).sort(CHANGES_INDEX).limit(limit + 1)
+            )
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo ao listar mudanças do catálogo.")
+            raise RepositoryError(f"Erro ao listar mudanças do catálogo: {e}") from e
+        return merge_changes(stations, tombstones, limit)
+
+    # ---------------------------
+    # Consultas geográficas
+    # ---------------------------
+
+    def find_stations_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float,
+        limit: int,
+    ) -> List[dict]:
+        """
+        Estações até max_distance_m metros do ponto, da mais próxima para a mais distante
+        ($geoNear sobre o índice ix_location). Documentos projetados (sem _id), com distancia_m.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            return list(self.collection.aggregate(near_pipeline(latitude, longitude, max_distance_m, limit)))
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo na busca por proximidade.")
+            raise RepositoryError(f"Erro na busca por proximidade: {e}") from e
+
+    def list_stations_in_bbox(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Estações dentro do retângulo (graus), ordenadas por codigo_estacao (keyset, como list_stations_page).
+        O índice ix_location seleciona as estações; só as do retângulo são ordenadas.
+        Retorna (documentos, cursor) — cursor é o último codigo_estacao se houver próxima página.
+        Em falha, lança RepositoryError.
+        """
+        try:
+            cursor = (
+                self.collection.find(bbox_filter(min_lon, min_lat, max_lon, max_lat, after), station_projection())
+                .sort("codigo_estacao", ASCENDING)
+                .limit(limit + 1)  # +1 indica se existe próxima página
+            )
+            docs = list(cursor)
+        except mg_errors.PyMongoError as e:
+            log.exception("Erro Mongo na busca por bbox.")
+            raise RepositoryError(f"Erro na busca por bbox: {e}") from e
+        return page_result(docs, limit)
@@ -0,0 +1,103 @@
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from domain.models.station_model import StationModel
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+from infrastructure.repository.station_repository import MongoStationRepository
+
+
+class ThreadedStationRepository(AsyncStationRepositoryPort):
+    """
+    Adapta o MongoStationRepository (driver síncrono) ao AsyncStationRepositoryPort.
+    Cada chamada roda no threadpool, mantendo o event loop livre.
+    Selecionado com STATION_REPOSITORY_BACKEND=sync.
+    """
+
+    def __init__(self, repo: MongoStationRepository | None = None) -> None:
+        self.repo = repo or MongoStationRepository()
+
+    async def ensure_indexes(self) -> None:
+        await run_in_threadpool(self.repo.ensure_indexes)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.repo.close)
+
+    async def save(self, station: StationModel) -> bool:
+        return await run_in_threadpool(self.repo.save, station)
+
+    async def save_many(self, stations: Iterable[StationModel]) -> Dict[str, int]:
+        return await run_in_threadpool(self.repo.save_many, stations)
+
+    async def list_all_stations(self, dados_estacao_manual: Optional[bool] = None) -> List[StationModel]:
+        return await run_in_threadpool(self.repo.list_all_stations, dados_estacao_manual)
+
+    async def list_stations_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        return await run_in_threadpool(self.repo.list_stations_page, limit, after, fields, filters)
+
+    def iter_station_batches(
+        self,
+        batch_size: int,
+        dados_estacao_manual: Optional[bool] = None,
+    ) -> AsyncIterator[List[dict]]:
+        # um salto para o threadpool por lote (não por documento)
+        return iterate_in_threadpool(self.repo.iter_station_batches(batch_size, dados_estacao_manual))
+
+    async def catalog_version(self) -> int:
+        return await run_in_threadpool(self.repo.catalog_version)
+
+    async def catalog_stats(self) -> dict:
+        return await run_in_threadpool(self.repo.catalog_stats)
+
+    async def existing_codes(self, codes: Iterable[str]) -> Set[str]:
+        return await run_in_threadpool(self.repo.existing_codes, list(codes))
+
+    async def find_station_by_code_station(self, code_station: str) -> Optional[StationModel]:
+        return await run_in_threadpool(self.repo.find_station_by_code_station, code_station)
+
+    async def find_stations_by_codes(self, codes: Iterable[str]) -> List[dict]:
+        return await run_in_threadpool(self.repo.find_stations_by_codes, list(codes))
+
+    async def remove_station_by_code_station(self, code_station: str) -> int:
+        return await run_in_threadpool(self.repo.remove_station_by_code_station, code_station)
+
+    async def remove_stations_by_codes(self, codes: Iterable[str]) -> Set[str]:
+        return await run_in_threadpool(self.repo.remove_stations_by_codes, list(codes))
+
+    async def catalog_revision(self) -> Tuple[int, int]:
+        return await run_in_threadpool(self.repo.catalog_revision)
+
+    async def list_changes(
+        self,
+        since: int,
+        until: int,
+        limit: int,
+        after: Optional[Tuple[int, str]] = None,
+    ) -> Tuple[List[dict], Optional[Tuple[int, str]]]:
+        return await run_in_threadpool(self.repo.list_changes, since, until, limit, after)
+
+    async def find_stations_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_m: float,
+        limit: int,
+    ) -> List[dict]:
+        return await run_in_threadpool(self.repo.find_stations_near, latitude, longitude, max_distance_m, limit)
+
+    async def list_stations_in_bbox(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        limit: int,
+        after: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        return await run_in_threadpool(self.repo.list_stations_in_bbox, min_lon, min_lat, max_lon, max_lat, limit, after)
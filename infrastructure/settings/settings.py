@@ -1,5 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -9,14 +10,97 @@ class Settings(BaseSettings):
     user_name: str = Field(alias="USER_NAME")
     user_password: str = Field(alias="USER_PASSWORD")
 
+    # Cache de JWT já verificados (por processo); 0 desliga
+    jwt_verify_cache_max_entries: int = Field(default=10000, alias="JWT_VERIFY_CACHE_MAX_ENTRIES")
+
     mongo_uri: str = Field(alias="mongo_uri")
     mongo_db_name: str = Field(alias="MONGO_DB_NAME")
+    mongo_max_pool_size: int = Field(default=100, alias="MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: int = Field(default=0, alias="MONGO_MIN_POOL_SIZE")
+    # "async": AsyncMongoClient + httpx; "sync": MongoClient + requests no threadpool
+    station_repository_backend: Literal["async", "sync"] = Field(default="async", alias="STATION_REPOSITORY_BACKEND")
     request_timeout: int = Field(alias="REQUEST_TIMEOUT")
 
+    stations_page_default_limit: int = Field(default=1000, alias="STATIONS_PAGE_DEFAULT_LIMIT")
+    stations_page_max_limit: int = Field(default=5000, alias="STATIONS_PAGE_MAX_LIMIT")
+    stations_export_batch_size: int = Field(default=500, alias="STATIONS_EXPORT_BATCH_SIZE")
+    # POST /stations/lookup e /stations/delete: códigos por requisição
+    stations_bulk_max_codes: int = Field(default=1000, alias="STATIONS_BULK_MAX_CODES")
+    # GET /stations/changes: reservas de revisão sem renovação (heartbeat a cada 1/3) há mais que isso
+    # são de escritores mortos (ignoradas);
+    # tombstones de remoções ficam RETENTION_DAYS e a limpeza roda a cada PURGE_INTERVAL_SECONDS
+    station_changes_pending_seconds: float = Field(default=60, alias="STATION_CHANGES_PENDING_SECONDS")
+    station_tombstone_retention_days: int = Field(default=30, alias="STATION_TOMBSTONE_RETENTION_DAYS")
+    station_changes_purge_interval_seconds: int = Field(default=3600, alias="STATION_CHANGES_PURGE_INTERVAL_SECONDS")
+
+    # Importação de arquivo: estações válidas por bulk_write
+    import_chunk_size: int = Field(default=1000, alias="IMPORT_CHUNK_SIZE")
+    # Importação em background (POST /station/import?background=true)
+    import_spool_dir: str | None = Field(default=None, alias="IMPORT_SPOOL_DIR")
+    import_max_concurrent_jobs: int = Field(default=2, alias="IMPORT_MAX_CONCURRENT_JOBS")
+    import_job_retention_seconds: int = Field(default=7 * 24 * 3600, alias="IMPORT_JOB_RETENTION_SECONDS")
+    # Sinal de vida dos jobs em andamento; sem ele por STALE segundos o job é dado como interrompido
+    import_job_heartbeat_seconds: int = Field(default=30, alias="IMPORT_JOB_HEARTBEAT_SECONDS")
+    import_job_stale_seconds: int = Field(default=180, alias="IMPORT_JOB_STALE_SECONDS")
+    # Linhas ignoradas/erros guardadas no relatório do job (amostra; as contagens são sempre completas)
+    import_job_report_sample_size: int = Field(default=100, alias="IMPORT_JOB_REPORT_SAMPLE_SIZE")
+
     ana_api_url: str = Field(alias="ANA_API_URL")
     ana_api_inventario_url: str = Field(alias="ANA_API_INVENTARIO_URL")
     ana_identificador: str = Field(alias="ANA_IDENTIFICADOR")
     ana_senha: str = Field(alias="ANA_SENHA")
+    ana_enrichment_concurrency: int = Field(default=8, alias="ANA_ENRICHMENT_CONCURRENCY")
+    # Resiliência do gateway ANA: tentativas (incluindo a primeira) com backoff exponencial + jitter
+    ana_retry_attempts: int = Field(default=3, alias="ANA_RETRY_ATTEMPTS")
+    ana_retry_backoff_base_seconds: float = Field(default=0.5, alias="ANA_RETRY_BACKOFF_BASE_SECONDS")
+    ana_retry_backoff_max_seconds: float = Field(default=8, alias="ANA_RETRY_BACKOFF_MAX_SECONDS")
+    # Circuit breaker: falhas seguidas para abrir e tempo aberto antes da chamada de teste
+    ana_circuit_failure_threshold: int = Field(default=5, alias="ANA_CIRCUIT_FAILURE_THRESHOLD")
+    ana_circuit_reset_seconds: float = Field(default=30, alias="ANA_CIRCUIT_RESET_SECONDS")
+    # Prazo da chamada de teste (half_open); sem resposta nele, o circuito volta a open
+    ana_circuit_probe_timeout_seconds: float = Field(default=15, alias="ANA_CIRCUIT_PROBE_TIMEOUT_SECONDS")
+    # Token: validade considerada e antecedência da renovação
+    ana_token_ttl_seconds: int = Field(default=580, alias="ANA_TOKEN_TTL_SECONDS")
+    ana_token_refresh_margin_seconds: int = Field(default=60, alias="ANA_TOKEN_REFRESH_MARGIN_SECONDS")
+    # Token compartilhado entre workers (coleção 'ana_tokens'); lease da renovação
+    ana_token_shared: bool = Field(default=True, alias="ANA_TOKEN_SHARED")
+    ana_token_lease_seconds: int = Field(default=15, alias="ANA_TOKEN_LEASE_SECONDS")
+
+    # Enriquecimento via API ANA: "inline" (na escrita; padrão) ou "outbox" (opt-in: grava já, worker enriquece depois).
+    # No outbox a resposta de save/estacoes_lote volta antes dos campos da ANA e falhas da API não chegam ao cliente
+    enrichment_mode: Literal["inline", "outbox"] = Field(default="inline", alias="ENRICHMENT_MODE")
+    # Grava estação + entrada do outbox numa transação (exige replica set)
+    enrichment_outbox_transactions: bool = Field(default=False, alias="ENRICHMENT_OUTBOX_TRANSACTIONS")
+    enrichment_worker_enabled: bool = Field(default=True, alias="ENRICHMENT_WORKER_ENABLED")
+    enrichment_worker_interval_seconds: int = Field(default=5, alias="ENRICHMENT_WORKER_INTERVAL_SECONDS")
+    enrichment_worker_batch_size: int = Field(default=100, alias="ENRICHMENT_WORKER_BATCH_SIZE")
+    enrichment_lease_seconds: int = Field(default=300, alias="ENRICHMENT_LEASE_SECONDS")
+    enrichment_max_attempts: int = Field(default=8, alias="ENRICHMENT_MAX_ATTEMPTS")
+    enrichment_retry_base_seconds: float = Field(default=30, alias="ENRICHMENT_RETRY_BASE_SECONDS")
+    enrichment_retry_max_seconds: float = Field(default=3600, alias="ENRICHMENT_RETRY_MAX_SECONDS")
+
+    # Reenriquecimento periódico (estações sem consulta à ANA ou com consulta mais antiga que MAX_AGE)
+    enrichment_sweep_enabled: bool = Field(default=True, alias="ENRICHMENT_SWEEP_ENABLED")
+    enrichment_sweep_interval_seconds: int = Field(default=3600, alias="ENRICHMENT_SWEEP_INTERVAL_SECONDS")
+    enrichment_sweep_max_age_seconds: int = Field(default=30 * 24 * 3600, alias="ENRICHMENT_SWEEP_MAX_AGE_SECONDS")
+    enrichment_sweep_batch_size: int = Field(default=200, alias="ENRICHMENT_SWEEP_BATCH_SIZE")
+    enrichment_sweep_max_per_run: int = Field(default=5000, alias="ENRICHMENT_SWEEP_MAX_PER_RUN")
+    enrichment_sweep_rps: float = Field(default=5, alias="ENRICHMENT_SWEEP_RPS")
+    enrichment_sweep_concurrency: int = Field(default=4, alias="ENRICHMENT_SWEEP_CONCURRENCY")
+    # Lease da rodada (um processo varre por vez); renovado a cada lote, então deve cobrir um lote com folga
+    enrichment_sweep_lease_seconds: int = Field(default=300, alias="ENRICHMENT_SWEEP_LEASE_SECONDS")
+
+    ana_cache_max_entries: int = Field(default=5000, alias="ANA_CACHE_MAX_ENTRIES")
+    ana_cache_ttl_seconds: int = Field(default=86400, alias="ANA_CACHE_TTL_SECONDS")
+    ana_cache_negative_ttl_seconds: int = Field(default=3600, alias="ANA_CACHE_NEGATIVE_TTL_SECONDS")
+    ana_cache_persistent: bool = Field(default=True, alias="ANA_CACHE_PERSISTENT")
+
+    # réplica em memória do catálogo (leituras servidas pelo processo; change stream ou polling)
+    station_replica_enabled: bool = Field(default=False, alias="STATION_REPLICA_ENABLED")
+    station_replica_poll_seconds: float = Field(default=5, alias="STATION_REPLICA_POLL_SECONDS")
+
+    # métricas em processo (GET /metrics); false desliga coleta e endpoint
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
 
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).resolve().parent.parent.parent / ".env"),
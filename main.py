@@ -1,17 +1,135 @@
+import logging
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from application.import_job_runner import ImportJobRunner
 from application.controller.station_controller import router as station_route
 from application.controller.auth_controller import router as auth_route
 from application.controller.station_batch import router as station_batch
+from application.controller.metrics_controller import router as metrics_route
+from application.metrics_middleware import MetricsMiddleware
+from domain.ports.station_repository_port import AsyncStationRepositoryPort
+from infrastructure.repository.async_station_repository import AsyncMongoStationRepository
+from infrastructure.repository.catalog_revisions import CatalogRevisions
+from infrastructure.repository.enrichment_outbox import MongoEnrichmentOutbox
+from infrastructure.repository.enrichment_sweeper import EnrichmentSweeper
+from infrastructure.repository.enrichment_worker import EnrichmentWorker
+from infrastructure.repository.import_job_repository import MongoImportJobRepository
+from infrastructure.repository.mongo_client import get_mongo_client, get_mongo_database
+from infrastructure.repository.replicated_station_repository import ReplicatedStationRepository
+from infrastructure.repository.station_catalog_replica import StationCatalogReplica
+from infrastructure.repository.station_locations import backfill_station_locations
+from infrastructure.repository.station_queries import CATALOG_META_COLLECTION, TOMBSTONES_COLLECTION
+from infrastructure.repository.threaded_station_repository import ThreadedStationRepository
+from infrastructure.settings.settings import get_settings
+
+log = logging.getLogger(__name__)
+
+
+def build_station_repo() -> AsyncStationRepositoryPort:
+    if get_settings().station_repository_backend == "sync":
+        return ThreadedStationRepository()
+    return AsyncMongoStationRepository()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Repositório (e pool de conexões Mongo) único por processo
+    station_repo = build_station_repo()
+    await station_repo.ensure_indexes()
+    # ponto GeoJSON (buscas /near e /bbox) nas estações gravadas antes dele; só até concluir uma vez
+    await run_in_threadpool(backfill_station_locations)
 
+    # Réplica do catálogo em memória (opcional): se a carga inicial falhar, a thread de sync tenta de novo
+    # e, até lá, as leituras vão ao Mongo
+    settings = get_settings()
+    replica = None
+    if settings.station_replica_enabled:
+        replica = StationCatalogReplica()
+        try:
+            await run_in_threadpool(replica.load)
+        except Exception:
+            log.exception("Falha na carga inicial da réplica do catálogo.")
+        replica.start()
+        station_repo = ReplicatedStationRepository(station_repo, replica)
+    app.state.station_replica = replica
+    app.state.station_repo = station_repo
 
-app = FastAPI(title="Gerenciamento das estações", root_path="/station_manager")
+    # Jobs em background (importação) rodam no event loop da aplicação
+    scheduler = AsyncIOScheduler(timezone="UTC")
+    import_jobs = MongoImportJobRepository()
+    await run_in_threadpool(import_jobs.ensure_indexes)
+    import_runner = ImportJobRunner(station_repo, import_jobs, scheduler)
+    app.state.import_job_runner = import_runner
+    # jobs deixados 'queued'/'running' por um processo que parou viram 'failed' (e o spool órfão é removido)
+    await import_runner.maintain()
+    scheduler.add_job(
+        import_runner.maintain,
+        "interval",
+        seconds=settings.import_job_heartbeat_seconds,
+        id="import-jobs-maintenance",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # Enriquecimento ANA em background: worker do outbox e reenriquecimento periódico
+    # (síncronos, rodam no executor de threads do scheduler)
+    outbox = MongoEnrichmentOutbox()
+    await run_in_threadpool(outbox.ensure_indexes)
+    if settings.enrichment_worker_enabled:
+        scheduler.add_job(
+            EnrichmentWorker(outbox).run_once,
+            "interval",
+            seconds=settings.enrichment_worker_interval_seconds,
+            id="enrichment-outbox",
+            max_instances=1,
+            coalesce=True,
+        )
+    if settings.enrichment_sweep_enabled:
+        scheduler.add_job(
+            EnrichmentSweeper().run_once,
+            "interval",
+            seconds=settings.enrichment_sweep_interval_seconds,
+            id="enrichment-sweep",
+            max_instances=1,
+            coalesce=True,
+        )
+    # limpeza dos tombstones da sincronização incremental (e das reservas de revisão expiradas)
+    db = get_mongo_database()
+    revisions = CatalogRevisions(db[CATALOG_META_COLLECTION], db[TOMBSTONES_COLLECTION])
+    scheduler.add_job(
+        revisions.purge,
+        "interval",
+        seconds=settings.station_changes_purge_interval_seconds,
+        id="catalog-purge",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+    try:
+        yield
+    finally:
+        scheduler.shutdown(wait=False)
+        if replica is not None:
+            await run_in_threadpool(replica.stop)
+        await station_repo.close()
+        # MongoClient compartilhado do processo: fechado só aqui, depois de todos os seus usuários pararem
+        get_mongo_client().close()
+
+
+app = FastAPI(title="Gerenciamento das estações", root_path="/station_manager", lifespan=lifespan)
 
 app.include_router(auth_route)
 app.include_router(station_route)
 app.include_router(station_batch)
+app.include_router(metrics_route)
+
+app.add_middleware(MetricsMiddleware)
 
 # Press the green button in the gutter to run the script.
 if __name__ == '__main__':
@@ -2,6 +2,7 @@
 import os
 import io
 import json
+import time
 
 import pandas as pd
 import requests
@@ -62,6 +63,36 @@ def http_get(path: str, params: Optional[dict] = None, auth: bool = False, timeo
     except requests.RequestException as e:
         return False, {"error": f"Falha de conexão: {e}", "url": api_url(path)}
 
+def http_get_all_pages(path: str, params: Optional[dict] = None, auth: bool = False, timeout: int = 60):
+    """GET paginado: segue o header X-Next-Cursor e concatena as páginas."""
+    params = dict(params or {})
+    items: List[Any] = []
+    try:
+        while True:
+            r = requests.get(api_url(path), params=params, headers=_headers(auth), timeout=timeout)
+            if not r.ok:
+                try:
+                    return False, r.json()
+                except Exception:
+                    return False, {"status_code": r.status_code, "text": r.text}
+            items.extend(r.json())
+            next_cursor = r.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                return True, items
+            params["cursor"] = next_cursor
+    except requests.RequestException as e:
+        return False, {"error": f"Falha de conexão: {e}", "url": api_url(path)}
+
+def http_download(path: str, params: Optional[dict] = None, auth: bool = False, timeout: int = 120):
+    """GET em streaming (export): lê a resposta em blocos, sem decodificar JSON."""
+    try:
+        with requests.get(api_url(path), params=params, headers=_headers(auth), timeout=timeout, stream=True) as r:
+            if not r.ok:
+                return False, {"status_code": r.status_code, "text": r.text}
+            return True, b"".join(r.iter_content(chunk_size=64 * 1024))
+    except requests.RequestException as e:
+        return False, {"error": f"Falha de conexão: {e}", "url": api_url(path)}
+
 def http_post(path: str, body: Optional[dict] = None, auth: bool = False, files: Optional[dict] = None,
               params: Optional[dict] = None, timeout: int = 120):
     try:
@@ -154,6 +185,7 @@ with st.sidebar:
         label="Escolha a ação",
         options=[
             "📄 Listar estações (GET /stations)",
+            "📊 Estatísticas (GET /stations/stats)",
             "🔍 Obter por código (GET /stations/{codigo_estacao})",
             "➕ Criar/Atualizar (POST /stations)",
             "🗑️ Remover por código (DELETE /stations/{codigo_estacao})",
@@ -214,7 +246,7 @@ def page_listar():
         elif dado_manual_choice == "Apenas não-manual (false)":
             params["dados_estacao_manual"] = "false"
 
-        ok, data = http_get("/stations", params=params, auth=False)
+        ok, data = http_get_all_pages("/stations", params=params, auth=False)
         if ok:
             st.session_state.last_list = data
         else:
@@ -231,6 +263,40 @@ def page_listar():
         jbytes = json.dumps(lista, ensure_ascii=False, indent=2).encode("utf-8")
         st.download_button("⬇️ Baixar JSON", data=jbytes, file_name="stations_list.json", mime="application/json")
 
+    st.markdown("##### Exportar catálogo completo")
+    col_fmt, col_exp = st.columns([3, 1])
+    with col_fmt:
+        export_format = st.selectbox("Formato", options=["csv", "ndjson"], index=0)
+    with col_exp:
+        exportar = st.button("📤 Exportar")
+    if exportar:
+        ok, data = http_download("/stations/export", params={"format": export_format})
+        if ok:
+            mime = "text/csv" if export_format == "csv" else "application/x-ndjson"
+            st.download_button(f"⬇️ Baixar {export_format.upper()}", data=data,
+                               file_name=f"stations.{export_format}", mime=mime)
+        else:
+            st.error(f"Erro ao exportar: {data}")
+
+def page_estatisticas():
+    st.header("📊 Estatísticas do catálogo")
+    st.write("Contagens calculadas no servidor (sem baixar a lista de estações).")
+    if not st.button("🔄 Carregar estatísticas"):
+        return
+    ok, data = http_get("/stations/stats", auth=False)
+    if not ok:
+        st.error(f"Erro: {data}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Estações", data["total"])
+    col2.metric("Manuais", data["dado_manual"]["manual"])
+    col3.metric("Com previsão", data["data_forecast"]["com_previsao"])
+    for titulo, chave in (("Por bacia", "por_bacia"), ("Por sensor", "por_sensor")):
+        st.markdown(f"##### {titulo}")
+        contagens = pd.Series(data[chave], name="estacoes").sort_values(ascending=False)
+        st.bar_chart(contagens)
+
 def page_buscar_por_codigo():
     st.header("🔍 Obter estação por código")
     st.write("Busca detalhada de uma estação pelo `codigo_estacao`.")
@@ -440,10 +506,37 @@ def page_upsert_lote():
                     st.json(data)
 
 
+def poll_import_job(job_id: str, interval: float = 1.0, max_wait: int = 3600):
+    """Acompanha GET /station/import/{job_id} até o job terminar; mostra o progresso parcial."""
+    status_box = st.empty()
+    progress_box = st.empty()
+    started = time.time()
+    while True:
+        ok, job = http_get(f"/station/import/{job_id}", auth=True)
+        if not ok:
+            st.error(f"Erro ao consultar o job: {job}")
+            return None
+        progress = job.get("progress") or {}
+        status_box.info(f"Job `{job_id}` — status: **{job.get('status')}**")
+        progress_box.write(
+            f"Linhas processadas: {progress.get('lines_processed', 0)} • "
+            f"importadas: {progress.get('imported', 0)} • "
+            f"ignoradas: {progress.get('ignored', 0)} • "
+            f"erros: {progress.get('errors', 0)}"
+        )
+        if job.get("status") in ("done", "failed"):
+            return job
+        if time.time() - started > max_wait:
+            st.warning("Tempo de acompanhamento esgotado; consulte o job novamente mais tarde.")
+            return job
+        time.sleep(interval)
+
 def page_importar_arquivo():
     st.header("📁 Importar estações por arquivo")
     st.caption("Endpoint: `POST /station/import` (multipart/form-data).")
     upsert_existing = st.checkbox("upsert_existing", value=False, help="Se marcado, atualiza registros existentes.")
+    background = st.checkbox("Processar em background", value=True,
+                             help="Enfileira a importação e acompanha o progresso em GET /station/import/{job_id}.")
     uploaded_file = st.file_uploader("Selecione o arquivo", type=["csv", "xlsx", "xls", "json", "txt"])
     importar = st.button("Importar")
     if importar:
@@ -457,10 +550,21 @@ def page_importar_arquivo():
 
             # Tupla de 3 elementos: (nome, conteúdo, content_type)
             files = {"upload": (uploaded_file.name, file_bytes, content_type)}
-            params = {"upsert_existing": str(bool(upsert_existing)).lower()}
+            params = {
+                "upsert_existing": str(bool(upsert_existing)).lower(),
+                "background": str(bool(background)).lower(),
+            }
 
             ok, data = http_post("/station/import", files=files, params=params, auth=True)
-            if ok:
+            if ok and background and isinstance(data, dict) and data.get("job_id"):
+                st.success(f"Importação enfileirada (job `{data['job_id']}`).")
+                job = poll_import_job(data["job_id"])
+                if job and job.get("status") == "done":
+                    st.success("Importação concluída!")
+                    st.json(job.get("report"))
+                elif job and job.get("status") == "failed":
+                    st.error(f"Importação falhou: {job.get('error')}")
+            elif ok:
                 st.success("Importação enviada com sucesso!")
                 try:
                     show_json_or_table(data)
@@ -476,6 +580,8 @@ def page_importar_arquivo():
 # ============================
 if page.startswith("📄"):
     page_listar()
+elif page.startswith("📊"):
+    page_estatisticas()
 elif page.startswith("🔍"):
     page_buscar_por_codigo()
 elif page.startswith("➕"):
@@ -0,0 +1,37 @@
+"""
+Verifica, contra o MongoDB configurado (.env), que todo filtro de GET /stations é atendido por índice.
+
+Cria os índices (ensure_indexes, idempotente) e roda explain de cada filtro suportado
+(dados_estacao_manual, bacia, sensor, data_forecast, conversor — sozinhos e combinados),
+no mesmo formato da listagem (ordem por codigo_estacao). Sai com código 1 se algum plano vencedor
+tiver COLLSCAN. O startup da aplicação faz a mesma verificação e só registra erro no log.
+
+Uso:
+    python tools/check_filter_indexes.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infrastructure.repository.mongo_client import get_mongo_client  # noqa: E402
+from infrastructure.repository.station_queries import filter_plan_checks  # noqa: E402
+from infrastructure.repository.station_repository import MongoStationRepository  # noqa: E402
+
+
+def main() -> int:
+    repo = MongoStationRepository()
+    try:
+        repo.ensure_indexes()
+        scans = repo.filter_collection_scans()
+    finally:
+        repo.close()
+        get_mongo_client().close()
+
+    for name, _ in filter_plan_checks():
+        print(f"{name:<60} {'COLLSCAN' if name in scans else 'ok (índice)'}")
+    return 1 if scans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Servidor falso da API ANA (OAuth + HidroInventarioEstacoes), só biblioteca padrão.
+Serve para exercitar o gateway (novas tentativas, circuit breaker, renovação do token) e para benchmarks.
+
+Uso:
+    python tools/fake_ana_server.py --port 8765 --latency 0.2 --error-rate 0.1
+
+e, no .env da aplicação:
+    ANA_API_URL=http://127.0.0.1:8765/OAuth/v1
+    ANA_API_INVENTARIO_URL=http://127.0.0.1:8765/HidroInventarioEstacoes/v1
+
+GET /_stats retorna os contadores (tokens emitidos, consultas, erros injetados).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class FakeAnaOptions:
+    latency: float = 0.0        # segundos por resposta
+    jitter: float = 0.0         # variação uniforme (±) sobre a latência
+    error_rate: float = 0.0     # fração das consultas respondidas com 503
+    down: bool = False          # toda consulta responde 503
+    token_ttl: float = 600.0    # validade dos tokens emitidos (expirado → 401)
+    empty_rate: float = 0.0     # fração das consultas sem "items" (estação desconhecida)
+
+
+@dataclass
+class FakeAnaState:
+    options: FakeAnaOptions
+    tokens: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=lambda: {
+        "tokens_issued": 0, "inventory_requests": 0, "injected_errors": 0, "unauthorized": 0,
+    })
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+
+
+def _inventory_item(codigo: str) -> dict:
+    return {
+        "Estacao_Nome": f"ESTACAO {codigo}",
+        "Bacia_Nome": "BACIA FAKE",
+        "Rio_Nome": "RIO FAKE",
+        "Altitude": "100.0",
+        "Latitude": "-15.7801",
+        "Longitude": "-47.9292",
+        "Data_Periodo_Escala_Inicio": "2001-01-01 00:00:00.0",
+    }
+
+
+def make_handler(state: FakeAnaState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, como a API real
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            if url.path.endswith("/_stats"):
+                with state.lock:
+                    return self._json(200, dict(state.counters))
+            self._sleep()
+            if url.path.endswith("/OAuth/v1"):
+                return self._token()
+            if url.path.endswith("/HidroInventarioEstacoes/v1"):
+                return self._inventory(parse_qs(url.query))
+            self._json(404, {"message": "not found"})
+
+        def _token(self) -> None:
+            if not self.headers.get("identificador") or not self.headers.get("senha"):
+                return self._json(401, {"message": "credenciais ausentes"})
+            token = uuid.uuid4().hex
+            with state.lock:
+                state.tokens[token] = time.time() + state.options.token_ttl
+                state.counters["tokens_issued"] += 1
+            self._json(200, {"status": "OK", "items": {"tokenautenticacao": token}})
+
+        def _inventory(self, query: Dict[str, list]) -> None:
+            state.count("inventory_requests")
+            opts = state.options
+            if opts.down or random.random() < opts.error_rate:
+                state.count("injected_errors")
+                return self._json(503, {"message": "indisponível"})
+
+            token = (self.headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+            with state.lock:
+                expires = state.tokens.get(token)
+            if expires is None or expires < time.time():
+                state.count("unauthorized")
+                return self._json(401, {"message": "token inválido ou expirado"})
+
+            codigo = (query.get("Código da Estação") or [""])[0]
+            items = [] if not codigo or random.random() < opts.empty_rate else [_inventory_item(codigo)]
+            self._json(200, {"status": "OK", "items": items})
+
+        def _sleep(self) -> None:
+            opts = state.options
+            delay = opts.latency + random.uniform(-opts.jitter, opts.jitter)
+            if delay > 0:
+                time.sleep(delay)
+
+        def _json(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def start_fake_ana_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    options: Optional[FakeAnaOptions] = None,
+) -> Tuple[ThreadingHTTPServer, FakeAnaState]:
+    """Sobe o servidor numa thread daemon (port=0 → porta livre). Retorna (servidor, estado)."""
+    state = FakeAnaState(options or FakeAnaOptions())
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-ana", daemon=True).start()
+    return server, state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor falso da API ANA")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência por resposta (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="variação da latência (± s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de consultas com 503")
+    parser.add_argument("--empty-rate", type=float, default=0.0, help="fração de consultas sem items")
+    parser.add_argument("--token-ttl", type=float, default=600.0, help="validade dos tokens (s)")
+    parser.add_argument("--down", action="store_true", help="responde 503 a toda consulta")
+    args = parser.parse_args()
+
+    options = FakeAnaOptions(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        down=args.down, token_ttl=args.token_ttl, empty_rate=args.empty_rate,
+    )
+    server, _ = start_fake_ana_server(args.host, args.port, options)
+    print(f"API ANA falsa em http://{args.host}:{server.server_address[1]} (Ctrl+C para sair)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()